@@ -1,5 +1,4 @@
 from datetime import datetime, timezone
-import json
 
 def log_message(db_session, conversation_id: str, role: str, text: str, intent: str | None = None, slots: dict | None = None):
     """
@@ -8,16 +7,13 @@ def log_message(db_session, conversation_id: str, role: str, text: str, intent:
     try:
         from models import ChatMessage
         
-        # Convert slots to JSON string if it's a dict
-        slots_json = json.dumps(slots, ensure_ascii=False) if slots else "{}"
-        
         # Create ChatMessage object
         chat_message = ChatMessage(
             conversation_id=conversation_id,
             role=role,
             text=text or "",
             intent=intent,
-            slots_json=slots_json,
+            slots_json=slots or {},
             created_at=datetime.now(timezone.utc)
         )
         
@@ -15,6 +15,8 @@ CHAT_API_TIMEOUT = int(os.getenv("CHAT_API_TIMEOUT", "9"))
 LLM_TIMEOUT = int(os.getenv("LLM_TIMEOUT", "6"))
 AGENT_MAX_ITERS = int(os.getenv("AGENT_MAX_ITERS", "3"))
 CHAT_MODEL = os.getenv("CHAT_MODEL", "gpt-3.5-turbo")
+CONVERSATION_STATE_TTL = int(os.getenv("CONVERSATION_STATE_TTL", "3600"))  # idle seconds before a chat state is dropped
+CONVERSATION_STATE_MAX_ENTRIES = int(os.getenv("CONVERSATION_STATE_MAX_ENTRIES", "10000"))  # live chat states kept per process
 
 # Config override hook for future config servers
 def load_config_override():
@@ -27,7 +29,9 @@ def load_config_override():
         "CHAT_API_TIMEOUT": CHAT_API_TIMEOUT,
         "LLM_TIMEOUT": LLM_TIMEOUT,
         "AGENT_MAX_ITERS": AGENT_MAX_ITERS,
-        "CHAT_MODEL": CHAT_MODEL
+        "CHAT_MODEL": CHAT_MODEL,
+        "CONVERSATION_STATE_TTL": CONVERSATION_STATE_TTL,
+        "CONVERSATION_STATE_MAX_ENTRIES": CONVERSATION_STATE_MAX_ENTRIES
     }
 
 # Check for missing keys and print warnings
@@ -1,7 +1,11 @@
 import os
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
-from backend.config import DATABASE_URL, DB_POOL_SIZE, DB_MAX_OVERFLOW
+from sqlalchemy.pool import NullPool
+from backend.config import (
+    DATABASE_URL, DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT, DB_POOL_RECYCLE, DB_QUERY_CACHE_SIZE,
+    DB_EXTERNAL_POOLER
+)
 
 # Validate DATABASE_URL
 if not DATABASE_URL:
@@ -11,7 +15,16 @@ if not DATABASE_URL:
 if DATABASE_URL.startswith("sqlite"):
     engine = create_engine(
         DATABASE_URL, 
-        connect_args={"check_same_thread": False}
+        connect_args={"check_same_thread": False},
+        query_cache_size=DB_QUERY_CACHE_SIZE
+    )
+elif DB_EXTERNAL_POOLER:
+    # PgBouncer (or similar) already pools server connections; holding a second pool here
+    # would pin its slots, so open a fresh client connection per checkout instead
+    engine = create_engine(
+        DATABASE_URL,
+        poolclass=NullPool,
+        query_cache_size=DB_QUERY_CACHE_SIZE
     )
 else:
     # PostgreSQL with connection pooling
@@ -19,8 +32,10 @@ else:
         DATABASE_URL,
         pool_size=DB_POOL_SIZE,
         max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
         pool_pre_ping=True,
-        pool_recycle=300
+        pool_recycle=DB_POOL_RECYCLE,
+        query_cache_size=DB_QUERY_CACHE_SIZE
     )
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -6,7 +6,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy import or_, and_
 from datetime import datetime
 import openai
-from .models import Product, Message, User, Order, OrderItem, OrderStatus, PaymentStatus
+from .models import Product, ChatMessage, User, Order, OrderItem, OrderStatus, PaymentStatus
 from .schemas import OrderCreate, OrderItemCreate
 from .product_handler import search_products_by_name, get_products
 
@@ -88,7 +88,7 @@ class GPTAssistant:
         product_list = "محصولات موجود:\n\n"
         for i, product in enumerate(products, 1):
             stock_info = f"موجودی: {product.stock}" if product.stock is not None else "موجود"
-            sizes_info = f"سایزهای موجود: {', '.join(product.sizes.split(','))}" if product.sizes is not None else "سایز: یکسان"
+            sizes_info = f"سایزهای موجود: {', '.join(product.sizes)}" if product.sizes is not None else "سایز: یکسان"
             
             product_list += f"{i}. {product.name}\n"
             product_list += f"   قیمت: {product.price:,} تومان\n"
@@ -275,7 +275,7 @@ class GPTAssistant:
             for i, product in enumerate(products, 1):
                 try:
                     # Safe string operations
-                    sizes_list = product.sizes.split(",") if product.sizes else []
+                    sizes_list = product.sizes or []
                     sizes_str = ", ".join(sizes_list) if sizes_list else "یکسان"
                     stock_info = f"موجودی: {product.stock}" if product.stock is not None else "موجود"
                     
@@ -346,12 +346,17 @@ class GPTAssistant:
         
         return summary
 
-    def save_message(self, db: Session, user_id: Optional[int], text: str, role: str = "user") -> Optional[Message]:
+    @staticmethod
+    def _conversation_id(user_id: Optional[int]) -> str:
+        return f"user-{user_id}" if user_id is not None else "user-anonymous"
+
+    def save_message(self, db: Session, user_id: Optional[int], text: str, role: str = "user") -> Optional[ChatMessage]:
         """Save message to database"""
         try:
-            message = Message(
-                user_id=user_id,
-                text=text,
+            message = ChatMessage(
+                channel="gpt",
+                conversation_id=self._conversation_id(user_id),
+                text=text or "",
                 role=role
             )
             db.add(message)
@@ -368,9 +373,9 @@ class GPTAssistant:
         """Load recent conversation history from database"""
         try:
             # Get recent messages for the user, ordered by creation time
-            messages = db.query(Message).filter(
-                Message.user_id == user_id
-            ).order_by(Message.id.desc()).limit(limit).all()
+            messages = db.query(ChatMessage).filter(
+                ChatMessage.conversation_id == self._conversation_id(user_id)
+            ).order_by(ChatMessage.id.desc()).limit(limit).all()
             
             # Reverse to get chronological order and convert to GPT format
             conversation_history = []
@@ -747,7 +752,7 @@ class GPTAssistant:
             prompt += f"\nمحصولات پیدا شده ({len(products)} عدد):\n"
             for i, product in enumerate(products, 1):
                 # Get sizes as list
-                sizes_list = product.sizes.split(",") if product.sizes else []
+                sizes_list = product.sizes or []
                 sizes_str = ", ".join(sizes_list) if sizes_list else "یکسان"
                 
                 # Get stock information
@@ -823,7 +828,7 @@ class GPTAssistant:
                     "id": p.id,
                     "name": p.name,
                     "price": p.price,
-                    "sizes": p.sizes.split(",") if p.sizes else [],
+                    "sizes": p.sizes or [],
                     "stock": p.stock
                 }
                 for p in products
@@ -6,7 +6,7 @@ import os
 import env
 
 # Load configuration first
-from backend.config import CORS_ORIGINS, IS_PRODUCTION, print_config_summary
+from backend.config import CORS_ORIGINS, IS_PRODUCTION, THREADPOOL_SIZE, ANALYTICS_ROLLUP_REFRESH_MINUTES, print_config_summary
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -27,12 +27,23 @@ from fastapi import FastAPI, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse
+from contextlib import asynccontextmanager
+import anyio.to_thread
+
+# Sync endpoints run on AnyIO's worker threads (40 by default); widen the limiter
+# so requests don't queue for a thread while DB connections sit idle in the pool
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    anyio.to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
+    logger.info(f"🧵 Threadpool size: {THREADPOOL_SIZE}")
+    yield
 
 # Create FastAPI app instance
 app = FastAPI(
     title="Zimmer Backend API",
     description="Backend API for Zimmer e-commerce platform",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Add CORS middleware with dynamic origins
@@ -169,7 +180,9 @@ async def telegram_webhook_direct(request: Request):
 try:
     from apscheduler.schedulers.background import BackgroundScheduler
     from apscheduler.triggers.cron import CronTrigger
+    from apscheduler.triggers.interval import IntervalTrigger
     from services.reports_service import ReportsService
+    from sqlalchemy import text
     from database import get_db
     
     scheduler = BackgroundScheduler()
@@ -194,6 +207,33 @@ try:
         except Exception as e:
             logging.error(f"❌ Error generating monthly report: {e}")
     
+    def refresh_analytics_rollup():
+        """Refresh the daily order-item rollup read by the analytics endpoints"""
+        try:
+            with engine.begin() as conn:
+                conn.execute(text("REFRESH MATERIALIZED VIEW CONCURRENTLY mv_order_item_daily"))
+                # now() is the transaction start, so every order committed before it is in the view
+                conn.execute(text(
+                    "INSERT INTO analytics_rollup_refreshes (view_name, refreshed_at) "
+                    "VALUES ('mv_order_item_daily', TIMEZONE('utc', now())) "
+                    "ON CONFLICT (view_name) DO UPDATE SET refreshed_at = EXCLUDED.refreshed_at"
+                ))
+        except Exception as e:
+            logging.error(f"❌ Error refreshing analytics rollup: {e}")
+    
+    def create_next_telegram_messages_partition():
+        """Create next month's telegram_messages partition ahead of time"""
+        try:
+            with engine.begin() as conn:
+                # Only databases that ran migrations/partition_telegram_messages.sql are partitioned
+                if not conn.execute(text("SELECT to_regprocedure('create_telegram_messages_partition(date)') IS NOT NULL")).scalar():
+                    return
+                conn.execute(text(
+                    "SELECT create_telegram_messages_partition((date_trunc('month', now()) + INTERVAL '1 month')::date)"
+                ))
+        except Exception as e:
+            logging.error(f"❌ Error creating telegram_messages partition: {e}")
+    
     # Schedule jobs
     scheduler.add_job(
         generate_weekly_report,
@@ -209,6 +249,22 @@ try:
         name='Generate Monthly Sales Report'
     )
     
+    # The rollup and the telegram_messages partitions are PostgreSQL only
+    if engine.dialect.name == "postgresql":
+        scheduler.add_job(
+            refresh_analytics_rollup,
+            IntervalTrigger(minutes=ANALYTICS_ROLLUP_REFRESH_MINUTES),
+            id='analytics_rollup_refresh',
+            name='Refresh Analytics Daily Rollup'
+        )
+        # Daily, so a missed run is retried well before the month turns over
+        scheduler.add_job(
+            create_next_telegram_messages_partition,
+            CronTrigger(hour=0, minute=20),
+            id='telegram_messages_partition',
+            name='Create Next Telegram Messages Partition'
+        )
+    
     # Start scheduler
     scheduler.start()
     logging.info("🚀 APScheduler started for automated reports")
@@ -8,6 +8,27 @@ import sqlite3
 import os
 from pathlib import Path
 
+# Shared-cache URI so the migration and backfill steps reuse one open connection
+_DB_URI = "file:app.db?mode=rwc&cache=shared"
+_conn = None
+
+
+def get_connection():
+    """Return the module-level connection, opening it on first use."""
+    global _conn
+    if _conn is None:
+        # Autocommit mode; callers drive transactions explicitly
+        _conn = sqlite3.connect(_DB_URI, uri=True, isolation_level=None, check_same_thread=False)
+    return _conn
+
+
+def close_connection():
+    """Close the shared connection if it was opened."""
+    global _conn
+    if _conn is not None:
+        _conn.close()
+        _conn = None
+
 def migrate_database():
     """Add new columns to products table."""
     
@@ -19,8 +40,7 @@ def migrate_database():
         return False
     
     try:
-        # Connect to database
-        conn = sqlite3.connect(db_path)
+        conn = get_connection()
         cursor = conn.cursor()
         
         print("🔍 Checking current database schema...")
@@ -31,6 +51,9 @@ def migrate_database():
         
         print(f"   Current columns: {', '.join(columns)}")
         
+        # Take the write lock up front instead of upgrading on the first ALTER
+        cursor.execute("BEGIN IMMEDIATE")
+        
         # Add labels_json column if it doesn't exist
         if 'labels_json' not in columns:
             print("➕ Adding labels_json column...")
@@ -48,7 +71,7 @@ def migrate_database():
             print("   ℹ️  attributes_json column already exists")
         
         # Commit changes
-        conn.commit()
+        cursor.execute("COMMIT")
         
         # Verify the new schema
         cursor.execute("PRAGMA table_info(products)")
@@ -73,13 +96,14 @@ def migrate_database():
         
     except sqlite3.Error as e:
         print(f"❌ Database error: {e}")
+        if 'conn' in locals() and conn.in_transaction:
+            conn.rollback()
         return False
     except Exception as e:
         print(f"❌ Unexpected error: {e}")
+        if 'conn' in locals() and conn.in_transaction:
+            conn.rollback()
         return False
-    finally:
-        if 'conn' in locals():
-            conn.close()
 
 def backfill_example_data():
     """Example of how to backfill some products with sample labels/attributes."""
@@ -90,7 +114,7 @@ def backfill_example_data():
         return False
     
     try:
-        conn = sqlite3.connect(db_path)
+        conn = get_connection()
         cursor = conn.cursor()
         
         print("\n🔄 Backfilling example data...")
@@ -113,7 +137,6 @@ def backfill_example_data():
                 WHERE id = ?
             """, (sample_labels, sample_attributes, product_id))
             
-            conn.commit()
             print("   ✅ Sample data added")
             print(f"   📋 Labels: {sample_labels}")
             print(f"   🏷️  Attributes: {sample_attributes}")
@@ -125,9 +148,6 @@ def backfill_example_data():
     except sqlite3.Error as e:
         print(f"❌ Database error: {e}")
         return False
-    finally:
-        if 'conn' in locals():
-            conn.close()
 
 if __name__ == "__main__":
     print("🚀 Starting Labels & Attributes Migration")
@@ -139,6 +159,7 @@ if __name__ == "__main__":
         response = input("\n🤔 Would you like to add sample labels/attributes to a product? (y/N): ")
         if response.lower() in ['y', 'yes']:
             backfill_example_data()
+    close_connection()
     
     print("\n✨ Migration script completed!")
     print("\n📚 Next steps:")
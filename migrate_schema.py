@@ -224,12 +224,15 @@ def migrate_schema():
         print("❌ Database file not found. Please run the application first to create the database.")
         return
     
-    conn = sqlite3.connect(db_path)
+    conn = sqlite3.connect(db_path, isolation_level=None, check_same_thread=False)
     cursor = conn.cursor()
     
     print("🔧 Starting database migration...")
     
     try:
+        # Take the write lock up front instead of upgrading on the first write
+        cursor.execute("BEGIN IMMEDIATE")
+        
         # Check if product_variants table exists
         cursor.execute("""
             SELECT name FROM sqlite_master 
@@ -346,42 +349,40 @@ def migrate_schema():
         # Update OrderStatus enum values in orders table
         print("🔧 Updating OrderStatus enum values...")
         
-        # First, check what status values exist
-        cursor.execute("SELECT DISTINCT status FROM orders")
-        existing_statuses = [row[0] for row in cursor.fetchall()]
-        
-        # Update old status values to new ones
-        if 'confirmed' in existing_statuses:
-            cursor.execute("""
-                UPDATE orders 
-                SET status = 'approved' 
-                WHERE status = 'confirmed'
-            """)
-            print("✅ Updated 'confirmed' → 'approved'")
-        
-        if 'processing' in existing_statuses:
-            cursor.execute("""
-                UPDATE orders 
-                SET status = 'approved' 
-                WHERE status = 'processing'
-            """)
-            print("✅ Updated 'processing' → 'approved'")
+        # The old SQLAlchemy Enum stored member names ('PENDING'); the model now stores values
+        cursor.execute("""
+            UPDATE orders 
+            SET status = lower(coalesce(status, 'pending')),
+                payment_status = lower(coalesce(payment_status, 'pending'))
+            WHERE status IS NULL OR status != lower(status)
+               OR payment_status IS NULL OR payment_status != lower(payment_status)
+        """)
+        print(f"✅ Normalized {cursor.rowcount} order status values")
         
-        if 'shipped' in existing_statuses:
+        cursor.execute("""
+            SELECT name FROM sqlite_master 
+            WHERE type='table' AND name='support_requests'
+        """)
+        if cursor.fetchone():
             cursor.execute("""
-                UPDATE orders 
-                SET status = 'sold' 
-                WHERE status = 'shipped'
+                UPDATE support_requests 
+                SET status = lower(coalesce(status, 'pending'))
+                WHERE status IS NULL OR status != lower(status)
             """)
-            print("✅ Updated 'shipped' → 'sold'")
+            print(f"✅ Normalized {cursor.rowcount} support request status values")
         
-        if 'delivered' in existing_statuses:
-            cursor.execute("""
-                UPDATE orders 
-                SET status = 'sold' 
-                WHERE status = 'delivered'
-            """)
-            print("✅ Updated 'delivered' → 'sold'")
+        # Remap legacy status values in one pass; a no-op when none remain
+        cursor.execute("""
+            UPDATE orders 
+            SET status = CASE status
+                WHEN 'confirmed' THEN 'approved'
+                WHEN 'processing' THEN 'approved'
+                WHEN 'shipped' THEN 'sold'
+                WHEN 'delivered' THEN 'sold'
+            END
+            WHERE status IN ('confirmed', 'processing', 'shipped', 'delivered')
+        """)
+        print(f"✅ Remapped {cursor.rowcount} legacy status values")
         
         # Add new status values if they don't exist
         cursor.execute("""
@@ -393,7 +394,7 @@ def migrate_schema():
         print("✅ OrderStatus enum values updated")
         
         # Commit all changes
-        conn.commit()
+        cursor.execute("COMMIT")
         print("✅ Database migration completed successfully!")
         
     except Exception as e:
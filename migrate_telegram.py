@@ -15,6 +15,9 @@ sys.path.insert(0, str(backend_dir))
 from database import engine, get_db
 from models import TelegramConfig, TelegramUser, TelegramMessage, FAQ, SalesReport
 from models import Base as MainBase
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -24,11 +27,8 @@ def migrate_telegram_tables():
     try:
         logger.info("🔧 Creating Telegram tables...")
         
-        # Create all Telegram tables
-        TelegramBase.metadata.create_all(bind=engine)
-        
-        # Create main tables (in case they don't exist)
-        MainBase.metadata.create_all(bind=engine)
+        # Telegram models live on the main Base; create_all is a no-op for existing tables
+        MainBase.metadata.create_all(bind=engine, checkfirst=True)
         
         logger.info("✅ Telegram tables created successfully")
         
@@ -44,20 +44,10 @@ def migrate_telegram_tables():
             'sales_reports'
         ]
         
-        existing_tables = inspector.get_table_names()
-        logger.info(f"📋 Existing tables: {existing_tables}")
-        
-        for table in expected_tables:
-            if table in existing_tables:
-                logger.info(f"✅ Table {table} exists")
-                
-                # Show table structure
-                columns = inspector.get_columns(table)
-                logger.info(f"   Columns in {table}:")
-                for col in columns:
-                    logger.info(f"     - {col['name']}: {col['type']}")
-            else:
-                logger.error(f"❌ Table {table} missing")
+        missing = set(expected_tables) - set(inspector.get_table_names())
+        if missing:
+            logger.error(f"❌ Tables missing: {sorted(missing)}")
+            return False
         
         return True
         
@@ -73,9 +63,6 @@ def create_sample_data():
         db = next(get_db())
         
         # Create sample FAQ
-        # FAQ already imported above
-        from datetime import datetime
-        
         sample_faqs = [
             {
                 'question': 'چطور می‌تونم محصولی رو سفارش بدم؟',
@@ -97,13 +84,15 @@ def create_sample_data():
             }
         ]
         
-        for faq_data in sample_faqs:
-            # Check if FAQ already exists
-            existing = db.query(FAQ).filter(FAQ.question == faq_data['question']).first()
-            if not existing:
-                faq = FAQ(**faq_data)
-                db.add(faq)
-                logger.info(f"✅ Added FAQ: {faq_data['question']}")
+        # Tables created before the unique index existed need it for ON CONFLICT; duplicate
+        # questions left by the old SELECT-then-INSERT seeding would block it, so keep the oldest
+        db.execute(text("DELETE FROM faqs WHERE id NOT IN (SELECT MIN(id) FROM faqs GROUP BY question)"))
+        db.execute(text("CREATE UNIQUE INDEX IF NOT EXISTS ux_faqs_question ON faqs(question)"))
+        
+        # One prepared upsert executed for all rows; existing questions are skipped by the DB
+        insert = pg_insert if engine.dialect.name == "postgresql" else sqlite_insert
+        stmt = insert(FAQ).on_conflict_do_nothing(index_elements=['question'])
+        db.execute(stmt, sample_faqs)
         
         db.commit()
         logger.info("✅ Sample data created successfully")
@@ -0,0 +1,7 @@
+-- Partial indexes for the storefront hot path (active rows only)
+-- Replaces the full B-tree on the low-cardinality product_variants.is_active flag
+-- SQLite stores booleans as 0/1; on PostgreSQL use "WHERE is_active = true"
+DROP INDEX IF EXISTS ix_product_variants_is_active;
+
+CREATE INDEX IF NOT EXISTS ix_products_active_category ON products(category_id, created_at) WHERE is_active = 1;
+CREATE INDEX IF NOT EXISTS ix_variants_active_product ON product_variants(product_id) WHERE is_active = 1;
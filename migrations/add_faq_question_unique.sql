@@ -0,0 +1,5 @@
+-- Enforce unique FAQ questions so seeding can use INSERT ... ON CONFLICT DO NOTHING
+-- The old SELECT-then-INSERT seeding could race into duplicate questions; keep the oldest
+-- row of each so the index can be built (works on SQLite and PostgreSQL)
+DELETE FROM faqs WHERE id NOT IN (SELECT MIN(id) FROM faqs GROUP BY question);
+CREATE UNIQUE INDEX IF NOT EXISTS ux_faqs_question ON faqs(question);
@@ -0,0 +1,11 @@
+-- Composite (owner, created_at DESC) indexes for message history pagination
+-- They replace the single-column indexes on the leading column (works on SQLite and PostgreSQL)
+-- No INCLUDE (direction, text): message text can exceed the B-tree tuple size limit
+
+DROP INDEX IF EXISTS ix_telegram_messages_user_id;
+CREATE INDEX IF NOT EXISTS ix_telegram_messages_user_created ON telegram_messages(user_id, created_at DESC);
+
+DROP INDEX IF EXISTS ix_chat_messages_conversation_id;
+CREATE INDEX IF NOT EXISTS ix_chat_messages_conversation_created ON chat_messages(conversation_id, created_at DESC);
+
+CREATE INDEX IF NOT EXISTS ix_messages_user_created ON messages(user_id, created_at DESC);
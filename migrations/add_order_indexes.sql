@@ -0,0 +1,5 @@
+-- Composite indexes for status-filtered listings and customer order history
+-- On PostgreSQL run each statement with CREATE INDEX CONCURRENTLY to avoid locking orders
+CREATE INDEX IF NOT EXISTS ix_orders_status_created_at ON orders(status, created_at);
+CREATE INDEX IF NOT EXISTS ix_orders_customer_created_at ON orders(customer_id, created_at);
+CREATE INDEX IF NOT EXISTS ix_orders_payment_status ON orders(payment_status);
@@ -0,0 +1,32 @@
+-- Daily per-product sales rollup for the analytics summary and product details.
+-- Finished days are read from here instead of re-aggregating order_items JOIN orders;
+-- the app refreshes it on a schedule (ANALYTICS_ROLLUP_REFRESH_MINUTES), the unique
+-- index is what allows REFRESH MATERIALIZED VIEW CONCURRENTLY
+-- PostgreSQL only; on SQLite the analytics fall back to the live aggregate
+CREATE MATERIALIZED VIEW IF NOT EXISTS mv_order_item_daily AS
+SELECT
+    oi.product_id,
+    p.category_id,
+    CAST(o.created_at AS date) AS sale_date,
+    SUM(oi.quantity) AS qty,
+    SUM(oi.quantity * oi.unit_price) AS revenue,
+    COUNT(DISTINCT o.id) AS order_count,
+    COUNT(oi.id) AS item_count,
+    SUM(oi.unit_price) AS price_sum,
+    MIN(oi.unit_price) AS min_price,
+    MAX(oi.unit_price) AS max_price
+FROM order_items oi
+JOIN orders o ON o.id = oi.order_id
+JOIN products p ON p.id = oi.product_id
+GROUP BY oi.product_id, p.category_id, CAST(o.created_at AS date);
+
+CREATE UNIQUE INDEX IF NOT EXISTS ux_mv_order_item_daily_product_date ON mv_order_item_daily(product_id, sale_date);
+CREATE INDEX IF NOT EXISTS ix_mv_order_item_daily_sale_date ON mv_order_item_daily(sale_date);
+
+-- Start time of the last successful refresh, written in the refresh transaction. The
+-- analytics only read days that ended before it, so a late or failing refresh job
+-- falls back to the live aggregate instead of serving a stale rollup
+CREATE TABLE IF NOT EXISTS analytics_rollup_refreshes (
+    view_name VARCHAR PRIMARY KEY,
+    refreshed_at TIMESTAMP WITHOUT TIME ZONE NOT NULL
+);
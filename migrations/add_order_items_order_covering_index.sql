@@ -0,0 +1,9 @@
+-- order_items.order_id had no index: every selectin load of Order.items, the
+-- totals sync after flush and the analytics OrderItem -> Order join scanned
+-- the whole table. The INCLUDE columns let the analytics per-product
+-- aggregate read (order_id, product_id, quantity, unit_price) from the index
+-- alone; the orders side is already covered by ix_orders_created_at_totals
+-- PostgreSQL syntax (INCLUDE); SQLite gets a plain (order_id) index from create_all
+-- On PostgreSQL run with CREATE INDEX CONCURRENTLY to avoid locking order_items,
+-- then VACUUM ANALYZE order_items so the visibility map allows index-only scans
+CREATE INDEX IF NOT EXISTS ix_order_items_order_covering ON order_items(order_id) INCLUDE (product_id, quantity, unit_price);
@@ -0,0 +1,6 @@
+-- The product analytics (search and details) select a product's order lines and
+-- count distinct orders per product; order_items had no index on product_id, so
+-- each request scanned the whole table. (product_id, order_id) serves the filter and
+-- the distinct count, the included columns cover the quantity/revenue sums
+-- On PostgreSQL run with CREATE INDEX CONCURRENTLY to avoid locking order_items
+CREATE INDEX IF NOT EXISTS ix_order_items_product_order ON order_items(product_id, order_id) INCLUDE (quantity, unit_price);
@@ -0,0 +1,9 @@
+-- Legacy order numbers (ORD-YYYY-NNNNNN) come from a sequence instead of a
+-- millisecond timestamp modulo 10000, which collided under bursts
+-- PostgreSQL only; SQLite has no sequences, so the order is flushed and numbered
+-- after its own assigned orders.id
+
+CREATE SEQUENCE IF NOT EXISTS order_number_seq;
+
+-- Start past every order already in the table
+SELECT setval('order_number_seq', COALESCE(MAX(id), 0) + 1, false) FROM orders;
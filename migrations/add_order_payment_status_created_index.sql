@@ -0,0 +1,6 @@
+-- Payment-status filtered order listings are ordered by created_at DESC;
+-- a composite (payment_status, created_at) index serves the filter and the
+-- ordering with a backward index scan, and replaces the single-column index
+-- On PostgreSQL run with CREATE INDEX CONCURRENTLY to avoid locking orders
+CREATE INDEX IF NOT EXISTS ix_orders_payment_status_created_at ON orders(payment_status, created_at);
+DROP INDEX IF EXISTS ix_orders_payment_status;
@@ -0,0 +1,14 @@
+-- Guard denormalized order totals (PostgreSQL; SQLite picks this up only for newly created tables)
+UPDATE orders o
+SET items_count = COALESCE(t.qty, 0),
+    total_amount = COALESCE(t.total, 0),
+    final_amount = COALESCE(t.total, 0) + COALESCE(o.shipping_cost, 0) - COALESCE(o.discount_amount, 0)
+FROM (
+  SELECT order_id, SUM(quantity) AS qty, SUM(total_price) AS total
+  FROM order_items
+  GROUP BY order_id
+) t
+WHERE t.order_id = o.id;
+
+ALTER TABLE orders ADD CONSTRAINT ck_orders_final_amount
+  CHECK (final_amount = total_amount + shipping_cost - discount_amount);
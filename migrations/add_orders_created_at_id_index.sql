@@ -0,0 +1,6 @@
+-- The analytics top products, product search and product details join the orders
+-- of a created_at window to their items; (created_at, id) yields those order ids
+-- from an index-only range scan. The item side is covered by ix_order_items_order_covering
+-- and ix_order_items_product_order, the distinct-customer count by ix_orders_created_at_totals
+-- On PostgreSQL run with CREATE INDEX CONCURRENTLY to avoid locking orders
+CREATE INDEX IF NOT EXISTS ix_orders_created_at_id ON orders(created_at, id);
@@ -0,0 +1,6 @@
+-- The analytics summary counts orders, sums final_amount and counts distinct
+-- customer phones over a created_at window in a single aggregate; with these
+-- columns in one (created_at, final_amount, customer_phone) index the window
+-- is answered by an index-only range scan without touching the heap
+-- On PostgreSQL run with CREATE INDEX CONCURRENTLY to avoid locking orders
+CREATE INDEX IF NOT EXISTS ix_orders_created_at_totals ON orders(created_at, final_amount, customer_phone);
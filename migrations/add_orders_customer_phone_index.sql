@@ -0,0 +1,4 @@
+-- The users list aggregates order count and spend per customer phone, and the user
+-- details page lists a phone's orders; orders had no index leading with customer_phone
+-- On PostgreSQL run with CREATE INDEX CONCURRENTLY to avoid locking orders
+CREATE INDEX IF NOT EXISTS ix_orders_customer_phone ON orders(customer_phone) INCLUDE (final_amount);
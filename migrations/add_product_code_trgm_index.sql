@@ -0,0 +1,8 @@
+-- Trigram GIN index on products.code so the name/code ILIKE '%term%'
+-- filters of the product list and chatbot endpoints can use indexes
+-- (the unique btree on code only serves exact and prefix matches)
+-- PostgreSQL only; SQLite keeps scanning
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS ix_products_code_trgm ON products USING gin (code gin_trgm_ops);
@@ -0,0 +1,8 @@
+-- Trigram GIN index on products.description so the name/description
+-- ILIKE '%term%' search in search_products_by_name can use indexes
+-- (ix_products_name_trgm already covers name)
+-- PostgreSQL only; SQLite keeps scanning
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS ix_products_description_trgm ON products USING gin (description gin_trgm_ops);
@@ -0,0 +1,23 @@
+-- products.category_id cascades category deletes (matches the model); product_variants already
+-- cascade from products. The existing FK's name depends on how the table was created, so it is
+-- looked up in the catalog rather than assumed
+-- PostgreSQL
+DO $$
+DECLARE
+  fk_name text;
+BEGIN
+  FOR fk_name IN
+    SELECT c.conname
+    FROM pg_constraint c
+    JOIN pg_attribute a ON a.attrelid = c.conrelid AND a.attnum = ANY (c.conkey)
+    WHERE c.contype = 'f'
+      AND c.conrelid = 'products'::regclass
+      AND c.confrelid = 'categories'::regclass
+      AND a.attname = 'category_id'
+  LOOP
+    EXECUTE format('ALTER TABLE products DROP CONSTRAINT %I', fk_name);
+  END LOOP;
+END $$;
+
+ALTER TABLE products ADD CONSTRAINT products_category_id_fkey
+  FOREIGN KEY (category_id) REFERENCES categories(id) ON DELETE CASCADE;
@@ -0,0 +1,4 @@
+-- The product list pages by keyset on (created_at, id) instead of OFFSET;
+-- a backward scan of this index serves the default created_at DESC order
+-- On PostgreSQL run with CREATE INDEX CONCURRENTLY to avoid locking products
+CREATE INDEX IF NOT EXISTS ix_products_created_at_id ON products(created_at, id);
@@ -0,0 +1,8 @@
+-- Trigram GIN indexes so ILIKE '%term%' searches on product names/tags and FAQ questions use an index
+-- PostgreSQL only (requires the pg_trgm extension); SQLite keeps scanning
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS ix_products_name_trgm ON products USING gin (name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS ix_products_tags_trgm ON products USING gin (tags gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS ix_faqs_question_trgm ON faqs USING gin (question gin_trgm_ops);
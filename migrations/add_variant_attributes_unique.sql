@@ -0,0 +1,42 @@
+-- One variant per (product, attribute combination)
+-- attributes_hash is written by the application (SHA-1 of the sort_keys JSON, sha1('{}') for empty
+-- attributes); legacy size/color variants keep NULL and are exempt from the index
+
+BEGIN;
+
+-- Backfill the canonical empty-attributes hash on rows written before the application set it
+UPDATE product_variants
+SET attributes_hash = 'bf21a9e8fbc5a3846fb05b4fa0859e0917b2202f'
+WHERE attributes_hash IS NULL
+  AND (attributes IS NULL OR attributes::text IN ('{}', 'null'))
+  AND size IS NULL AND color IS NULL;
+
+-- Merge duplicate (product_id, attributes_hash) rows into the lowest id:
+-- repoint order items, fold the stock in, then drop the duplicates
+CREATE TEMP TABLE variant_dups ON COMMIT DROP AS
+SELECT id, keep_id, stock_qty
+FROM (
+    SELECT id, stock_qty,
+           MIN(id) OVER (PARTITION BY product_id, attributes_hash) AS keep_id
+    FROM product_variants
+    WHERE attributes_hash IS NOT NULL
+) ranked
+WHERE id <> keep_id;
+
+UPDATE order_items oi
+SET variant_id = d.keep_id
+FROM variant_dups d
+WHERE oi.variant_id = d.id;
+
+UPDATE product_variants v
+SET stock_qty = v.stock_qty + s.extra
+FROM (SELECT keep_id, SUM(stock_qty) AS extra FROM variant_dups GROUP BY keep_id) s
+WHERE v.id = s.keep_id;
+
+DELETE FROM product_variants v
+USING variant_dups d
+WHERE v.id = d.id;
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_variant_product_attrs ON product_variants(product_id, attributes_hash);
+
+COMMIT;
@@ -0,0 +1,22 @@
+-- Native JSONB for columns that used to hold JSON strings in TEXT
+-- PostgreSQL; legacy values that are empty or not valid JSON become NULL instead of failing the cast.
+-- On SQLite the TEXT values are decoded on read, and the JSONDoc type reads malformed ones as None
+
+CREATE FUNCTION pg_temp.try_jsonb(value text) RETURNS jsonb AS $$
+BEGIN
+  RETURN NULLIF(btrim(value), '')::jsonb;
+EXCEPTION WHEN invalid_text_representation THEN
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql IMMUTABLE;
+
+ALTER TABLE products
+  ALTER COLUMN available_sizes_json TYPE JSONB USING pg_temp.try_jsonb(available_sizes_json),
+  ALTER COLUMN available_colors_json TYPE JSONB USING pg_temp.try_jsonb(available_colors_json),
+  ALTER COLUMN labels_json TYPE JSONB USING pg_temp.try_jsonb(labels_json),
+  ALTER COLUMN attributes_json TYPE JSONB USING pg_temp.try_jsonb(attributes_json);
+
+ALTER TABLE chat_messages ALTER COLUMN slots_json TYPE JSONB USING pg_temp.try_jsonb(slots_json);
+ALTER TABLE telegram_messages ALTER COLUMN payload_json TYPE JSONB USING pg_temp.try_jsonb(payload_json);
+-- totals_json is NOT NULL: an unreadable report keeps an empty object
+ALTER TABLE sales_reports ALTER COLUMN totals_json TYPE JSONB USING COALESCE(pg_temp.try_jsonb(totals_json), '{}'::jsonb);
@@ -0,0 +1,20 @@
+-- Store every money column as NUMERIC(12,2) instead of a mix of double precision and NUMERIC(10,2)
+-- PostgreSQL; SQLite has no column type changes and keeps numeric affinity for these columns
+
+ALTER TABLE orders
+  ALTER COLUMN total_amount TYPE NUMERIC(12, 2),
+  ALTER COLUMN shipping_cost TYPE NUMERIC(12, 2),
+  ALTER COLUMN discount_amount TYPE NUMERIC(12, 2),
+  ALTER COLUMN final_amount TYPE NUMERIC(12, 2);
+
+ALTER TABLE order_items
+  ALTER COLUMN product_price TYPE NUMERIC(12, 2),
+  ALTER COLUMN unit_price_snapshot TYPE NUMERIC(12, 2),
+  ALTER COLUMN unit_price TYPE NUMERIC(12, 2),
+  ALTER COLUMN total_price TYPE NUMERIC(12, 2);
+
+ALTER TABLE products ALTER COLUMN price TYPE NUMERIC(12, 2);
+
+ALTER TABLE product_variants
+  ALTER COLUMN price_override TYPE NUMERIC(12, 2),
+  ALTER COLUMN price_delta TYPE NUMERIC(12, 2);
@@ -0,0 +1,20 @@
+-- products.sizes: comma-separated text -> text[] with a GIN index, so
+-- "which products come in size X" (sizes @> ARRAY['X']) is an index probe.
+-- tags stay as text: they are matched with ILIKE '%term%' substring searches,
+-- which the trigram indexes serve and an array index cannot.
+
+-- PostgreSQL
+ALTER TABLE products
+    ALTER COLUMN sizes TYPE VARCHAR(32)[]
+    USING CASE
+        WHEN sizes IS NULL OR btrim(sizes) = '' THEN NULL
+        ELSE array_remove(string_to_array(regexp_replace(sizes, '\s*,\s*', ',', 'g'), ','), '')::VARCHAR(32)[]
+    END;
+
+CREATE INDEX IF NOT EXISTS ix_products_sizes_gin ON products USING gin (sizes);
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE INDEX IF NOT EXISTS ix_faqs_tags_trgm ON faqs USING gin (tags gin_trgm_ops);
+
+-- SQLite: no DDL needed. The column keeps its TEXT affinity and new writes are
+-- stored as JSON arrays; legacy comma-separated rows are still read back as lists.
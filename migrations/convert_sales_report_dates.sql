@@ -0,0 +1,9 @@
+-- Store sales report ranges as DATE and index the (period, range) lookup
+-- SQLite already holds ISO-8601 text ('YYYY-MM-DD'), which SQLAlchemy's Date type reads as-is
+
+-- PostgreSQL
+ALTER TABLE sales_reports
+  ALTER COLUMN start_date TYPE DATE USING start_date::date,
+  ALTER COLUMN end_date TYPE DATE USING end_date::date;
+
+CREATE INDEX IF NOT EXISTS ix_sales_reports_period_range ON sales_reports(period, start_date, end_date);
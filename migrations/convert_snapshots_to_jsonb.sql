@@ -0,0 +1,10 @@
+-- JSONB + GIN for snapshot/attribute documents so containment (@>) filters use an index
+-- PostgreSQL only; SQLite keeps these as JSON text columns
+
+ALTER TABLE orders ALTER COLUMN customer_snapshot TYPE JSONB USING customer_snapshot::jsonb;
+ALTER TABLE order_items ALTER COLUMN variant_attributes_snapshot TYPE JSONB USING variant_attributes_snapshot::jsonb;
+ALTER TABLE products ALTER COLUMN attribute_schema TYPE JSONB USING attribute_schema::jsonb;
+ALTER TABLE product_variants ALTER COLUMN attributes TYPE JSONB USING attributes::jsonb;
+
+CREATE INDEX IF NOT EXISTS ix_orders_snapshot_gin ON orders USING gin (customer_snapshot jsonb_path_ops);
+CREATE INDEX IF NOT EXISTS ix_variants_attrs_gin ON product_variants USING gin (attributes jsonb_path_ops);
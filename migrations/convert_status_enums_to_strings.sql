@@ -0,0 +1,28 @@
+-- Store order/payment/support statuses as plain value strings guarded by CHECK constraints
+-- SQLAlchemy's Enum type persisted member names (e.g. 'PENDING'); normalize to values ('pending')
+
+-- PostgreSQL
+ALTER TABLE orders ALTER COLUMN status TYPE VARCHAR(16) USING lower(status::text);
+ALTER TABLE orders ALTER COLUMN payment_status TYPE VARCHAR(16) USING lower(payment_status::text);
+ALTER TABLE support_requests ALTER COLUMN status TYPE VARCHAR(16) USING lower(status::text);
+DROP TYPE IF EXISTS orderstatus;
+DROP TYPE IF EXISTS paymentstatus;
+DROP TYPE IF EXISTS supportrequeststatus;
+
+-- The enum columns allowed NULL; the model declares them NOT NULL
+UPDATE orders SET status = 'pending' WHERE status IS NULL;
+UPDATE orders SET payment_status = 'pending' WHERE payment_status IS NULL;
+UPDATE support_requests SET status = 'pending' WHERE status IS NULL;
+ALTER TABLE orders ALTER COLUMN status SET NOT NULL;
+ALTER TABLE orders ALTER COLUMN payment_status SET NOT NULL;
+ALTER TABLE support_requests ALTER COLUMN status SET NOT NULL;
+
+ALTER TABLE orders ADD CONSTRAINT ck_orders_status
+  CHECK (status IN ('draft', 'pending', 'approved', 'sold', 'cancelled'));
+ALTER TABLE orders ADD CONSTRAINT ck_orders_payment_status
+  CHECK (payment_status IN ('pending', 'paid', 'failed', 'refunded'));
+ALTER TABLE support_requests ADD CONSTRAINT ck_support_requests_status
+  CHECK (status IN ('pending', 'in_progress', 'resolved', 'closed'));
+
+-- SQLite (columns are already TEXT; only the stored values change): migrate_schema.py
+-- lowercases the stored names and fills NULLs with 'pending'
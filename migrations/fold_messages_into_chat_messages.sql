@@ -0,0 +1,15 @@
+-- Fold the legacy messages table (GPT assistant history) into chat_messages
+-- Works on SQLite and PostgreSQL
+
+ALTER TABLE chat_messages ADD COLUMN channel VARCHAR(16) NOT NULL DEFAULT 'web';
+
+INSERT INTO chat_messages (channel, conversation_id, role, text, created_at)
+SELECT 'gpt',
+       CASE WHEN user_id IS NULL THEN 'user-anonymous' ELSE 'user-' || user_id END,
+       COALESCE(role, 'user'),
+       COALESCE(text, ''),
+       created_at
+FROM messages
+ORDER BY id;
+
+DROP TABLE messages;
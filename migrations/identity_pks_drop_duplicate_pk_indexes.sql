@@ -0,0 +1,29 @@
+-- Primary keys are already backed by a unique index; drop the duplicate ix_<table>_id indexes
+-- (works on both SQLite and PostgreSQL)
+DROP INDEX IF EXISTS ix_users_id;
+DROP INDEX IF EXISTS ix_messages_id;
+DROP INDEX IF EXISTS ix_chat_messages_id;
+DROP INDEX IF EXISTS ix_orders_id;
+DROP INDEX IF EXISTS ix_order_items_id;
+DROP INDEX IF EXISTS ix_receipts_id;
+DROP INDEX IF EXISTS ix_fallback_questions_id;
+DROP INDEX IF EXISTS ix_categories_id;
+DROP INDEX IF EXISTS ix_products_id;
+DROP INDEX IF EXISTS ix_product_variants_id;
+DROP INDEX IF EXISTS ix_bot_configs_id;
+DROP INDEX IF EXISTS ix_telegram_configs_id;
+DROP INDEX IF EXISTS ix_telegram_users_id;
+DROP INDEX IF EXISTS ix_telegram_messages_id;
+DROP INDEX IF EXISTS ix_faqs_id;
+DROP INDEX IF EXISTS ix_sales_reports_id;
+
+-- PostgreSQL: switch the insert-heavy order tables from SERIAL to identity columns
+ALTER TABLE orders ALTER COLUMN id DROP DEFAULT;
+DROP SEQUENCE IF EXISTS orders_id_seq;
+ALTER TABLE orders ALTER COLUMN id ADD GENERATED BY DEFAULT AS IDENTITY;
+SELECT setval(pg_get_serial_sequence('orders', 'id'), COALESCE((SELECT max(id) FROM orders), 0) + 1, false);
+
+ALTER TABLE order_items ALTER COLUMN id DROP DEFAULT;
+DROP SEQUENCE IF EXISTS order_items_id_seq;
+ALTER TABLE order_items ALTER COLUMN id ADD GENERATED BY DEFAULT AS IDENTITY;
+SELECT setval(pg_get_serial_sequence('order_items', 'id'), COALESCE((SELECT max(id) FROM order_items), 0) + 1, false);
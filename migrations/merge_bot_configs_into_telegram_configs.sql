@@ -0,0 +1,34 @@
+-- Fold bot_configs into telegram_configs and allow only one active bot
+-- Works on SQLite (3.23+) and PostgreSQL
+
+ALTER TABLE telegram_configs ADD COLUMN bot_username VARCHAR;
+ALTER TABLE telegram_configs ADD COLUMN bot_name VARCHAR;
+
+-- Copy bots that only exist in bot_configs (inactive for now, see below)
+INSERT INTO telegram_configs (bot_token, webhook_url, webhook_secret, bot_username, bot_name, is_active, created_at, updated_at)
+SELECT b.bot_token, COALESCE(b.webhook_url, ''), '', b.bot_username, b.bot_name, FALSE, b.created_at, b.updated_at
+FROM bot_configs b
+WHERE NOT EXISTS (SELECT 1 FROM telegram_configs t WHERE t.bot_token = b.bot_token);
+
+UPDATE telegram_configs
+SET bot_username = (SELECT b.bot_username FROM bot_configs b WHERE b.bot_token = telegram_configs.bot_token),
+    bot_name = (SELECT b.bot_name FROM bot_configs b WHERE b.bot_token = telegram_configs.bot_token)
+WHERE bot_username IS NULL;
+
+-- Keep the newest active config only
+UPDATE telegram_configs SET is_active = FALSE
+WHERE is_active = TRUE
+  AND id <> (SELECT max(id) FROM telegram_configs WHERE is_active = TRUE);
+
+-- No active config yet: take over the most recent active bot from bot_configs
+UPDATE telegram_configs SET is_active = TRUE
+WHERE id = (
+    SELECT max(t.id) FROM telegram_configs t
+    JOIN bot_configs b ON b.bot_token = t.bot_token
+    WHERE b.is_active = TRUE
+  )
+  AND NOT EXISTS (SELECT 1 FROM telegram_configs WHERE is_active = TRUE);
+
+CREATE UNIQUE INDEX IF NOT EXISTS ix_telegram_configs_active ON telegram_configs(is_active) WHERE is_active = TRUE;
+
+DROP TABLE bot_configs;
@@ -0,0 +1,90 @@
+-- Partition the append-only telegram_messages log by month (PostgreSQL 11+)
+-- The partition key must be part of the primary key, so the PK becomes (id, created_at).
+-- That PK does not enforce id uniqueness; only the id sequence keeps ids distinct.
+-- create_all builds the plain table, so fresh PostgreSQL installs run this migration too.
+-- SQLite keeps the plain table.
+
+BEGIN;
+
+ALTER TABLE telegram_messages RENAME TO telegram_messages_old;
+
+CREATE TABLE telegram_messages (
+  id INTEGER NOT NULL DEFAULT nextval('telegram_messages_id_seq'),
+  user_id INTEGER NOT NULL REFERENCES telegram_users(id),
+  direction VARCHAR NOT NULL,
+  text TEXT NOT NULL,
+  payload_json JSONB,
+  created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+  PRIMARY KEY (id, created_at)
+) PARTITION BY RANGE (created_at);
+
+-- Creates the partition holding month_start's month. The app's scheduler calls it daily for
+-- the next month. Rows of that month that already landed in the default partition would make
+-- the CREATE fail, so they are moved into the new partition.
+-- Already-partitioned databases can re-run just this statement to pick up a newer version.
+CREATE OR REPLACE FUNCTION create_telegram_messages_partition(month_start DATE) RETURNS void AS $$
+DECLARE
+  part_name TEXT := 'telegram_messages_' || to_char(month_start, 'YYYY_MM');
+  lower_bound DATE := date_trunc('month', month_start)::date;
+  upper_bound DATE := (date_trunc('month', month_start) + INTERVAL '1 month')::date;
+BEGIN
+  IF to_regclass(part_name) IS NOT NULL THEN
+    RETURN;
+  END IF;
+
+  IF to_regclass('telegram_messages_default') IS NOT NULL THEN
+    CREATE TEMP TABLE telegram_messages_stray AS
+      SELECT * FROM telegram_messages_default WHERE created_at >= lower_bound AND created_at < upper_bound;
+    DELETE FROM telegram_messages_default WHERE created_at >= lower_bound AND created_at < upper_bound;
+  END IF;
+
+  EXECUTE format(
+    'CREATE TABLE %I PARTITION OF telegram_messages FOR VALUES FROM (%L) TO (%L)',
+    part_name, lower_bound, upper_bound
+  );
+
+  IF to_regclass('pg_temp.telegram_messages_stray') IS NOT NULL THEN
+    INSERT INTO telegram_messages SELECT * FROM telegram_messages_stray;
+    DROP TABLE telegram_messages_stray;
+  END IF;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Partitions for existing history plus three months ahead
+SELECT create_telegram_messages_partition(m::date)
+FROM generate_series(
+  date_trunc('month', COALESCE((SELECT min(created_at) FROM telegram_messages_old), now())),
+  date_trunc('month', now()) + INTERVAL '3 months',
+  INTERVAL '1 month'
+) AS m;
+
+-- Catches rows outside the pre-created range instead of failing the insert
+CREATE TABLE telegram_messages_default PARTITION OF telegram_messages DEFAULT;
+
+-- Empty or malformed legacy payload text becomes NULL instead of aborting the copy
+-- (same cast as convert_json_text_to_jsonb.sql; a no-op for columns already JSONB)
+CREATE FUNCTION pg_temp.try_jsonb(value text) RETURNS jsonb AS $$
+BEGIN
+  RETURN NULLIF(btrim(value), '')::jsonb;
+EXCEPTION WHEN invalid_text_representation THEN
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql IMMUTABLE;
+
+INSERT INTO telegram_messages (id, user_id, direction, text, payload_json, created_at)
+SELECT id, user_id, direction, text, pg_temp.try_jsonb(payload_json::text), created_at FROM telegram_messages_old;
+
+ALTER SEQUENCE telegram_messages_id_seq OWNED BY telegram_messages.id;
+DROP TABLE telegram_messages_old;
+
+-- The old table's indexes went with it; "latest N messages for a user" needs this one
+CREATE INDEX ix_telegram_messages_user_created ON telegram_messages(user_id, created_at DESC);
+
+
+COMMIT;
+
+-- Monthly maintenance (scheduled by the app, see main.py):
+--   SELECT create_telegram_messages_partition((date_trunc('month', now()) + INTERVAL '1 month')::date);
+-- Retention (drop a whole month instead of a large DELETE):
+--   ALTER TABLE telegram_messages DETACH PARTITION telegram_messages_2024_01;
+--   DROP TABLE telegram_messages_2024_01;
@@ -0,0 +1,110 @@
+-- created_at/updated_at are generated by the database (UTC, see utcnow in models.py)
+-- SQLite needs no DDL: the ORM renders the default expression into each INSERT/UPDATE.
+
+-- PostgreSQL
+UPDATE customers SET created_at = TIMEZONE('utc', CURRENT_TIMESTAMP) WHERE created_at IS NULL;
+ALTER TABLE customers
+  ALTER COLUMN created_at SET DEFAULT TIMEZONE('utc', CURRENT_TIMESTAMP),
+  ALTER COLUMN created_at SET NOT NULL;
+
+UPDATE users SET created_at = TIMEZONE('utc', CURRENT_TIMESTAMP) WHERE created_at IS NULL;
+ALTER TABLE users
+  ALTER COLUMN created_at SET DEFAULT TIMEZONE('utc', CURRENT_TIMESTAMP),
+  ALTER COLUMN created_at SET NOT NULL;
+
+UPDATE messages SET created_at = TIMEZONE('utc', CURRENT_TIMESTAMP) WHERE created_at IS NULL;
+ALTER TABLE messages
+  ALTER COLUMN created_at SET DEFAULT TIMEZONE('utc', CURRENT_TIMESTAMP),
+  ALTER COLUMN created_at SET NOT NULL;
+
+UPDATE chat_messages SET created_at = TIMEZONE('utc', CURRENT_TIMESTAMP) WHERE created_at IS NULL;
+ALTER TABLE chat_messages
+  ALTER COLUMN created_at SET DEFAULT TIMEZONE('utc', CURRENT_TIMESTAMP),
+  ALTER COLUMN created_at SET NOT NULL;
+
+UPDATE fallback_questions SET created_at = TIMEZONE('utc', CURRENT_TIMESTAMP) WHERE created_at IS NULL;
+ALTER TABLE fallback_questions
+  ALTER COLUMN created_at SET DEFAULT TIMEZONE('utc', CURRENT_TIMESTAMP),
+  ALTER COLUMN created_at SET NOT NULL;
+
+UPDATE categories SET created_at = TIMEZONE('utc', CURRENT_TIMESTAMP) WHERE created_at IS NULL;
+ALTER TABLE categories
+  ALTER COLUMN created_at SET DEFAULT TIMEZONE('utc', CURRENT_TIMESTAMP),
+  ALTER COLUMN created_at SET NOT NULL;
+
+UPDATE telegram_messages SET created_at = TIMEZONE('utc', CURRENT_TIMESTAMP) WHERE created_at IS NULL;
+ALTER TABLE telegram_messages
+  ALTER COLUMN created_at SET DEFAULT TIMEZONE('utc', CURRENT_TIMESTAMP),
+  ALTER COLUMN created_at SET NOT NULL;
+
+UPDATE orders SET created_at = TIMEZONE('utc', CURRENT_TIMESTAMP) WHERE created_at IS NULL;
+UPDATE orders SET updated_at = TIMEZONE('utc', CURRENT_TIMESTAMP) WHERE updated_at IS NULL;
+ALTER TABLE orders
+  ALTER COLUMN created_at SET DEFAULT TIMEZONE('utc', CURRENT_TIMESTAMP),
+  ALTER COLUMN created_at SET NOT NULL,
+  ALTER COLUMN updated_at SET DEFAULT TIMEZONE('utc', CURRENT_TIMESTAMP),
+  ALTER COLUMN updated_at SET NOT NULL;
+
+UPDATE products SET created_at = TIMEZONE('utc', CURRENT_TIMESTAMP) WHERE created_at IS NULL;
+UPDATE products SET updated_at = TIMEZONE('utc', CURRENT_TIMESTAMP) WHERE updated_at IS NULL;
+ALTER TABLE products
+  ALTER COLUMN created_at SET DEFAULT TIMEZONE('utc', CURRENT_TIMESTAMP),
+  ALTER COLUMN created_at SET NOT NULL,
+  ALTER COLUMN updated_at SET DEFAULT TIMEZONE('utc', CURRENT_TIMESTAMP),
+  ALTER COLUMN updated_at SET NOT NULL;
+
+UPDATE product_variants SET created_at = TIMEZONE('utc', CURRENT_TIMESTAMP) WHERE created_at IS NULL;
+UPDATE product_variants SET updated_at = TIMEZONE('utc', CURRENT_TIMESTAMP) WHERE updated_at IS NULL;
+ALTER TABLE product_variants
+  ALTER COLUMN created_at SET DEFAULT TIMEZONE('utc', CURRENT_TIMESTAMP),
+  ALTER COLUMN created_at SET NOT NULL,
+  ALTER COLUMN updated_at SET DEFAULT TIMEZONE('utc', CURRENT_TIMESTAMP),
+  ALTER COLUMN updated_at SET NOT NULL;
+
+UPDATE bot_configs SET created_at = TIMEZONE('utc', CURRENT_TIMESTAMP) WHERE created_at IS NULL;
+UPDATE bot_configs SET updated_at = TIMEZONE('utc', CURRENT_TIMESTAMP) WHERE updated_at IS NULL;
+ALTER TABLE bot_configs
+  ALTER COLUMN created_at SET DEFAULT TIMEZONE('utc', CURRENT_TIMESTAMP),
+  ALTER COLUMN created_at SET NOT NULL,
+  ALTER COLUMN updated_at SET DEFAULT TIMEZONE('utc', CURRENT_TIMESTAMP),
+  ALTER COLUMN updated_at SET NOT NULL;
+
+UPDATE telegram_configs SET created_at = TIMEZONE('utc', CURRENT_TIMESTAMP) WHERE created_at IS NULL;
+UPDATE telegram_configs SET updated_at = TIMEZONE('utc', CURRENT_TIMESTAMP) WHERE updated_at IS NULL;
+ALTER TABLE telegram_configs
+  ALTER COLUMN created_at SET DEFAULT TIMEZONE('utc', CURRENT_TIMESTAMP),
+  ALTER COLUMN created_at SET NOT NULL,
+  ALTER COLUMN updated_at SET DEFAULT TIMEZONE('utc', CURRENT_TIMESTAMP),
+  ALTER COLUMN updated_at SET NOT NULL;
+
+UPDATE telegram_users SET created_at = TIMEZONE('utc', CURRENT_TIMESTAMP) WHERE created_at IS NULL;
+UPDATE telegram_users SET updated_at = TIMEZONE('utc', CURRENT_TIMESTAMP) WHERE updated_at IS NULL;
+ALTER TABLE telegram_users
+  ALTER COLUMN created_at SET DEFAULT TIMEZONE('utc', CURRENT_TIMESTAMP),
+  ALTER COLUMN created_at SET NOT NULL,
+  ALTER COLUMN updated_at SET DEFAULT TIMEZONE('utc', CURRENT_TIMESTAMP),
+  ALTER COLUMN updated_at SET NOT NULL;
+
+UPDATE faqs SET created_at = TIMEZONE('utc', CURRENT_TIMESTAMP) WHERE created_at IS NULL;
+UPDATE faqs SET updated_at = TIMEZONE('utc', CURRENT_TIMESTAMP) WHERE updated_at IS NULL;
+ALTER TABLE faqs
+  ALTER COLUMN created_at SET DEFAULT TIMEZONE('utc', CURRENT_TIMESTAMP),
+  ALTER COLUMN created_at SET NOT NULL,
+  ALTER COLUMN updated_at SET DEFAULT TIMEZONE('utc', CURRENT_TIMESTAMP),
+  ALTER COLUMN updated_at SET NOT NULL;
+
+UPDATE support_requests SET created_at = TIMEZONE('utc', CURRENT_TIMESTAMP) WHERE created_at IS NULL;
+UPDATE support_requests SET updated_at = TIMEZONE('utc', CURRENT_TIMESTAMP) WHERE updated_at IS NULL;
+ALTER TABLE support_requests
+  ALTER COLUMN created_at SET DEFAULT TIMEZONE('utc', CURRENT_TIMESTAMP),
+  ALTER COLUMN created_at SET NOT NULL,
+  ALTER COLUMN updated_at SET DEFAULT TIMEZONE('utc', CURRENT_TIMESTAMP),
+  ALTER COLUMN updated_at SET NOT NULL;
+
+UPDATE zimmer_tenants SET created_at = TIMEZONE('utc', CURRENT_TIMESTAMP) WHERE created_at IS NULL;
+UPDATE zimmer_tenants SET updated_at = TIMEZONE('utc', CURRENT_TIMESTAMP) WHERE updated_at IS NULL;
+ALTER TABLE zimmer_tenants
+  ALTER COLUMN created_at SET DEFAULT TIMEZONE('utc', CURRENT_TIMESTAMP),
+  ALTER COLUMN created_at SET NOT NULL,
+  ALTER COLUMN updated_at SET DEFAULT TIMEZONE('utc', CURRENT_TIMESTAMP),
+  ALTER COLUMN updated_at SET NOT NULL;
@@ -0,0 +1,5 @@
+-- Telegram user/chat ids do not fit in a 32-bit integer
+-- PostgreSQL; SQLite integers are already 64-bit
+
+ALTER TABLE users ALTER COLUMN chat_id TYPE BIGINT;
+ALTER TABLE telegram_users ALTER COLUMN telegram_user_id TYPE BIGINT;
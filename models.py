@@ -1,25 +1,146 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean, Float, Enum, Numeric, JSON, func
-from sqlalchemy.orm import relationship, mapped_column, Mapped
+from sqlalchemy import Column, Integer, BigInteger, String, Text, Date, DateTime, ForeignKey, Boolean, Numeric, JSON, func, Index, Identity, Sequence, CheckConstraint, event, select, text, DDL, Table, MetaData
+from sqlalchemy.types import TypeDecorator
+from sqlalchemy.orm import relationship, mapped_column, Mapped, Session
+from sqlalchemy.dialects.postgresql import JSONB, ARRAY
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
 from datetime import datetime
+from itertools import chain
 import enum
+import json
 
 # Import Base from database to avoid conflicts
 from database import Base
+from utils.normalization import attributes_hash
+
+# Money is exact fixed-point in the database but handed to Python as float,
+# which is what the services and response schemas work with
+Money = Numeric(12, 2, asdecimal=False)
 
-class OrderStatus(enum.Enum):
+class JSONDoc(TypeDecorator):
+    """JSON document: binary JSONB on PostgreSQL (indexable with GIN), plain JSON elsewhere.
+
+    Several of these columns used to hold JSON strings in TEXT; legacy rows
+    that are empty or malformed read back as None instead of raising.
+    """
+    impl = JSON
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "postgresql":
+            return dialect.type_descriptor(JSONB())
+        return dialect.type_descriptor(JSON())
+
+    def result_processor(self, dialect, coltype):
+        process = super().result_processor(dialect, coltype)
+        if process is None:
+            return None
+
+        def tolerant(value):
+            try:
+                return process(value)
+            except ValueError:
+                return None
+        return tolerant
+
+
+class StringList(TypeDecorator):
+    """List of short strings: a text[] array on PostgreSQL, a JSON array elsewhere.
+
+    Comma-separated strings are still accepted on write, and legacy
+    comma-separated rows on SQLite are read back as lists; malformed JSON
+    arrays are read as comma-separated text instead of raising.
+    """
+    impl = Text
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "postgresql":
+            return dialect.type_descriptor(ARRAY(String(32)))
+        return dialect.type_descriptor(Text())
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        if isinstance(value, str):
+            value = value.split(",")
+        items = [str(v).strip() for v in value if v is not None and str(v).strip()]
+        if dialect.name == "postgresql":
+            return items
+        return json.dumps(items, ensure_ascii=False)
+
+    def process_result_value(self, value, dialect):
+        if value is None or isinstance(value, list):
+            return value
+        if value.startswith("["):
+            try:
+                return json.loads(value)
+            except ValueError:
+                value = value.strip("[]")
+        return [s.strip() for s in value.split(",") if s.strip()]
+
+# Trigram GIN indexes back the ILIKE '%term%' searches on PostgreSQL
+event.listen(Base.metadata, "before_create",
+             DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"))
+
+
+def _trgm_index(name, column):
+    return Index(name, column, postgresql_using='gin',
+                 postgresql_ops={column: 'gin_trgm_ops'}).ddl_if(dialect='postgresql')
+
+
+class utcnow(FunctionElement):
+    """Current UTC time as a naive timestamp, evaluated by the database."""
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(utcnow, "postgresql")
+def _pg_utcnow(element, compiler, **kw):
+    return "TIMEZONE('utc', CURRENT_TIMESTAMP)"
+
+
+@compiles(utcnow)
+def _default_utcnow(element, compiler, **kw):
+    # SQLite: keep millisecond precision so same-second rows still order correctly, padded to
+    # SQLAlchemy's microsecond text format so values compare correctly with bound datetimes
+    return "(STRFTIME('%Y-%m-%d %H:%M:%f', 'now') || '000')"
+
+
+class CreatedAtMixin:
+    # The SQL default is rendered into the INSERT, so tables created before the
+    # server default existed still get a value; eager_defaults reads it back via RETURNING
+    created_at = Column(DateTime, default=utcnow(), server_default=utcnow(), nullable=False)
+
+    __mapper_args__ = {"eager_defaults": True}
+
+
+class TimestampMixin(CreatedAtMixin):
+    updated_at = Column(DateTime, default=utcnow(), server_default=utcnow(), onupdate=utcnow(), nullable=False)
+
+class _StoredStatus(str, enum.Enum):
+    @classmethod
+    def _missing_(cls, value):
+        # Rows written by the old SQLAlchemy Enum hold member names ('PENDING') until
+        # the status migration has run; resolve them to the member they name
+        if isinstance(value, str):
+            return cls._value2member_map_.get(value.lower())
+        return None
+
+class OrderStatus(_StoredStatus):
     DRAFT = "draft"
     PENDING = "pending"
     APPROVED = "approved"
     SOLD = "sold"
     CANCELLED = "cancelled"
 
-class PaymentStatus(enum.Enum):
+class PaymentStatus(_StoredStatus):
     PENDING = "pending"
     PAID = "paid"
     FAILED = "failed"
     REFUNDED = "refunded"
 
-class Customer(Base):
+class Customer(CreatedAtMixin, Base):
     __tablename__ = "customers"
     
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
@@ -30,55 +151,48 @@ class Customer(Base):
     postal_code: Mapped[str] = mapped_column(String(20), nullable=False, index=True)
     notes: Mapped[str] = mapped_column(Text, nullable=True)
     customer_code: Mapped[str] = mapped_column(String(50), nullable=True, index=True)  # Will be NOT NULL after backfill
-    created_at: Mapped[DateTime] = mapped_column(DateTime, server_default=func.now())
 
     orders: Mapped[list["Order"]] = relationship("Order", back_populates="customer")
 
-class User(Base):
+class User(CreatedAtMixin, Base):
     __tablename__ = "users"
     
-    id = Column(Integer, primary_key=True, index=True)
-    chat_id = Column(Integer, unique=True, index=True)
+    id = Column(Integer, primary_key=True)
+    chat_id = Column(BigInteger, unique=True, index=True)  # Telegram ids exceed 32 bits
     username = Column(String, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
     
-    messages = relationship("Message", back_populates="user")
     orders = relationship("Order", back_populates="user")
     fallback_questions = relationship("FallbackQuestion", back_populates="user")
 
-class Message(Base):
-    __tablename__ = "messages"
-    
-    id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"))
-    text = Column(String)
-    role = Column(String, default="user")  # "user" or "assistant"
-    created_at = Column(DateTime, default=datetime.utcnow)
-    
-    user = relationship("User", back_populates="messages")
-
-class ChatMessage(Base):
+class ChatMessage(CreatedAtMixin, Base):
+    # Single log for non-Telegram conversations; the legacy GPT assistant writes here too
     __tablename__ = "chat_messages"
     
-    id = Column(Integer, primary_key=True, index=True)
-    conversation_id = Column(String, nullable=False, index=True)
+    id = Column(Integer, primary_key=True)
+    channel = Column(String(16), nullable=False, default="web", server_default="web")  # "web" or "gpt"
+    conversation_id = Column(String, nullable=False)
     role = Column(String, nullable=False)  # "user", "assistant", "system"
     text = Column(Text, nullable=False)
     intent = Column(String, nullable=True)
-    slots_json = Column(Text, nullable=True)  # JSON string of slots
-    created_at = Column(DateTime, default=datetime.utcnow)
+    slots_json = mapped_column(JSONDoc, nullable=True, deferred=True)  # Extracted slots; never listed
 
-class Order(Base):
+# Conversation history is paged by time; the leading column also serves conversation_id lookups
+Index('ix_chat_messages_conversation_created', ChatMessage.conversation_id, ChatMessage.created_at.desc())
+
+# Feeds legacy ORD-YYYY-NNNNNN order numbers; PostgreSQL only (SQLite ignores sequences)
+order_number_seq = Sequence("order_number_seq", metadata=Base.metadata)
+
+class Order(TimestampMixin, Base):
     __tablename__ = "orders"
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, Identity(start=1), primary_key=True)
     order_number = Column(String, unique=True, index=True)  # e.g., "ORD-2024-001"
     order_code = Column(String(50), nullable=True, index=True)  # Stable business code, will be NOT NULL after backfill
     user_id = Column(Integer, ForeignKey("users.id"), nullable=True)  # Optional for guest orders
     
     # CRM Integration
     customer_id = Column(Integer, ForeignKey("customers.id"), nullable=True)
-    customer_snapshot = Column(JSON, nullable=True)  # Immutable copy at purchase time
+    customer_snapshot = mapped_column(JSONDoc, nullable=True, deferred=True, deferred_group="snapshot")  # Immutable copy at purchase time
     
     # Customer Information (legacy fields, kept for backward compatibility)
     customer_name = Column(String, nullable=False)
@@ -87,15 +201,16 @@ class Order(Base):
     customer_instagram = Column(String, nullable=True)
     
     # Order Details
-    total_amount = Column(Float, nullable=False)
-    shipping_cost = Column(Float, default=0.0)
-    discount_amount = Column(Float, default=0.0)
-    final_amount = Column(Float, nullable=False)
+    total_amount = Column(Money, nullable=False)
+    shipping_cost = Column(Money, default=0.0)
+    discount_amount = Column(Money, default=0.0)
+    final_amount = Column(Money, nullable=False)
     items_count = Column(Integer, default=0)  # Total quantity of items
     
     # Status and Payment
-    status = Column(Enum(OrderStatus), default=OrderStatus.PENDING)
-    payment_status = Column(Enum(PaymentStatus), default=PaymentStatus.PENDING)
+    # Plain strings (enum values) so row loads skip Enum coercion; CHECK constraints guard the domain
+    status = Column(String(16), default=OrderStatus.PENDING.value, nullable=False)
+    payment_status = Column(String(16), default=PaymentStatus.PENDING.value, nullable=False)
     payment_method = Column(String, nullable=True)  # "cash", "online", "bank_transfer"
     
     # Shipping Information
@@ -104,26 +219,45 @@ class Order(Base):
     estimated_delivery = Column(DateTime, nullable=True)
     
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     confirmed_at = Column(DateTime, nullable=True)
     shipped_at = Column(DateTime, nullable=True)
     delivered_at = Column(DateTime, nullable=True)
     
     # Notes
-    admin_notes = Column(Text, nullable=True)
-    customer_notes = Column(Text, nullable=True)
+    # Large, detail-only columns are deferred; detail loaders undefer the "snapshot" group
+    admin_notes = mapped_column(Text, nullable=True, deferred=True, deferred_group="snapshot")
+    customer_notes = mapped_column(Text, nullable=True, deferred=True, deferred_group="snapshot")
     
     # Relationships
     user = relationship("User", back_populates="orders")
     customer = relationship("Customer", back_populates="orders")
     items = relationship("OrderItem", back_populates="order", cascade="all, delete-orphan")
     receipts = relationship("Receipt", back_populates="order")
+    
+    # Composite indexes for status dashboards and per-customer order history
+    __table_args__ = (
+        Index('ix_orders_status_created_at', 'status', 'created_at'),
+        Index('ix_orders_customer_created_at', 'customer_id', 'created_at'),
+        Index('ix_orders_payment_status_created_at', 'payment_status', 'created_at'),
+        # Covers the analytics summary aggregate (count, revenue, distinct phones) over a date window
+        Index('ix_orders_created_at_totals', 'created_at', 'final_amount', 'customer_phone'),
+        # Order ids in a date window, for the analytics joins from orders to their items
+        Index('ix_orders_created_at_id', 'created_at', 'id'),
+        # Per-phone order count and spend for the users list and user details
+        Index('ix_orders_customer_phone', 'customer_phone', postgresql_include=['final_amount']),
+        # Containment (@>) lookups on snapshot keys; GIN only exists on PostgreSQL
+        Index('ix_orders_snapshot_gin', 'customer_snapshot', postgresql_using='gin',
+              postgresql_ops={'customer_snapshot': 'jsonb_path_ops'}).ddl_if(dialect='postgresql'),
+        # Denormalized totals must stay consistent (kept in sync by _sync_order_totals)
+        CheckConstraint('final_amount = total_amount + shipping_cost - discount_amount', name='ck_orders_final_amount'),
+        CheckConstraint("status IN ('draft', 'pending', 'approved', 'sold', 'cancelled')", name='ck_orders_status'),
+        CheckConstraint("payment_status IN ('pending', 'paid', 'failed', 'refunded')", name='ck_orders_payment_status'),
+    )
 
 class OrderItem(Base):
     __tablename__ = "order_items"
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, Identity(start=1), primary_key=True)
     order_id = Column(Integer, ForeignKey("orders.id"), nullable=False)
     product_id = Column(Integer, ForeignKey("products.id"), nullable=False)
     variant_id = Column(Integer, ForeignKey("product_variants.id"), nullable=True)  # Support for variants
@@ -131,13 +265,13 @@ class OrderItem(Base):
     # Product details at time of order (in case product changes later)
     product_name = Column(String, nullable=False)
     product_code = Column(String, nullable=False)  # Store product code snapshot
-    product_price = Column(Float, nullable=False)
+    product_price = Column(Money, nullable=False)
     product_image_url = Column(String, nullable=True)
     
     # Variant details (new system)
     sku_code = Column(String(50), nullable=True, index=True)  # SKU code for variant
-    variant_attributes_snapshot = Column(JSON, nullable=True)  # Snapshot of variant attributes
-    unit_price_snapshot = Column(Numeric(10, 2), nullable=True)  # Snapshot of unit price
+    variant_attributes_snapshot = mapped_column(JSONDoc, nullable=True, deferred=True, deferred_group="snapshot")  # Snapshot of variant attributes
+    unit_price_snapshot = Column(Money, nullable=True)  # Snapshot of unit price
     
     # Legacy variant details (backward compatibility)
     variant_size = Column(String, nullable=True)
@@ -146,18 +280,93 @@ class OrderItem(Base):
     # Order details
     quantity = Column(Integer, nullable=False, default=1)
     size = Column(String, nullable=True)  # Legacy field, keep for backward compatibility
-    unit_price = Column(Float, nullable=False)  # Unit price snapshot (base + variant delta)
-    total_price = Column(Float, nullable=False)
+    unit_price = Column(Money, nullable=False)  # Unit price snapshot (base + variant delta)
+    total_price = Column(Money, nullable=False)
     
     # Relationships
     order = relationship("Order", back_populates="items")
     product = relationship("Product")
     variant = relationship("ProductVariant")
 
+    # Items are always fetched by order (selectin loads, totals sync, analytics joins); on
+    # PostgreSQL the included columns let the analytics aggregate run as an index-only scan
+    __table_args__ = (
+        Index('ix_order_items_order_covering', 'order_id',
+              postgresql_include=['product_id', 'quantity', 'unit_price']),
+        # Per-product analytics (search, details) filter by product and count distinct orders
+        Index('ix_order_items_product_order', 'product_id', 'order_id',
+              postgresql_include=['quantity', 'unit_price']),
+    )
+
+
+class OrderItemDaily(Base):
+    """Read-only mapping of the mv_order_item_daily materialized view (PostgreSQL only).
+
+    One row per product and sale day; created and refreshed outside of
+    create_all (see migrations/add_order_item_daily_rollup.sql).
+    """
+    __table__ = Table(
+        "mv_order_item_daily",
+        MetaData(),  # kept out of Base.metadata so create_all never builds it as a table
+        Column("product_id", Integer, primary_key=True),
+        Column("category_id", Integer),
+        Column("sale_date", Date, primary_key=True),
+        Column("qty", BigInteger),
+        Column("revenue", Money),
+        Column("order_count", BigInteger),
+        Column("item_count", BigInteger),
+        Column("price_sum", Money),
+        Column("min_price", Money),
+        Column("max_price", Money),
+    )
+
+class AnalyticsRollupRefresh(Base):
+    """Start time (UTC) of the last successful refresh of each analytics rollup view.
+
+    PostgreSQL only, created with the view (see migrations/add_order_item_daily_rollup.sql).
+    """
+    __table__ = Table(
+        "analytics_rollup_refreshes",
+        MetaData(),  # created by the rollup migration, not by create_all
+        Column("view_name", String, primary_key=True),
+        Column("refreshed_at", DateTime, nullable=False),
+    )
+
+@event.listens_for(Session, "after_flush")
+def _sync_order_totals(session, flush_context):
+    """Recompute denormalized Order totals for orders whose items changed in this flush.
+    
+    Listing and summary endpoints read items_count/total_amount/final_amount
+    straight off the orders row instead of aggregating order_items.
+    """
+    order_ids = {
+        obj.order_id
+        for obj in chain(session.new, session.dirty, session.deleted)
+        if isinstance(obj, OrderItem) and obj.order_id is not None
+    }
+    if not order_ids:
+        return
+    
+    items = OrderItem.__table__
+    orders = Order.__table__
+    
+    def item_sum(column):
+        return select(func.coalesce(func.sum(column), 0)).where(items.c.order_id == orders.c.id).scalar_subquery()
+    
+    session.connection().execute(
+        orders.update()
+        .where(orders.c.id.in_(order_ids))
+        .values(
+            items_count=item_sum(items.c.quantity),
+            total_amount=item_sum(items.c.total_price),
+            final_amount=item_sum(items.c.total_price) + func.coalesce(orders.c.shipping_cost, 0) - func.coalesce(orders.c.discount_amount, 0),
+        )
+    )
+
 class Receipt(Base):
     __tablename__ = "receipts"
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     order_id = Column(Integer, ForeignKey("orders.id"))
     image_url = Column(String)
     verified = Column(Boolean, default=False)
@@ -165,54 +374,50 @@ class Receipt(Base):
     
     order = relationship("Order", back_populates="receipts")
 
-class FallbackQuestion(Base):
+class FallbackQuestion(CreatedAtMixin, Base):
     __tablename__ = "fallback_questions"
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey("users.id"))
     question = Column(String)
-    created_at = Column(DateTime, default=datetime.utcnow)
     
     user = relationship("User", back_populates="fallback_questions")
 
-class Category(Base):
+class Category(CreatedAtMixin, Base):
     __tablename__ = "categories"
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     name = Column(String, nullable=False, unique=True)
     prefix = Column(String, nullable=False, unique=True)  # A, B, C, etc.
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     
     # Relationship to products
-    products = relationship("Product", back_populates="category")
+    products = relationship("Product", back_populates="category", passive_deletes=True)  # the FK cascades
     
     def __repr__(self):
         return f"<Category(id={self.id}, name='{self.name}', prefix='{self.prefix}')>"
 
 
-class Product(Base):
+class Product(TimestampMixin, Base):
     __tablename__ = "products"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     name = Column(String, nullable=False, index=True)
     description = Column(Text, nullable=True)
-    price = Column(Float, nullable=False)
+    price = Column(Money, nullable=False)
     stock = Column(Integer, default=0)
     low_stock_threshold = Column(Integer, nullable=False, default=5)
     code = Column(String, nullable=False, unique=True, index=True)
-    category_id = Column(Integer, ForeignKey("categories.id"), nullable=False, index=True)
+    category_id = Column(Integer, ForeignKey("categories.id", ondelete="CASCADE"), nullable=False, index=True)
     image_url = Column(String, nullable=True)
     thumbnail_url = Column(String, nullable=True)
-    sizes = Column(String, nullable=True)  # Comma-separated sizes (legacy)
-    available_sizes_json = Column(Text, nullable=True)  # JSON array of available sizes
-    available_colors_json = Column(Text, nullable=True)  # JSON array of available colors
+    sizes = Column(StringList, nullable=True)  # List of sizes (legacy)
+    available_sizes_json = Column(JSONDoc, nullable=True)  # List of available sizes
+    available_colors_json = Column(JSONDoc, nullable=True)  # List of available colors
     tags = Column(String, nullable=True)  # Comma-separated keywords
-    labels_json = Column(Text, nullable=True)  # JSON array of labels
-    attributes_json = Column(Text, nullable=True)  # JSON dict of attributes (key -> list[str])
-    attribute_schema = Column(JSON, nullable=True)  # Schema defining required attributes and allowed values
+    labels_json = Column(JSONDoc, nullable=True)  # List of labels
+    attributes_json = Column(JSONDoc, nullable=True)  # Dict of attributes (key -> list[str])
+    attribute_schema = Column(JSONDoc, nullable=True)  # Schema defining required attributes and allowed values
     is_active = Column(Boolean, default=True)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
     
     # Relationship to category
     category = relationship("Category", back_populates="products")
@@ -220,45 +425,65 @@ class Product(Base):
     # Relationship to variants
     variants = relationship("ProductVariant", back_populates="product", cascade="all, delete-orphan")
 
-class ProductVariant(Base):
+    # Storefront listings only ever scan active products; a partial index keeps it small
+    __table_args__ = (
+        Index('ix_products_active_category', 'category_id', 'created_at',
+              postgresql_where=text('is_active = true'), sqlite_where=text('is_active = 1')),
+        # Keyset pagination of the product list seeks on (created_at, id)
+        Index('ix_products_created_at_id', 'created_at', 'id'),
+        _trgm_index('ix_products_name_trgm', 'name'),
+        _trgm_index('ix_products_code_trgm', 'code'),
+        _trgm_index('ix_products_description_trgm', 'description'),
+        _trgm_index('ix_products_tags_trgm', 'tags'),
+        Index('ix_products_sizes_gin', 'sizes', postgresql_using='gin').ddl_if(dialect='postgresql'),
+    )
+
+class ProductVariant(TimestampMixin, Base):
     __tablename__ = "product_variants"
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     sku_code = Column(String(50), unique=True, nullable=False, index=True)  # Primary SKU identifier
-    product_id = Column(Integer, ForeignKey("products.id"), nullable=False, index=True)
-    attributes = Column(JSON, nullable=False, default={})  # Generic attributes (color, size, capacity, etc.)
-    price_override = Column(Numeric(10, 2), nullable=True)  # Override product price if needed
+    product_id = Column(Integer, ForeignKey("products.id", ondelete="CASCADE"), nullable=False, index=True)
+    attributes = Column(JSONDoc, nullable=False, default={})  # Generic attributes (color, size, capacity, etc.)
+    price_override = Column(Money, nullable=True)  # Override product price if needed
     stock_qty = Column(Integer, default=0, nullable=False)  # Current stock quantity
-    is_active = Column(Boolean, default=True, nullable=False, index=True)  # Whether variant is available
-    attributes_hash = Column(String(64), nullable=True)  # Hash of attributes for uniqueness
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    is_active = Column(Boolean, default=True, nullable=False)  # Whether variant is available
+    attributes_hash = Column(String(64), nullable=True)  # Hash of attributes, maintained by _set_attributes_hash
     
     # Legacy fields for backward compatibility
     size = Column(String, nullable=True)  # e.g., "S", "M", "L", "XL", "43", "44"
     color = Column(String, nullable=True)  # e.g., "قرمز", "آبی", "مشکی"
     sku = Column(String, nullable=True)  # Stock Keeping Unit (optional)
     stock = Column(Integer, default=0, nullable=False)
-    price_delta = Column(Float, default=0.0, nullable=False)  # Optional price adjustment
+    price_delta = Column(Money, default=0.0, nullable=False)  # Optional price adjustment
     
     # Relationship to product
     product = relationship("Product", back_populates="variants")
     
+    # One variant per attribute combination (empty attributes included); legacy size/color variants have no hash and are exempt
+    __table_args__ = (
+        Index('uq_variant_product_attrs', 'product_id', 'attributes_hash', unique=True),
+        Index('ix_variants_active_product', 'product_id',
+              postgresql_where=text('is_active = true'), sqlite_where=text('is_active = 1')),
+        Index('ix_variants_attrs_gin', 'attributes', postgresql_using='gin',
+              postgresql_ops={'attributes': 'jsonb_path_ops'}).ddl_if(dialect='postgresql'),
+    )
+    
     def __repr__(self):
         return f"<ProductVariant(id={self.id}, product_id={self.product_id}, size={self.size}, color={self.color}, stock={self.stock})>"
 
-class BotConfig(Base):
-    __tablename__ = "bot_configs"
-    
-    id = Column(Integer, primary_key=True, index=True)
-    bot_token = Column(String, unique=True, nullable=False)
-    bot_username = Column(String, nullable=True)
-    bot_name = Column(String, nullable=True)
-    webhook_url = Column(String, nullable=True)
-    is_active = Column(Boolean, default=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+@event.listens_for(ProductVariant, "before_insert")
+@event.listens_for(ProductVariant, "before_update")
+def _set_attributes_hash(mapper, connection, target):
+    """Keep attributes_hash in step with attributes on every write path.
 
+    Empty attributes hash to the canonical sha1('{}') that find_variants looks up;
+    only legacy size/color variants (no attributes) are left without a hash.
+    """
+    if not target.attributes and (target.size or target.color):
+        target.attributes_hash = None
+    else:
+        target.attributes_hash = attributes_hash(target.attributes or {})
 
 # ===============================
 # TELEGRAM INTEGRATION MODELS
@@ -274,26 +499,32 @@ class ReportPeriod(enum.Enum):
     MONTHLY = "monthly"
 
 
-class TelegramConfig(Base):
+class TelegramConfig(TimestampMixin, Base):
     __tablename__ = "telegram_configs"
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     bot_token = Column(String, nullable=False, unique=True)
     webhook_url = Column(String, nullable=False)
     webhook_secret = Column(String, nullable=False)  # Secret for webhook validation
+    bot_username = Column(String, nullable=True)  # From getMe, filled by the webhook manager
+    bot_name = Column(String, nullable=True)
     is_active = Column(Boolean, default=True)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    
+    # At most one active bot; also serves the "active config" lookup
+    __table_args__ = (
+        Index('ix_telegram_configs_active', 'is_active', unique=True,
+              postgresql_where=text('is_active = true'), sqlite_where=text('is_active = 1')),
+    )
     
     def __repr__(self):
         return f"<TelegramConfig(id={self.id}, bot_token='{self.bot_token[:10]}...', is_active={self.is_active})>"
 
 
-class TelegramUser(Base):
+class TelegramUser(TimestampMixin, Base):
     __tablename__ = "telegram_users"
     
-    id = Column(Integer, primary_key=True, index=True)
-    telegram_user_id = Column(Integer, unique=True, nullable=False, index=True)
+    id = Column(Integer, primary_key=True)
+    telegram_user_id = Column(BigInteger, unique=True, nullable=False, index=True)  # Telegram ids exceed 32 bits
     username = Column(String, nullable=True)
     first_name = Column(String, nullable=True)
     last_name = Column(String, nullable=True)
@@ -304,8 +535,6 @@ class TelegramUser(Base):
     phone = Column(String, nullable=True)
     note = Column(Text, nullable=True)
     is_blocked = Column(Boolean, default=False, nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
     
     # Relationships
     messages = relationship("TelegramMessage", back_populates="user", cascade="all, delete-orphan")
@@ -314,15 +543,19 @@ class TelegramUser(Base):
         return f"<TelegramUser(id={self.id}, telegram_id={self.telegram_user_id}, username='{self.username}', visits={self.visits_count})>"
 
 
-class TelegramMessage(Base):
+class TelegramMessage(CreatedAtMixin, Base):
+    # Append-only log. On PostgreSQL the table is range-partitioned by month on created_at
+    # (see migrations/partition_telegram_messages.sql, also needed on fresh installs since
+    # create_all builds the plain table), with primary key (id, created_at). That PK doesn't
+    # enforce id uniqueness, only the id sequence keeps ids distinct; the mapping keys on id
+    # alone so it works on SQLite too.
     __tablename__ = "telegram_messages"
     
-    id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("telegram_users.id"), nullable=False, index=True)
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("telegram_users.id"), nullable=False)
     direction = Column(String, nullable=False)  # "in" or "out"
     text = Column(Text, nullable=False)
-    payload_json = Column(Text, nullable=True)  # Raw Telegram update or reply metadata
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    payload_json = mapped_column(JSONDoc, nullable=True, deferred=True)  # Raw Telegram update or reply metadata
     
     # Relationships
     user = relationship("TelegramUser", back_populates="messages")
@@ -330,17 +563,25 @@ class TelegramMessage(Base):
     def __repr__(self):
         return f"<TelegramMessage(id={self.id}, user_id={self.user_id}, direction='{self.direction}', text='{self.text[:50]}...')>"
 
+# "Latest N messages for a user" is a single index range scan
+Index('ix_telegram_messages_user_created', TelegramMessage.user_id, TelegramMessage.created_at.desc())
 
-class FAQ(Base):
+
+class FAQ(TimestampMixin, Base):
     __tablename__ = "faqs"
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     question = Column(Text, nullable=False)
     answer = Column(Text, nullable=False)
     tags = Column(String, nullable=True)  # Comma-separated tags
     is_active = Column(Boolean, default=True, nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    
+    # Unique question lets seeders use INSERT ... ON CONFLICT DO NOTHING
+    __table_args__ = (
+        Index('ux_faqs_question', 'question', unique=True),
+        _trgm_index('ix_faqs_question_trgm', 'question'),
+        _trgm_index('ix_faqs_tags_trgm', 'tags'),
+    )
     
     def __repr__(self):
         return f"<FAQ(id={self.id}, question='{self.question[:50]}...', is_active={self.is_active})>"
@@ -349,40 +590,47 @@ class FAQ(Base):
 class SalesReport(Base):
     __tablename__ = "sales_reports"
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     period = Column(String, nullable=False)  # "weekly" or "monthly"
-    start_date = Column(String, nullable=False)  # Store as string to avoid SQLite date issues
-    end_date = Column(String, nullable=False)
-    totals_json = Column(Text, nullable=False)  # JSON string with report data
+    start_date = Column(Date, nullable=False)  # ISO-8601 text on SQLite, so existing rows still compare correctly
+    end_date = Column(Date, nullable=False)
+    totals_json = mapped_column(JSONDoc, nullable=False, deferred=True)  # Report data; listings skip it
     generated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     
+    # generate_report looks up an existing report by exact period and range
+    __table_args__ = (
+        Index('ix_sales_reports_period_range', 'period', 'start_date', 'end_date'),
+    )
+    
     def __repr__(self):
         return f"<SalesReport(id={self.id}, period='{self.period}', {self.start_date} to {self.end_date})>"
 
-class SupportRequestStatus(enum.Enum):
+class SupportRequestStatus(_StoredStatus):
     PENDING = "pending"
     IN_PROGRESS = "in_progress"
     RESOLVED = "resolved"
     CLOSED = "closed"
 
-class SupportRequest(Base):
+class SupportRequest(TimestampMixin, Base):
     __tablename__ = "support_requests"
     
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     customer_name: Mapped[str] = mapped_column(String(200), nullable=False)
     customer_phone: Mapped[str] = mapped_column(String(32), nullable=False)
     message: Mapped[str] = mapped_column(Text, nullable=False)
-    status: Mapped[SupportRequestStatus] = mapped_column(Enum(SupportRequestStatus), default=SupportRequestStatus.PENDING)
+    status: Mapped[str] = mapped_column(String(16), default=SupportRequestStatus.PENDING.value, nullable=False)
     telegram_user_id: Mapped[str] = mapped_column(String(50), nullable=True)  # For future Telegram integration
     admin_notes: Mapped[str] = mapped_column(Text, nullable=True)
-    created_at: Mapped[DateTime] = mapped_column(DateTime, server_default=func.now())
-    updated_at: Mapped[DateTime] = mapped_column(DateTime, server_default=func.now(), onupdate=func.now())
+    
+    __table_args__ = (
+        CheckConstraint("status IN ('pending', 'in_progress', 'resolved', 'closed')", name='ck_support_requests_status'),
+    )
     
     def __repr__(self):
         return f"<SupportRequest(id={self.id}, customer='{self.customer_name}', status='{self.status}')>"
 
 
-class ZimmerTenant(Base):
+class ZimmerTenant(TimestampMixin, Base):
     __tablename__ = "zimmer_tenants"
     
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
@@ -396,8 +644,6 @@ class ZimmerTenant(Base):
     kb_last_updated: Mapped[DateTime] = mapped_column(DateTime, nullable=True)
     kb_total_documents: Mapped[int] = mapped_column(Integer, default=0)
     kb_healthy: Mapped[bool] = mapped_column(Boolean, default=False)
-    created_at: Mapped[DateTime] = mapped_column(DateTime, server_default=func.now())
-    updated_at: Mapped[DateTime] = mapped_column(DateTime, server_default=func.now(), onupdate=func.now())
     
     def __repr__(self):
         return f"<ZimmerTenant(user_automation_id={self.user_automation_id}, status='{self.integration_status}')>"
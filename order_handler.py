@@ -1,29 +1,33 @@
 import logging
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, raiseload, selectinload, undefer_group
+from sqlalchemy import update, case, select, func
 from typing import List, Optional
 from datetime import datetime
-from models import Order, OrderItem, Product, OrderStatus, PaymentStatus
-from database import get_db
+from models import Order, OrderItem, Product, OrderStatus, PaymentStatus, order_number_seq
+from database import get_db, SessionLocal
 from schemas.order import OrderOut, OrderSummary, OrderItemOut, OrderItemCreate
 from schemas.legacy import OrderCreate, OrderUpdate
+from utils.ttl_cache import cache
+from backend.config import ORDER_STATS_CACHE_TTL
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/orders", tags=["orders"])
 
 
-def generate_order_number() -> str:
-    """Generate a unique order number in format ORD-YYYY-NNNN"""
-    from datetime import datetime
+def assign_order_number(db: Session, order: Order) -> None:
+    """Give a newly added order a unique number in format ORD-YYYY-NNNNNN"""
     year = datetime.now().year
-    # In a real app, you'd get the next number from database
-    # For now, we'll use timestamp-based approach
-    import time
-    timestamp = int(time.time() * 1000) % 10000
-    return f"ORD-{year}-{timestamp:04d}"
+    if db.get_bind().dialect.name == "postgresql":
+        # nextval() is atomic, so concurrent orders never share a number
+        next_number = db.execute(select(order_number_seq.next_value())).scalar()
+    else:
+        # SQLite has no sequences; flush the insert and number the order after the id it was
+        # assigned, which no other order can share
+        db.flush()
+        next_number = order.id
+    order.order_number = f"ORD-{year}-{next_number:06d}"
 
 
 def calculate_order_totals(items: List[OrderItemCreate], db: Session) -> tuple[float, List[OrderItem]]:
@@ -31,9 +35,23 @@ def calculate_order_totals(items: List[OrderItemCreate], db: Session) -> tuple[f
     total_amount = 0.0
     order_items = []
     
+    # Lock every product row in the cart with one SELECT ... FOR UPDATE, fetching only the
+    # columns needed here; the locks hold until create_order commits its stock UPDATE
+    product_ids = {item_data.product_id for item_data in items}
+    products = {
+        row.id: row
+        for row in db.query(
+            Product.id, Product.name, Product.code, Product.price, Product.image_url, Product.stock
+        ).filter(Product.id.in_(product_ids)).with_for_update().all()
+    }
+    
+    # Stock is checked against the total requested per product, not per cart line
+    requested = {}
+    for item_data in items:
+        requested[item_data.product_id] = requested.get(item_data.product_id, 0) + item_data.quantity
+    
     for item_data in items:
-        # Get product details
-        product = db.query(Product).filter(Product.id == item_data.product_id).first()
+        product = products.get(item_data.product_id)
         if not product:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -41,10 +59,10 @@ def calculate_order_totals(items: List[OrderItemCreate], db: Session) -> tuple[f
             )
         
         # Check stock availability
-        if product.stock is not None and product.stock < item_data.quantity:
+        if product.stock is not None and product.stock < requested[product.id]:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Insufficient stock for product {product.name}. Available: {product.stock}, Requested: {item_data.quantity}"
+                detail=f"Insufficient stock for product {product.name}. Available: {product.stock}, Requested: {requested[product.id]}"
             )
         
         # Calculate item total
@@ -56,6 +74,7 @@ def calculate_order_totals(items: List[OrderItemCreate], db: Session) -> tuple[f
         order_item = OrderItem(
             product_id=product.id,
             product_name=product.name,
+            product_code=product.code,
             product_price=product.price,
             product_image_url=product.image_url,
             quantity=item_data.quantity,
@@ -68,6 +87,18 @@ def calculate_order_totals(items: List[OrderItemCreate], db: Session) -> tuple[f
     return total_amount, order_items
 
 
+def apply_stock_deltas(db: Session, deltas: dict) -> None:
+    """Add signed quantity deltas ({product_id: delta}) to product stock in one UPDATE."""
+    if not deltas:
+        return
+    db.execute(
+        update(Product)
+        .where(Product.id.in_(deltas))
+        .values(stock=Product.stock + case(deltas, value=Product.id))
+        .execution_options(synchronize_session=False)
+    )
+
+
 @router.get("/", response_model=List[OrderSummary])
 def get_orders(
     status_filter: Optional[OrderStatus] = None,
@@ -77,7 +108,8 @@ def get_orders(
     db: Session = Depends(get_db)
 ):
     """Get all orders with optional filtering"""
-    query = db.query(Order)
+    # Summaries read only order columns; raiseload makes any relationship lazy load fail loudly
+    query = db.query(Order).options(raiseload("*"))
     
     if status_filter:
         query = query.filter(Order.status == status_filter)
@@ -87,30 +119,29 @@ def get_orders(
     
     orders = query.order_by(Order.created_at.desc()).offset(offset).limit(limit).all()
     
-    # Convert to summary format
-    order_summaries = []
-    for order in orders:
-        items_count = len(order.items)
-        summary = OrderSummary(
+    # Rows come straight from the database, so skip validation with model_construct;
+    # items_count is kept in sync on the order row, so items are never loaded
+    return [
+        OrderSummary.model_construct(
             id=order.id,
             order_number=order.order_number,
             customer_name=order.customer_name,
-            customer_phone=order.customer_phone,
-            final_amount=order.final_amount,
-            status=order.status,
-            payment_status=order.payment_status,
+            total_amount=order.total_amount,
+            status=OrderStatus(order.status),
             created_at=order.created_at,
-            items_count=items_count
+            items_count=order.items_count or 0
         )
-        order_summaries.append(summary)
-    
-    return order_summaries
+        for order in orders
+    ]
 
 
 @router.get("/{order_id}", response_model=OrderOut)
 def get_order(order_id: int, db: Session = Depends(get_db)):
     """Get a specific order by ID"""
-    order = db.query(Order).filter(Order.id == order_id).first()
+    # OrderOut serializes the items and the deferred notes/snapshot columns; load them up front
+    order = db.query(Order).options(
+        selectinload(Order.items).undefer_group("snapshot"), undefer_group("snapshot")
+    ).filter(Order.id == order_id).first()
     if not order:
         raise HTTPException(status_code=404, detail="Order not found")
     
@@ -120,7 +151,7 @@ def get_order(order_id: int, db: Session = Depends(get_db)):
 @router.post("/", response_model=OrderOut, status_code=status.HTTP_201_CREATED)
 def create_order(order_data: OrderCreate, db: Session = Depends(get_db)):
     """Create a new order"""
-    logger.info(f"📥 New order received from: {order_data.customer_name}")
+    logger.info("📥 New order received from: %s", order_data.customer_name)
     
     try:
         # Calculate totals and create order items
@@ -131,7 +162,6 @@ def create_order(order_data: OrderCreate, db: Session = Depends(get_db)):
         
         # Create order
         order = Order(
-            order_number=generate_order_number(),
             customer_name=order_data.customer_name,
             customer_phone=order_data.customer_phone,
             customer_address=order_data.customer_address,
@@ -150,29 +180,28 @@ def create_order(order_data: OrderCreate, db: Session = Depends(get_db)):
         # Add order items
         order.items = order_items
         
+        # Decrement stock for every product in one statement, in the same transaction as the order
+        deltas = {}
+        for item in order_items:
+            deltas[item.product_id] = deltas.get(item.product_id, 0) - item.quantity
+        
         # Save to database
         db.add(order)
+        assign_order_number(db, order)
+        apply_stock_deltas(db, deltas)
         db.commit()
         db.refresh(order)
+        cache.invalidate("orders:", "products:")
         
-        logger.info(f"✅ Order created with ID: {order.id}, Order Number: {order.order_number}")
-        
-        # Update product stock
-        for item in order_items:
-            product = db.query(Product).filter(Product.id == item.product_id).first()
-            if product and product.stock is not None:
-                old_stock = product.stock
-                product.stock = old_stock - item.quantity
-                logger.info(f"📦 Updated stock for product {product.name}: {old_stock} -> {product.stock}")
-        
-        db.commit()
+        logger.info("✅ Order created with ID: %s, Order Number: %s", order.id, order.order_number)
+        logger.info("📦 Updated stock for %s products", len(deltas))
         
         return order
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"❌ Order creation failed: {str(e)}")
+        logger.error("❌ Order creation failed: %s", e)
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
             detail=f"خطا در ایجاد سفارش: {str(e)}"
@@ -182,7 +211,7 @@ def create_order(order_data: OrderCreate, db: Session = Depends(get_db)):
 @router.patch("/{order_id}", response_model=OrderOut)
 def update_order(order_id: int, order_update: OrderUpdate, db: Session = Depends(get_db)):
     """Update order status and details"""
-    logger.info(f"📝 Updating order with ID: {order_id}")
+    logger.info("📝 Updating order with ID: %s", order_id)
     
     order = db.query(Order).filter(Order.id == order_id).first()
     if not order:
@@ -217,26 +246,29 @@ def update_order(order_id: int, order_update: OrderUpdate, db: Session = Depends
                     raise HTTPException(status_code=400, detail=f"Invalid payment_status: {value}")
         
         setattr(order, field, value)
-        logger.info(f"✅ Updated {field}: {value}")
     
     # Update the updated_at timestamp
     order.updated_at = datetime.utcnow()
     
     try:
+        # Every changed value is already on the instance; keep it loaded across the
+        # commit instead of expiring it and re-selecting the row for the response
+        db.expire_on_commit = False
         db.commit()
-        db.refresh(order)
-        logger.info(f"✅ Order {order_id} updated successfully")
+        cache.invalidate("orders:")
+        logger.info("✅ Order %s updated: %s", order_id, list(update_data))
         return order
     except Exception as e:
         db.rollback()
-        logger.error(f"❌ Error updating order {order_id}: {str(e)}")
+        logger.error("❌ Error updating order %s: %s", order_id, e)
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
 
 
 @router.delete("/{order_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_order(order_id: int, db: Session = Depends(get_db)):
     """Delete an order (soft delete by setting status to cancelled)"""
-    order = db.query(Order).filter(Order.id == order_id).first()
+    # Items are needed for the stock restore; load them with the order
+    order = db.query(Order).options(selectinload(Order.items)).filter(Order.id == order_id).first()
     if not order:
         raise HTTPException(status_code=404, detail="Order not found")
     
@@ -244,26 +276,27 @@ def delete_order(order_id: int, db: Session = Depends(get_db)):
     order.status = OrderStatus.CANCELLED
     order.updated_at = datetime.utcnow()
     
-    # Restore product stock
+    # Restore product stock in one statement
+    deltas = {}
     for item in order.items:
-        product = db.query(Product).filter(Product.id == item.product_id).first()
-        if product and product.stock is not None:
-            product.stock += item.quantity
-            logger.info(f"📦 Restored stock for product {product.name}: {product.stock - item.quantity} -> {product.stock}")
+        deltas[item.product_id] = deltas.get(item.product_id, 0) + item.quantity
+    apply_stock_deltas(db, deltas)
     
     db.commit()
-    logger.info(f"✅ Order {order_id} cancelled successfully")
+    cache.invalidate("orders:", "products:")
+    logger.info("📦 Restored stock for %s products", len(deltas))
+    logger.info("✅ Order %s cancelled successfully", order_id)
     return None
 
 
 @router.get("/{order_id}/items", response_model=List[OrderItemOut])
 def get_order_items(order_id: int, db: Session = Depends(get_db)):
     """Get items for a specific order"""
-    order = db.query(Order).filter(Order.id == order_id).first()
-    if not order:
+    # Only the items are returned; check the parent exists without loading it
+    if not db.query(select(Order.id).where(Order.id == order_id).exists()).scalar():
         raise HTTPException(status_code=404, detail="Order not found")
     
-    return order.items
+    return db.query(OrderItem).filter(OrderItem.order_id == order_id).all()
 
 
 # Simple order creation for chat system
@@ -282,8 +315,6 @@ def create_simple_order(product_id: int, size: str, color: str, qty: int = 1, me
         dict: Order information
     """
     try:
-        from database import SessionLocal
-        
         db = SessionLocal()
         try:
             # Get product details
@@ -293,7 +324,6 @@ def create_simple_order(product_id: int, size: str, color: str, qty: int = 1, me
             
             # Create a simple order (using existing Order model)
             order = Order(
-                order_number=generate_order_number(),
                 customer_name="Chat User",  # Default for chat orders
                 customer_phone="Chat",      # Default for chat orders
                 total_amount=product.price * qty,
@@ -305,15 +335,17 @@ def create_simple_order(product_id: int, size: str, color: str, qty: int = 1, me
                 admin_notes=f"Chat order - Size: {size}, Color: {color}, Meta: {meta}"
             )
             
+            # Flush for order.id/created_at; the item goes into the same transaction
             db.add(order)
-            db.commit()
-            db.refresh(order)
+            assign_order_number(db, order)
+            db.flush()
             
             # Create order item
             order_item = OrderItem(
                 order_id=order.id,
                 product_id=product_id,
                 product_name=product.name,
+                product_code=product.code,
                 product_price=product.price,
                 product_image_url=product.image_url,
                 quantity=qty,
@@ -323,8 +355,8 @@ def create_simple_order(product_id: int, size: str, color: str, qty: int = 1, me
             )
             
             db.add(order_item)
-            db.commit()
             
+            # Built before the commit so the expired order isn't re-selected
             order_info = {
                 "id": order.id,
                 "order_number": order.order_number,
@@ -332,19 +364,25 @@ def create_simple_order(product_id: int, size: str, color: str, qty: int = 1, me
                 "size": size,
                 "color": color,
                 "quantity": qty,
-                "status": order.status.value,
+                "status": order.status,
                 "created_at": order.created_at.isoformat(),
                 "meta": meta or {}
             }
             
-            logger.info(f"✅ Simple order created: id={order.id}, order_number={order.order_number}")
+            db.commit()
+            cache.invalidate("orders:")
+            
+            logger.info("✅ Simple order created: id=%s, order_number=%s", order_info['id'], order_info['order_number'])
             return order_info
             
+        except Exception:
+            db.rollback()
+            raise
         finally:
             db.close()
         
     except Exception as e:
-        logger.error(f"❌ Simple order creation failed: {str(e)}")
+        logger.error("❌ Simple order creation failed: %s", e)
         raise Exception(f"خطا در ایجاد سفارش: {str(e)}")
 
 
@@ -352,22 +390,26 @@ def create_simple_order(product_id: int, size: str, color: str, qty: int = 1, me
 @router.get("/stats/summary")
 def get_order_stats(db: Session = Depends(get_db)):
     """Get order statistics"""
-    total_orders = db.query(Order).count()
-    pending_orders = db.query(Order).filter(Order.status == OrderStatus.PENDING).count()
-    confirmed_orders = db.query(Order).filter(Order.status == OrderStatus.CONFIRMED).count()
-    shipped_orders = db.query(Order).filter(Order.status == OrderStatus.SHIPPED).count()
-    delivered_orders = db.query(Order).filter(Order.status == OrderStatus.DELIVERED).count()
+    return cache.get_or_set("orders:stats:v1", ORDER_STATS_CACHE_TTL, lambda: _compute_order_stats(db))
+
+
+def _compute_order_stats(db: Session) -> dict:
+    # One pass over orders grouped by status instead of a COUNT per status
+    rows = db.query(
+        Order.status,
+        func.count(Order.id),
+        func.sum(case((Order.status == OrderStatus.SOLD.value, Order.final_amount), else_=0))
+    ).group_by(Order.status).all()
     
-    # Calculate total revenue
-    total_revenue = db.query(Order).filter(Order.status == OrderStatus.DELIVERED).with_entities(
-        db.func.sum(Order.final_amount)
-    ).scalar() or 0.0
+    counts = {status_value: count for status_value, count, _ in rows}
+    total_revenue = sum(revenue or 0.0 for _, _, revenue in rows)
     
+    # Legacy response keys mapped onto the current lifecycle (draft/pending/approved/sold/cancelled)
     return {
-        "total_orders": total_orders,
-        "pending_orders": pending_orders,
-        "confirmed_orders": confirmed_orders,
-        "shipped_orders": shipped_orders,
-        "delivered_orders": delivered_orders,
-        "total_revenue": total_revenue
+        "total_orders": sum(counts.values()),
+        "pending_orders": counts.get(OrderStatus.PENDING.value, 0),
+        "confirmed_orders": counts.get(OrderStatus.APPROVED.value, 0),
+        "shipped_orders": 0,
+        "delivered_orders": counts.get(OrderStatus.SOLD.value, 0),
+        "total_revenue": float(total_revenue)
     }
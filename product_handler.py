@@ -1,41 +1,63 @@
+import base64
+import json
 import logging
 import re
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import or_
-from typing import List, Optional
+import orjson
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from sqlalchemy.orm import Session
+from sqlalchemy import or_, select, update, tuple_, bindparam, DateTime
+from typing import Any, List, Optional, Tuple
 from models import Product, Category
 from database import get_db
 from schemas import ProductCreate, ProductUpdate, ProductOut
 from services.product_service import create_product as create_product_service
+from utils.ttl_cache import cache
+from backend.config import PRODUCT_CACHE_TTL
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 router = APIRouter(tags=["products"])
 
+# Allowed extension at the end of the path (anchored before any query string or fragment),
+# or a known placeholder service
+_IMAGE_URL_RE = re.compile(r'^[^?#]*\.(?:jpe?g|png|gif|svg)(?:[?#]|$)|placehold\.co|placeholder\.com', re.IGNORECASE)
+_MAX_SEARCH_TERMS = 5
+# Deepest OFFSET the product list will run; past this clients must page with the cursor
+_MAX_OFFSET = 100_000
+
+# Columns behind a ProductOut row; list reads select them and updates return them
+_PRODUCT_OUT_COLUMNS = (
+    Product.id, Product.code, Product.name, Product.description, Product.price,
+    Product.sizes, Product.image_url, Product.thumbnail_url, Product.stock,
+    Product.low_stock_threshold, Product.category_id, Product.tags, Product.is_active,
+    Product.created_at, Product.updated_at
+)
+
 
 def validate_image_url(image_url: str) -> bool:
     """Validate that image_url is a valid URL ending with allowed extensions."""
-    if not image_url:
-        return True  # Allow empty image_url
-    
-    # Check if it's a valid URL ending with allowed extensions
-    allowed_extensions = ('.jpg', '.jpeg', '.png', '.gif', '.svg')
-    
-    # Remove query parameters for validation
-    url_without_query = image_url.split('?')[0].lower()
-    
-    # Check if URL ends with allowed extension
-    if any(url_without_query.endswith(ext) for ext in allowed_extensions):
-        return True
-    
-    # Also allow common placeholder services
-    if any(service in image_url.lower() for service in ['placehold.co', 'via.placeholder.com', 'placeholder.com']):
-        return True
-    
-    return False
+    # Empty image_url is allowed; otherwise one pass of the combined pattern
+    return not image_url or bool(_IMAGE_URL_RE.search(image_url))
+
+
+def encode_cursor(sort_value: Any, product_id: int) -> str:
+    """Encode the last row's (sort value, id) as an opaque keyset cursor."""
+    if isinstance(sort_value, datetime):
+        sort_value = sort_value.isoformat()
+    raw = json.dumps([sort_value, product_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def decode_cursor(cursor: str, sort_field) -> Tuple[Any, int]:
+    """Decode a keyset cursor back into (sort value, id) for the given sort column."""
+    try:
+        sort_value, product_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if sort_value is not None and isinstance(sort_field.type, DateTime):
+            sort_value = datetime.fromisoformat(sort_value)
+        return sort_value, int(product_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
 
 
 def validate_sizes(sizes: List[str]) -> bool:
@@ -59,12 +81,18 @@ def get_products(
     offset: Optional[int] = Query(None, ge=0, description="Number of products to skip"),
     page: Optional[int] = Query(None, ge=1, description="Page number (1-based)"),
     page_size: Optional[int] = Query(None, ge=1, le=100, description="Page size"),
+    cursor: Optional[str] = Query(None, description="Keyset cursor from the previous page's X-Next-Cursor header"),
+    response: Response = None,
     db: Session = Depends(get_db)
 ):
     """
     Get products with search, filtering, and pagination.
     
-    Supports both limit/offset and page/page_size pagination styles.
+    Prefer keyset pagination: pass the X-Next-Cursor header of one page as `cursor`
+    to fetch the next. The header is only sent for sorts on NOT NULL columns (e.g.
+    created_at, price, name, code); nullable sorts such as stock page with offsets.
+    limit/offset and page/page_size still work but are deprecated, since deep
+    offsets make the database scan and discard every skipped row.
     """
     # Handle pagination - page/page_size takes precedence over limit/offset
     if page is not None and page_size is not None:
@@ -75,93 +103,154 @@ def get_products(
         limit = limit or 20
         offset = offset or 0
     
-    logger.info(f"📦 Fetching products with query='{q}', category_id={category_id}, limit={limit}, offset={offset}")
+    if offset > _MAX_OFFSET:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Offset too deep (max {_MAX_OFFSET}); use the X-Next-Cursor header with the cursor parameter"
+        )
     
-    # Build query with category relationship
-    query = db.query(Product).options(joinedload(Product.category))
+    # An empty price range cannot match anything; answer without touching the database
+    if min_price is not None and max_price is not None and min_price > max_price:
+        return []
+    
+    logger.info("📦 Fetching products with query='%s', category_id=%s, limit=%s, offset=%s", q, category_id, limit, offset)
+    
+    # Column-only SELECT: rows go straight into ProductOut without ORM hydration
+    query = select(
+        *_PRODUCT_OUT_COLUMNS, Category.name.label("category_name")
+    ).outerjoin(Category, Product.category_id == Category.id)
     
     # Apply search filter
     if q:
         search_term = f"%{q}%"
-        query = query.filter(
+        query = query.where(
             or_(
                 Product.name.ilike(search_term),
                 Product.code.ilike(search_term),
-                Product.category.has(Category.name.ilike(search_term))
+                Category.name.ilike(search_term)
             )
         )
     
-    # Apply category filter
-    if category_id is not None:
-        query = query.filter(Product.category_id == category_id)
-    
-    # Apply active status filter
-    if is_active is not None:
-        query = query.filter(Product.is_active == is_active)
+    # Category, active status and price filters are always part of the statement; an
+    # omitted filter binds NULL and its predicate reduces to "NULL IS NULL OR ...".
+    # Every combination of these filters therefore shares one compiled statement in
+    # the engine's query cache, and PostgreSQL folds the constant check away when planning.
+    category_param = bindparam("category_id", category_id, type_=Product.category_id.type)
+    active_param = bindparam("is_active", is_active, type_=Product.is_active.type)
+    min_price_param = bindparam("min_price", min_price, type_=Product.price.type)
+    max_price_param = bindparam("max_price", max_price, type_=Product.price.type)
+    query = query.where(
+        or_(category_param.is_(None), Product.category_id == category_param),
+        or_(active_param.is_(None), Product.is_active == active_param),
+        or_(min_price_param.is_(None), Product.price >= min_price_param),
+        or_(max_price_param.is_(None), Product.price <= max_price_param)
+    )
     
     # Apply stock filter
     if in_stock_only:
-        query = query.filter(Product.stock > 0)
-    
-    # Apply price filters
-    if min_price is not None:
-        query = query.filter(Product.price >= min_price)
-    if max_price is not None:
-        query = query.filter(Product.price <= max_price)
+        query = query.where(Product.stock > 0)
     
-    # Apply sorting
-    sort_field = getattr(Product, sort, Product.created_at)
+    # Apply sorting; id breaks ties so the keyset order is total
+    sort_field = Product.__table__.c.get(sort, Product.__table__.c.created_at)
+    query = query.add_columns(sort_field.label("sort_key"))
     if order == "asc":
-        query = query.order_by(sort_field.asc())
+        query = query.order_by(sort_field.asc(), Product.id.asc())
     else:
-        query = query.order_by(sort_field.desc())
+        query = query.order_by(sort_field.desc(), Product.id.desc())
     
-    # Apply pagination
-    products = query.offset(offset).limit(limit).all()
+    # Apply pagination: seek past the cursor row, or fall back to OFFSET. The row-value
+    # comparison never matches NULL sort values, so only NOT NULL columns can be seeked on
+    keyset = not sort_field.nullable
+    if cursor:
+        if not keyset:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Cursor pagination is not available for sort={sort}; use limit/offset"
+            )
+        last_value, last_id = decode_cursor(cursor, sort_field)
+        key = tuple_(sort_field, Product.id)
+        query = query.where(key > (last_value, last_id) if order == "asc" else key < (last_value, last_id))
+    else:
+        query = query.offset(offset)
+    rows = db.execute(query.limit(limit)).all()
     
-    logger.info(f"✅ Found {len(products)} products")
+    if keyset and response is not None and len(rows) == limit:
+        response.headers["X-Next-Cursor"] = encode_cursor(rows[-1].sort_key, rows[-1].id)
     
-    # Convert database products to response format
-    response_products = []
-    for product in products:
-        # Handle sizes - check if it exists in the model, otherwise use empty list
-        sizes_list = []
-        if hasattr(product, 'sizes') and product.sizes is not None:
-            sizes_list = product.sizes.split(",")
-        
-        # Handle thumbnail_url - check if it exists in the model
-        thumbnail_url = None
-        if hasattr(product, 'thumbnail_url'):
-            thumbnail_url = product.thumbnail_url
-            
-        # Calculate low_stock status
-        low_stock = product.stock <= (product.low_stock_threshold or 5)
-        
-        response_data = {
-            "id": product.id,
-            "code": product.code,
-            "name": product.name,
-            "description": product.description,
-            "price": product.price,
-            "sizes": sizes_list,
-            "image_url": product.image_url,
-            "thumbnail_url": thumbnail_url,
-            "stock": product.stock,
-            "low_stock": low_stock,
-            "low_stock_threshold": product.low_stock_threshold or 5,
-            "category_id": product.category_id,
-            "category_name": product.category.name if product.category else "Unknown",
-            "tags": product.tags,
-            "is_active": product.is_active,
-            "created_at": product.created_at,
-            "updated_at": product.updated_at
-        }
-        response_products.append(ProductOut(**response_data))
+    logger.info("✅ Found %s products", len(rows))
     
-    return response_products
+    return [_product_out_from_row(row) for row in rows]
+
+
+def _product_out_from_row(row) -> ProductOut:
+    # Rows come straight from the database, so skip validation with model_construct
+    return ProductOut.model_construct(
+        id=row.id,
+        code=row.code,
+        name=row.name,
+        description=row.description,
+        price=row.price,
+        sizes=row.sizes or [],
+        image_url=row.image_url,
+        thumbnail_url=row.thumbnail_url,
+        stock=row.stock,
+        low_stock=row.stock <= (row.low_stock_threshold or 5),
+        low_stock_threshold=row.low_stock_threshold or 5,
+        category_id=row.category_id,
+        category_name=row.category_name or "Unknown",
+        tags=row.tags,
+        is_active=row.is_active,
+        created_at=row.created_at,
+        updated_at=row.updated_at
+    )
 
 
-@router.get("/chatbot", response_model=List[dict])
+def _update_product_row(db: Session, product_id: int, update_data: dict) -> Optional[ProductOut]:
+    """
+    Apply update_data to a product with one UPDATE ... RETURNING and commit.
+    
+    Returns the updated product, or None if no product has this ID.
+    """
+    # Only mapped columns are written; available_sizes/available_colors have no column of that name
+    values = {field: value for field, value in update_data.items() if field in Product.__table__.c}
+    category_name = select(Category.name).where(Category.id == Product.category_id).scalar_subquery()
+    stmt = (
+        update(Product)
+        .where(Product.id == product_id)
+        .values(**values)
+        .returning(*_PRODUCT_OUT_COLUMNS, category_name.label("category_name"))
+    )
+    row = db.execute(stmt).one_or_none()
+    if row is None:
+        return None
+    db.commit()
+    cache.invalidate("products:")
+    return _product_out_from_row(row)
+
+
+# The body is pre-encoded JSON, so the payload shape is documented here instead of a response_model
+_CHATBOT_RESPONSES = {
+    200: {
+        "description": "Simplified product data for chatbot responses",
+        "content": {
+            "application/json": {
+                "example": [
+                    {
+                        "code": "A0001",
+                        "name": "کفش ورزشی",
+                        "price": 1250000.0,
+                        "stock": 12,
+                        "category": "کفش",
+                        "image": "https://example.com/images/a0001-thumb.jpg"
+                    }
+                ]
+            }
+        }
+    }
+}
+
+
+@router.get("/chatbot", response_class=Response, response_model=None, responses=_CHATBOT_RESPONSES)
 def get_products_for_chatbot(
     q: Optional[str] = Query(None, description="Search query for name, code, or category"),
     category_id: Optional[int] = Query(None, description="Filter by category ID"),
@@ -175,10 +264,29 @@ def get_products_for_chatbot(
     This endpoint is read-only and requires no authentication (dev only).
     
     Returns:
-        List[dict]: Simplified product data with fields: code, name, price, stock, category, image
+        Response: JSON array of simplified product data with fields: code, name, price, stock, category, image
     """
-    # Build query with category relationship
-    query = db.query(Product).options(joinedload(Product.category))
+    # Catalog rows change rarely; writes below invalidate the "products:" keys.
+    # The encoded JSON body is cached, so a hit skips both the query and serialization.
+    body = cache.get_or_set(
+        f"products:chatbot:{q}:{category_id}:{limit}",
+        PRODUCT_CACHE_TTL,
+        lambda: orjson.dumps(_load_products_for_chatbot(db, q, category_id, limit))
+    )
+    return Response(content=body, media_type="application/json")
+
+
+def _load_products_for_chatbot(db: Session, q: Optional[str], category_id: Optional[int], limit: int) -> List[dict]:
+    # Select only the columns the chatbot payload uses; the category name comes from an outer join
+    query = db.query(
+        Product.code,
+        Product.name,
+        Product.price,
+        Product.stock,
+        Product.thumbnail_url,
+        Product.image_url,
+        Category.name.label("category_name")
+    ).outerjoin(Category, Product.category_id == Category.id)
     
     # Apply search filter
     if q:
@@ -187,7 +295,7 @@ def get_products_for_chatbot(
             or_(
                 Product.name.ilike(search_term),
                 Product.code.ilike(search_term),
-                Product.category.has(Category.name.ilike(search_term))
+                Category.name.ilike(search_term)
             )
         )
     
@@ -196,19 +304,19 @@ def get_products_for_chatbot(
         query = query.filter(Product.category_id == category_id)
     
     # Apply limit and get results
-    products = query.limit(limit).all()
+    rows = query.limit(limit).all()
     
     # Return simplified data for chatbot
     return [
         {
-            "code": product.code,
-            "name": product.name,
-            "price": product.price,
-            "stock": product.stock,
-            "category": product.category.name if product.category else "Unknown",
-            "image": product.thumbnail_url or product.image_url or None,
+            "code": row.code,
+            "name": row.name,
+            "price": row.price,
+            "stock": row.stock,
+            "category": row.category_name or "Unknown",
+            "image": row.thumbnail_url or row.image_url or None,
         }
-        for product in products
+        for row in rows
     ]
 
 
@@ -224,48 +332,35 @@ def search_products_by_name(db: Session, query: str) -> List[Product]:
         List[Product]: List of matching products
     """
     try:
-        # Convert query to lowercase for case-insensitive search
-        query_lower = query.lower()
-        
-        # Split query into words for better matching
-        search_terms = query_lower.split()
+        # Unique lowercase words, capped: the ILIKE patterns are bound parameters, so
+        # each term count compiles once and is then served from the statement cache
+        search_terms = list(dict.fromkeys(query.lower().split()))[:_MAX_SEARCH_TERMS]
         
-        # Build dynamic query
-        db_query = db.query(Product)
+        # Only in-stock products (or ones whose stock isn't tracked)
+        stmt = select(Product).where(or_(Product.stock.is_(None), Product.stock > 0))
         
-        # Search in name and description
-        conditions = []
-        for term in search_terms:
-            conditions.append(
-                or_(
-                    Product.name.ilike(f"%{term}%"),
-                    Product.description.ilike(f"%{term}%")
-                )
-            )
-        
-        if conditions:
-            db_query = db_query.filter(or_(*conditions))
-        
-        # Filter by stock availability (if stock is tracked)
-        db_query = db_query.filter(
-            or_(Product.stock.is_(None), Product.stock > 0)
-        )
+        # Search in name and description (substring matches, served by the trigram indexes)
+        if search_terms:
+            stmt = stmt.where(or_(*(
+                or_(Product.name.ilike(f"%{term}%"), Product.description.ilike(f"%{term}%"))
+                for term in search_terms
+            )))
         
         # Order by creation date (newest first)
-        products = db_query.order_by(Product.created_at.desc()).limit(10).all()
+        products = db.execute(stmt.order_by(Product.created_at.desc()).limit(10)).scalars().all()
         
-        logger.info(f"🔍 Found {len(products)} products for query: '{query}'")
+        logger.info("🔍 Found %s products for query: '%s'", len(products), query)
         return products
         
     except Exception as e:
-        logger.error(f"❌ Error searching products: {str(e)}")
+        logger.error("❌ Error searching products: %s", e)
         return []
 
 
 @router.post("/", response_model=ProductOut, status_code=status.HTTP_201_CREATED)
 def create_product(product: ProductCreate, db: Session = Depends(get_db)):
-    logger.info(f"📥 New product received: {product.name}")
-    logger.info(f"🧪 Full product payload: {product.dict()}")
+    logger.info("📥 New product received: %s", product.name)
+    logger.debug("🧪 Full product payload: %r", product)
     
     try:
         # Validate category_id is provided
@@ -279,7 +374,7 @@ def create_product(product: ProductCreate, db: Session = Depends(get_db)):
         # Validate category exists
         category = db.query(Category).filter(Category.id == product.category_id).first()
         if not category:
-            logger.error(f"❌ Product validation failed: category with ID {product.category_id} not found")
+            logger.error("❌ Product validation failed: category with ID %s not found", product.category_id)
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="category not found"
@@ -287,7 +382,7 @@ def create_product(product: ProductCreate, db: Session = Depends(get_db)):
         
         # Validate sizes field
         if not validate_sizes(product.sizes):
-            logger.error(f"❌ Product validation failed: sizes must be a list of strings")
+            logger.error("❌ Product validation failed: sizes must be a list of strings")
             raise HTTPException(
                 status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
                 detail="فیلد سایزها باید یک لیست از رشته‌ها باشد"
@@ -295,7 +390,7 @@ def create_product(product: ProductCreate, db: Session = Depends(get_db)):
         
         # Validate image_url
         if not validate_image_url(product.image_url):
-            logger.error(f"❌ Product validation failed: invalid image URL format")
+            logger.error("❌ Product validation failed: invalid image URL format")
             raise HTTPException(
                 status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
                 detail="آدرس تصویر نامعتبر است. فقط فرمت‌های jpg، jpeg، png و gif مجاز هستند"
@@ -304,14 +399,14 @@ def create_product(product: ProductCreate, db: Session = Depends(get_db)):
         # Use the product service to create the product (handles code generation and all required fields)
         created_product = create_product_service(db, product)
         
-        logger.info(f"✅ Product created successfully with ID: {created_product.id}")
+        logger.info("✅ Product created successfully with ID: %s", created_product.id)
         return created_product
         
     except HTTPException:
         raise
     except Exception as e:
         import traceback
-        logger.error(f"❌ Product creation failed: {str(e)}")
+        logger.error("❌ Product creation failed: %s", e)
         logger.error(traceback.format_exc())
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
@@ -334,52 +429,20 @@ def update_product(product_id: int, product: ProductUpdate, db: Session = Depend
     Raises:
         HTTPException 404: Product not found
     """
-    logger.info(f"📝 Updating product with ID: {product_id}")
-    
-    db_product = db.query(Product).filter(Product.id == product_id).first()
-    if not db_product:
-        logger.error(f"❌ Product not found with ID: {product_id}")
-        raise HTTPException(status_code=404, detail="Product not found")
+    logger.info("📝 Updating product with ID: %s", product_id)
     
     # Get the update data, excluding unset fields
+    # (sizes arrives as a list from the schema and is stored as-is in the array column)
     update_data = product.dict(exclude_unset=True)
     
-    # For each field in ProductUpdate, update the field if a new value is provided
-    for field, value in update_data.items():
-        if field == "sizes" and value is not None:
-            # Handle sizes field - convert list to string for database storage
-            if isinstance(value, list):
-                sizes_str = ",".join(value)
-                setattr(db_product, field, sizes_str)
-                logger.info(f"✅ Updated {field}: {value} -> {sizes_str}")
-            else:
-                logger.warning(f"⚠️ Invalid sizes format: {value}")
-        else:
-            setattr(db_product, field, value)
-            logger.info(f"✅ Updated {field}: {value}")
-    
-    # Commit changes to database
-    db.commit()
-    db.refresh(db_product)
-    
-    logger.info(f"✅ Product {product_id} updated successfully")
-    
-    # Convert sizes string back to list for response
-    sizes_list = db_product.sizes.split(",") if db_product.sizes is not None else []
-    
-    # Create response data
-    response_data = {
-        "id": db_product.id,
-        "name": db_product.name,
-        "description": db_product.description,
-        "price": db_product.price,
-        "sizes": sizes_list,
-        "image_url": db_product.image_url,
-        "stock": db_product.stock,
-        "created_at": db_product.created_at
-    }
+    # Update and read back the row in one round-trip
+    updated = _update_product_row(db, product_id, update_data)
+    if updated is None:
+        logger.error("❌ Product not found with ID: %s", product_id)
+        raise HTTPException(status_code=404, detail="Product not found")
     
-    return ProductOut(**response_data)
+    logger.info("✅ Product %s updated: %s", product_id, list(update_data))
+    return updated
 
 
 @router.patch("/{product_id}", response_model=ProductOut)
@@ -398,53 +461,20 @@ def patch_product(product_id: int, product: ProductUpdate, db: Session = Depends
     Raises:
         HTTPException 404: Product not found
     """
-    logger.info(f"📝 Patching product with ID: {product_id}")
-    
-    # Fetch product by ID from the database
-    db_product = db.query(Product).filter(Product.id == product_id).first()
-    if not db_product:
-        logger.error(f"❌ Product not found with ID: {product_id}")
-        raise HTTPException(status_code=404, detail="Product not found")
+    logger.info("📝 Patching product with ID: %s", product_id)
     
     # Get the update data, excluding unset fields
+    # (sizes arrives as a list from the schema and is stored as-is in the array column)
     update_data = product.dict(exclude_unset=True)
     
-    # For each field in ProductUpdate, update the field if a new value is provided
-    for field, value in update_data.items():
-        if field == "sizes" and value is not None:
-            # Handle sizes field - convert list to string for database storage
-            if isinstance(value, list):
-                sizes_str = ",".join(value)
-                setattr(db_product, field, sizes_str)
-                logger.info(f"✅ Updated {field}: {value} -> {sizes_str}")
-            else:
-                logger.warning(f"⚠️ Invalid sizes format: {value}")
-        else:
-            setattr(db_product, field, value)
-            logger.info(f"✅ Updated {field}: {value}")
-    
-    # Commit changes to database
-    db.commit()
-    db.refresh(db_product)
-    
-    logger.info(f"✅ Product {product_id} patched successfully")
-    
-    # Convert sizes string back to list for response
-    sizes_list = db_product.sizes.split(",") if db_product.sizes is not None else []
-    
-    # Create response data
-    response_data = {
-        "id": db_product.id,
-        "name": db_product.name,
-        "description": db_product.description,
-        "price": db_product.price,
-        "sizes": sizes_list,
-        "image_url": db_product.image_url,
-        "stock": db_product.stock,
-        "created_at": db_product.created_at
-    }
+    # Update and read back the row in one round-trip
+    updated = _update_product_row(db, product_id, update_data)
+    if updated is None:
+        logger.error("❌ Product not found with ID: %s", product_id)
+        raise HTTPException(status_code=404, detail="Product not found")
     
-    return ProductOut(**response_data)
+    logger.info("✅ Product %s patched: %s", product_id, list(update_data))
+    return updated
 
 @router.delete("/{product_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_product(product_id: int, db: Session = Depends(get_db)):
@@ -453,4 +483,5 @@ def delete_product(product_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Product not found")
     db.delete(db_product)
     db.commit()
+    cache.invalidate("products:")
     return None 
\ No newline at end of file
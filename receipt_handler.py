@@ -1,6 +1,7 @@
 from typing import Optional
+from sqlalchemy import insert, literal, select
 from sqlalchemy.orm import Session
-from models import Order, Receipt
+from models import Order, Receipt, utcnow
 
 def handle_receipt(user_id: int, photo_id: str, db: Session) -> str:
     """
@@ -8,25 +9,27 @@ def handle_receipt(user_id: int, photo_id: str, db: Session) -> str:
     Creates a new Receipt record linked to the user's latest pending order.
     """
     try:
-        # Query the user's latest order (Order with status "pending")
-        latest_order = db.query(Order).filter(
-            Order.user_id == user_id,
-            Order.status == "pending"
-        ).order_by(Order.created_at.desc()).first()
+        # The user's latest order with status "pending", with the receipt values alongside
+        latest_pending_order = (
+            select(Order.id, literal(photo_id), literal(False), utcnow())
+            .where(Order.user_id == user_id, Order.status == "pending")
+            .order_by(Order.created_at.desc())
+            .limit(1)
+        )
+        
+        # Look up the order and insert the receipt in one INSERT ... SELECT round-trip;
+        # nothing is inserted (and no id returned) when there is no pending order.
+        # verified is left False by default.
+        receipt_id = db.execute(
+            insert(Receipt)
+            .from_select(["order_id", "image_url", "verified", "uploaded_at"], latest_pending_order)
+            .returning(Receipt.id)
+        ).scalar()
         
         # If no order exists, return error message
-        if not latest_order:
+        if receipt_id is None:
             return "سفارشی برای ثبت رسید پیدا نشد."
         
-        # Create a new Receipt object with image_url = photo_id, linked to that order
-        new_receipt = Receipt(
-            order_id=latest_order.id,
-            image_url=photo_id,
-            verified=False  # Leave verified=False by default
-        )
-        
-        # Add to database and commit
-        db.add(new_receipt)
         db.commit()
         
         # Return success message
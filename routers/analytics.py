@@ -1,12 +1,15 @@
 from fastapi import APIRouter, Depends, Query, HTTPException
 from sqlalchemy.orm import Session
-from sqlalchemy import func, desc, and_, or_
-from datetime import datetime, timedelta
+from sqlalchemy import func, desc, and_, or_, select, literal, union_all, inspect
+from datetime import datetime, timedelta, date, time
+from functools import lru_cache
 from typing import Optional, List
 import logging
 
-from database import get_db
-from models import Order, OrderItem, Product, Category, TelegramMessage, TelegramUser, ChatMessage, Message
+from database import get_db, engine
+from models import Order, OrderItem, OrderItemDaily, AnalyticsRollupRefresh, Product, Category, TelegramMessage, TelegramUser, ChatMessage
+from utils.ttl_cache import cache
+from backend.config import ANALYTICS_CACHE_TTL
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -23,163 +26,228 @@ def get_analytics_summary(
     If no dates provided, defaults to last 30 days.
     """
     try:
-        # Default to last 30 days if no dates provided
-        if not start_date or not end_date:
-            end_dt = datetime.now()
-            start_dt = end_dt - timedelta(days=30)
-        else:
-            start_dt = datetime.strptime(start_date, "%Y-%m-%d")
-            end_dt = datetime.strptime(end_date, "%Y-%m-%d")
-            # Include full end day
-            end_dt = end_dt.replace(hour=23, minute=59, second=59)
-
-        # Base filters for date range
-        order_filter = and_(Order.created_at >= start_dt, Order.created_at <= end_dt)
-
-        # Total orders and revenue in date range
-        total_orders = db.query(Order).filter(order_filter).count()
-        total_revenue = db.query(func.sum(Order.final_amount)).filter(order_filter).scalar() or 0.0
-
-        # Total messages in date range (all message types)
-        total_messages = 0
-        try:
-            # Count Telegram messages
-            telegram_messages = 0
-            try:
-                telegram_filter = and_(TelegramMessage.created_at >= start_dt, TelegramMessage.created_at <= end_dt)
-                telegram_messages = db.query(TelegramMessage).filter(telegram_filter).count()
-            except:
-                pass
-            
-            # Count Chat messages
-            chat_messages = 0
-            try:
-                chat_filter = and_(ChatMessage.created_at >= start_dt, ChatMessage.created_at <= end_dt)
-                chat_messages = db.query(ChatMessage).filter(chat_filter).count()
-            except:
-                pass
-            
-            # Count general messages
-            general_messages = 0
-            try:
-                message_filter = and_(Message.created_at >= start_dt, Message.created_at <= end_dt)
-                general_messages = db.query(Message).filter(message_filter).count()
-            except:
-                pass
-            
-            total_messages = telegram_messages + chat_messages + general_messages
-        except Exception as e:
-            logger.error(f"Error counting messages: {e}")
-            pass
-
-        # Calculate message to order ratio
-        msg_order_ratio = round(total_messages / max(total_orders, 1), 2)
-
-        # Total customers (unique customers who made purchases in date range)
-        total_customers = 0
-        try:
-            # Count unique customers who made orders in the date range
-            unique_customers = db.query(Order.customer_phone).filter(
-                and_(
-                    order_filter,
-                    Order.customer_phone.isnot(None),
-                    Order.customer_phone != ''
-                )
-            ).distinct().count()
-            total_customers = unique_customers
-        except Exception as e:
-            logger.error(f"Error counting customers: {e}")
-            pass
-
-        # Top products by sales in date range
-        top_products_query = (
-            db.query(
-                Product.name,
-                Product.id.label('product_id'),
-                func.sum(OrderItem.quantity).label('sales'),
-                func.sum(OrderItem.quantity * OrderItem.unit_price).label('revenue')
-            )
-            .join(OrderItem, Product.id == OrderItem.product_id)
-            .join(Order, OrderItem.order_id == Order.id)
-            .filter(order_filter)
-            .group_by(Product.id, Product.name)
-            .order_by(desc('sales'))
-            .limit(5)
-            .all()
+        start_dt, end_dt, window_key = _resolve_window(start_date, end_date)
+        cache_key = f"orders:analytics:summary:{window_key}"
+
+        # Summary data moves slowly; order writes drop the "orders:" keys early
+        return cache.get_or_set(
+            cache_key,
+            ANALYTICS_CACHE_TTL,
+            lambda: _compute_analytics_summary(db, start_dt, end_dt)
         )
 
-        top_products = [
-            {
-                "name": p.name,
-                "product_id": p.product_id,
-                "sales": int(p.sales),
-                "revenue": float(p.revenue)
-            }
-            for p in top_products_query
-        ]
-
-        # Top categories by sales in date range
-        top_categories_query = (
-            db.query(
-                Category.name,
-                Category.id.label('category_id'),
-                func.sum(OrderItem.quantity).label('sales'),
-                func.sum(OrderItem.quantity * OrderItem.unit_price).label('revenue')
-            )
-            .join(Product, Category.id == Product.category_id)
-            .join(OrderItem, Product.id == OrderItem.product_id)
-            .join(Order, OrderItem.order_id == Order.id)
-            .filter(order_filter)
-            .group_by(Category.id, Category.name)
-            .order_by(desc('sales'))
-            .limit(5)
-            .all()
-        )
+    except Exception as e:
+        logger.error("Error getting analytics summary: %s", e)
+        raise HTTPException(status_code=500, detail="Failed to get analytics summary")
 
-        top_categories = [
-            {
-                "name": c.name,
-                "category_id": c.category_id,
-                "sales": int(c.sales),
-                "revenue": float(c.revenue)
-            }
-            for c in top_categories_query
-        ]
-
-        # Recent activity in date range
-        recent_orders = (
-            db.query(Order)
-            .filter(order_filter)
-            .order_by(desc(Order.created_at))
-            .limit(5)
-            .all()
-        )
 
-        recent_activity = []
-        
-        # Add recent orders
-        for order in recent_orders:
-            activity = {
-                "type": "order",
-                "title": f"سفارش جدید از {order.customer_name}",
-                "time_ago": _time_ago(order.created_at)
-            }
-            recent_activity.append(activity)
+def _resolve_window(start_date: Optional[str], end_date: Optional[str]) -> tuple:
+    """(start, end, cache key part) for the requested range; the last 30 days if either is missing."""
+    if not start_date or not end_date:
+        end_dt = datetime.now()
+        return end_dt - timedelta(days=30), end_dt, "last30"
+    return _parse_window(start_date, end_date)
+
+
+@lru_cache(maxsize=256)
+def _parse_window(start_date: str, end_date: str) -> tuple:
+    start_dt = datetime.combine(date.fromisoformat(start_date), time.min)
+    # Include full end day
+    end_dt = datetime.combine(date.fromisoformat(end_date), time(23, 59, 59))
+    return start_dt, end_dt, f"{start_dt:%Y-%m-%d}:{end_dt:%Y-%m-%d}"
+
+
+@lru_cache(maxsize=None)
+def _existing_tables() -> frozenset:
+    """Table names in the connected database, read once per process."""
+    return frozenset(inspect(engine).get_table_names())
 
+
+@lru_cache(maxsize=None)
+def _has_daily_rollup() -> bool:
+    """Whether the mv_order_item_daily rollup and its refresh log exist (PostgreSQL only), checked once per process."""
+    if engine.dialect.name != "postgresql":
+        return False
+    return (
+        OrderItemDaily.__table__.name in inspect(engine).get_materialized_view_names()
+        and AnalyticsRollupRefresh.__table__.name in _existing_tables()
+    )
+
+
+def _rollup_days(db: Session, start_dt: datetime, end_dt: datetime) -> Optional[tuple]:
+    """Sale-day bounds when the window can be read from the daily rollup, else None.
+
+    Only whole-day windows qualify whose last day (UTC, like created_at) ended
+    before the last successful refresh started. The current day, days finished
+    since that refresh, and everything while the refresh job is failing are
+    aggregated live.
+    """
+    if not _has_daily_rollup():
+        return None
+    if start_dt.time() != time.min or end_dt.time() != time(23, 59, 59) or end_dt.date() >= datetime.utcnow().date():
+        return None
+    refreshed_at = db.execute(
+        select(AnalyticsRollupRefresh.refreshed_at)
+        .where(AnalyticsRollupRefresh.view_name == OrderItemDaily.__table__.name)
+    ).scalar()
+    if refreshed_at is None or refreshed_at < datetime.combine(end_dt.date() + timedelta(days=1), time.min):
+        return None
+    return start_dt.date(), end_dt.date()
+
+
+def _compute_analytics_summary(db: Session, start_dt: datetime, end_dt: datetime) -> dict:
+    # Base filters for date range
+    order_filter = and_(Order.created_at >= start_dt, Order.created_at <= end_dt)
+
+    # Total messages in date range (Telegram plus web chat / legacy GPT assistant);
+    # message tables missing from this database are skipped instead of failing the query
+    message_counts = [
+        select(func.count(model.id))
+        .where(model.created_at >= start_dt, model.created_at <= end_dt)
+        .scalar_subquery()
+        for model in (TelegramMessage, ChatMessage)
+        if model.__tablename__ in _existing_tables()
+    ]
+    total_messages_expr = sum(message_counts, literal(0))
+
+    # Order count, revenue, unique customers (non-empty phones) and message total in one
+    # statement: the order window is aggregated in one pass and the message counts ride
+    # along as uncorrelated scalar subqueries
+    total_orders, total_revenue, total_customers, total_messages = db.execute(
+        select(
+            func.count(Order.id),
+            func.coalesce(func.sum(Order.final_amount), 0.0, type_=Order.final_amount.type),
+            func.count(func.nullif(Order.customer_phone, '').distinct()),
+            total_messages_expr
+        ).where(order_filter)
+    ).one()
+    total_messages = total_messages or 0
+
+    # Calculate message to order ratio
+    msg_order_ratio = round(total_messages / max(total_orders, 1), 2)
+
+    # No orders in the window (common for narrow custom ranges): the top lists and recent
+    # activity would all come back empty, so skip their queries
+    if not total_orders:
         return {
-            "total_orders": total_orders,
+            "total_orders": 0,
             "total_revenue": total_revenue,
-            "total_messages": total_messages, 
-            "total_customers": total_customers,
+            "total_messages": total_messages,
+            "total_customers": 0,
             "msg_order_ratio": msg_order_ratio,
-            "top_products": top_products,
-            "top_categories": top_categories,
-            "recent_activity": recent_activity
+            "top_products": [],
+            "top_categories": [],
+            "recent_activity": []
         }
 
-    except Exception as e:
-        logger.error(f"Error getting analytics summary: {e}")
-        raise HTTPException(status_code=500, detail="Failed to get analytics summary")
+    # Top products and top categories by sales in date range. Per-product sales are
+    # aggregated once in a CTE over OrderItem JOIN Order, then ranked per product and
+    # rolled up per category; both top-5 lists come back in one UNION ALL statement.
+    # Past whole-day windows sum the daily rollup instead of scanning the items.
+    rollup_days = _rollup_days(db, start_dt, end_dt)
+    if rollup_days:
+        per_product = (
+            select(
+                OrderItemDaily.product_id,
+                func.sum(OrderItemDaily.qty).label('sales'),
+                func.sum(OrderItemDaily.revenue).label('revenue')
+            )
+            .where(OrderItemDaily.sale_date.between(*rollup_days))
+            .group_by(OrderItemDaily.product_id)
+            .cte('per_product')
+        )
+    else:
+        per_product = (
+            select(
+                OrderItem.product_id,
+                func.sum(OrderItem.quantity).label('sales'),
+                func.sum(OrderItem.quantity * OrderItem.unit_price).label('revenue')
+            )
+            .join(Order, OrderItem.order_id == Order.id)
+            .where(order_filter)
+            .group_by(OrderItem.product_id)
+            .cte('per_product')
+        )
+    # The top 5 are picked from the CTE alone (a top-N sort), so only those five rows
+    # are joined to products for their names
+    top_per_product = (
+        select(per_product)
+        .order_by(desc(per_product.c.sales))
+        .limit(5)
+        .subquery()
+    )
+    ranked_products = (
+        select(
+            literal('product').label('kind'),
+            Product.id.label('id'),
+            Product.name.label('name'),
+            top_per_product.c.sales,
+            top_per_product.c.revenue
+        )
+        .join(top_per_product, Product.id == top_per_product.c.product_id)
+        .subquery()
+    )
+    category_sales = func.sum(per_product.c.sales)
+    ranked_categories = (
+        select(
+            literal('category').label('kind'),
+            Category.id.label('id'),
+            Category.name.label('name'),
+            category_sales.label('sales'),
+            func.sum(per_product.c.revenue).label('revenue')
+        )
+        .join(Product, Category.id == Product.category_id)
+        .join(per_product, Product.id == per_product.c.product_id)
+        .group_by(Category.id, Category.name)
+        .order_by(desc(category_sales))
+        .limit(5)
+        .subquery()
+    )
+    ranked_rows = db.execute(
+        union_all(select(ranked_products), select(ranked_categories)).order_by(desc('sales'))
+    ).all()
+
+    top_products = []
+    top_categories = []
+    for row in ranked_rows:
+        id_key, target = ("product_id", top_products) if row.kind == 'product' else ("category_id", top_categories)
+        target.append({
+            "name": row.name,
+            id_key: row.id,
+            "sales": int(row.sales),
+            "revenue": float(row.revenue)
+        })
+
+    # Recent activity in date range
+    recent_orders = db.execute(
+        select(Order.customer_name, Order.created_at)
+        .where(order_filter)
+        .order_by(desc(Order.created_at))
+        .limit(5)
+    ).all()
+
+    recent_activity = []
+    
+    # Add recent orders, all measured against the same instant
+    now = datetime.now()
+    for order in recent_orders:
+        activity = {
+            "type": "order",
+            "title": f"سفارش جدید از {order.customer_name}",
+            "time_ago": _time_ago(order.created_at, now)
+        }
+        recent_activity.append(activity)
+
+    return {
+        "total_orders": total_orders,
+        "total_revenue": total_revenue,
+        "total_messages": total_messages, 
+        "total_customers": total_customers,
+        "msg_order_ratio": msg_order_ratio,
+        "top_products": top_products,
+        "top_categories": top_categories,
+        "recent_activity": recent_activity
+    }
 
 
 @router.get("/products/search")
@@ -194,91 +262,96 @@ def search_product_analytics(
     Search for products and get their sales analytics.
     """
     try:
-        # Default to last 30 days if no dates provided
-        if not start_date or not end_date:
-            end_dt = datetime.now()
-            start_dt = end_dt - timedelta(days=30)
-        else:
-            start_dt = datetime.strptime(start_date, "%Y-%m-%d")
-            end_dt = datetime.strptime(end_date, "%Y-%m-%d")
-            # Include full end day
-            end_dt = end_dt.replace(hour=23, minute=59, second=59)
-
-        # Base filters for date range
-        order_filter = and_(Order.created_at >= start_dt, Order.created_at <= end_dt)
-
-        # Search for products by name or code
-        search_filter = or_(
-            Product.name.ilike(f"%{q}%"),
-            Product.code.ilike(f"%{q}%")
-        )
+        start_dt, end_dt, window_key = _resolve_window(start_date, end_date)
 
-        # Get product sales analytics
-        products_query = (
-            db.query(
-                Product.id,
-                Product.name,
-                Product.code,
-                Product.price,
-                Product.stock,
-                Product.category_id,
-                Category.name.label('category_name'),
-                func.sum(OrderItem.quantity).label('total_sold'),
-                func.sum(OrderItem.quantity * OrderItem.unit_price).label('total_revenue'),
-                func.count(Order.id.distinct()).label('order_count'),
-                func.max(Order.created_at).label('last_sale_date')
-            )
-            .outerjoin(OrderItem, Product.id == OrderItem.product_id)
-            .outerjoin(Order, and_(OrderItem.order_id == Order.id, order_filter))
-            .outerjoin(Category, Product.category_id == Category.id)
-            .filter(search_filter)
-            .group_by(
-                Product.id, 
-                Product.name, 
-                Product.code, 
-                Product.price, 
-                Product.stock, 
-                Product.category_id,
-                Category.name
-            )
-            .order_by(desc('total_sold'))
-            .limit(limit)
-            .all()
+        # Cached like the summary; order writes drop the "orders:" keys early
+        return cache.get_or_set(
+            f"orders:analytics:products:search:{q}:{limit}:{window_key}",
+            ANALYTICS_CACHE_TTL,
+            lambda: _compute_product_search_analytics(db, q, limit, start_dt, end_dt)
         )
 
-        products = []
-        for p in products_query:
-            product_data = {
-                "id": p.id,
-                "name": p.name,
-                "code": p.code,
-                "price": float(p.price) if p.price else 0.0,
-                "stock": p.stock or 0,
-                "category_id": p.category_id,
-                "category_name": p.category_name or "بدون دسته‌بندی",
-                "total_sold": int(p.total_sold) if p.total_sold else 0,
-                "total_revenue": float(p.total_revenue) if p.total_revenue else 0.0,
-                "order_count": int(p.order_count) if p.order_count else 0,
-                "last_sale_date": p.last_sale_date.isoformat() if p.last_sale_date else None,
-                "avg_price_sold": float(p.total_revenue / p.total_sold) if p.total_sold and p.total_sold > 0 else 0.0
-            }
-            products.append(product_data)
-
-        return {
-            "products": products,
-            "total_found": len(products),
-            "search_query": q,
-            "date_range": {
-                "start_date": start_dt.isoformat(),
-                "end_date": end_dt.isoformat()
-            }
-        }
-
     except Exception as e:
-        logger.error(f"Error searching product analytics: {e}")
+        logger.error("Error searching product analytics: %s", e)
         raise HTTPException(status_code=500, detail="Failed to search product analytics")
 
 
+def _compute_product_search_analytics(db: Session, q: str, limit: int, start_dt: datetime, end_dt: datetime) -> dict:
+    # Base filters for date range
+    order_filter = and_(Order.created_at >= start_dt, Order.created_at <= end_dt)
+
+    # Search for products by name or code
+    search_filter = or_(
+        Product.name.ilike(f"%{q}%"),
+        Product.code.ilike(f"%{q}%")
+    )
+
+    # Get product sales analytics. Items in the window are pre-aggregated per matching
+    # product first, so the GROUP BY only sees those rows and the products join
+    # receives one small row per product instead of every joined order line
+    sales = (
+        select(
+            OrderItem.product_id,
+            func.sum(OrderItem.quantity).label('total_sold'),
+            func.sum(OrderItem.quantity * OrderItem.unit_price).label('total_revenue'),
+            func.count(OrderItem.order_id.distinct()).label('order_count'),
+            func.max(Order.created_at).label('last_sale_date')
+        )
+        .join(Order, OrderItem.order_id == Order.id)
+        .where(order_filter, OrderItem.product_id.in_(select(Product.id).where(search_filter)))
+        .group_by(OrderItem.product_id)
+        .subquery('sales')
+    )
+    products_query = db.execute(
+        select(
+            Product.id,
+            Product.name,
+            Product.code,
+            Product.price,
+            Product.stock,
+            Product.category_id,
+            Category.name.label('category_name'),
+            sales.c.total_sold,
+            sales.c.total_revenue,
+            sales.c.order_count,
+            sales.c.last_sale_date
+        )
+        .outerjoin(sales, sales.c.product_id == Product.id)
+        .outerjoin(Category, Product.category_id == Category.id)
+        .where(search_filter)
+        .order_by(desc(func.coalesce(sales.c.total_sold, 0)))
+        .limit(limit)
+    ).all()
+
+    products = []
+    for p in products_query:
+        product_data = {
+            "id": p.id,
+            "name": p.name,
+            "code": p.code,
+            "price": float(p.price) if p.price else 0.0,
+            "stock": p.stock or 0,
+            "category_id": p.category_id,
+            "category_name": p.category_name or "بدون دسته‌بندی",
+            "total_sold": int(p.total_sold) if p.total_sold else 0,
+            "total_revenue": float(p.total_revenue) if p.total_revenue else 0.0,
+            "order_count": int(p.order_count) if p.order_count else 0,
+            "last_sale_date": p.last_sale_date.isoformat() if p.last_sale_date else None,
+            "avg_price_sold": float(p.total_revenue / p.total_sold) if p.total_sold and p.total_sold > 0 else 0.0
+        }
+        products.append(product_data)
+
+    return {
+        "products": products,
+        "total_found": len(products),
+        "search_query": q,
+        "date_range": {
+            "start_date": start_dt.isoformat(),
+            "end_date": end_dt.isoformat()
+        }
+    }
+
+
 @router.get("/products/{product_id}/details")
 def get_product_analytics_details(
     product_id: int,
@@ -290,53 +363,70 @@ def get_product_analytics_details(
     Get detailed analytics for a specific product.
     """
     try:
-        # Default to last 30 days if no dates provided
-        if not start_date or not end_date:
-            end_dt = datetime.now()
-            start_dt = end_dt - timedelta(days=30)
-        else:
-            start_dt = datetime.strptime(start_date, "%Y-%m-%d")
-            end_dt = datetime.strptime(end_date, "%Y-%m-%d")
-            # Include full end day
-            end_dt = end_dt.replace(hour=23, minute=59, second=59)
-
-        # Base filters for date range
-        order_filter = and_(Order.created_at >= start_dt, Order.created_at <= end_dt)
-
-        # Get product details
-        product = db.query(Product).filter(Product.id == product_id).first()
-        if not product:
-            raise HTTPException(status_code=404, detail="Product not found")
-
-        # Get sales analytics
-        sales_data = (
-            db.query(
-                func.sum(OrderItem.quantity).label('total_sold'),
-                func.sum(OrderItem.quantity * OrderItem.unit_price).label('total_revenue'),
-                func.count(Order.id.distinct()).label('order_count'),
-                func.avg(OrderItem.unit_price).label('avg_sale_price'),
-                func.min(OrderItem.unit_price).label('min_sale_price'),
-                func.max(OrderItem.unit_price).label('max_sale_price')
-            )
-            .join(Order, OrderItem.order_id == Order.id)
-            .filter(
-                and_(
-                    OrderItem.product_id == product_id,
-                    order_filter
-                )
-            )
-            .first()
+        start_dt, end_dt, window_key = _resolve_window(start_date, end_date)
+
+        # Cached like the summary; order writes drop the "orders:" keys early
+        return cache.get_or_set(
+            f"orders:analytics:products:{product_id}:{window_key}",
+            ANALYTICS_CACHE_TTL,
+            lambda: _compute_product_analytics_details(db, product_id, start_dt, end_dt)
         )
 
-        # Get daily sales breakdown
-        daily_sales = (
-            db.query(
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("Error getting product analytics details: %s", e)
+        raise HTTPException(status_code=500, detail="Failed to get product analytics details")
+
+
+def _compute_product_analytics_details(db: Session, product_id: int, start_dt: datetime, end_dt: datetime) -> dict:
+    # Base filters for date range
+    order_filter = and_(Order.created_at >= start_dt, Order.created_at <= end_dt)
+
+    # Get product details; only the response columns
+    product = db.execute(
+        select(Product.id, Product.name, Product.code, Product.price, Product.stock, Product.category_id)
+        .where(Product.id == product_id)
+    ).first()
+    if not product:
+        raise HTTPException(status_code=404, detail="Product not found")
+
+    # Get daily sales breakdown; the per-day partial aggregates also yield the
+    # window totals below, so the sales analytics need no second pass over the items.
+    # Past whole-day windows read the per-day rows straight from the daily rollup.
+    rollup_days = _rollup_days(db, start_dt, end_dt)
+    if rollup_days:
+        daily_sales = db.execute(
+            select(
+                OrderItemDaily.sale_date,
+                OrderItemDaily.qty.label('daily_sold'),
+                OrderItemDaily.revenue.label('daily_revenue'),
+                OrderItemDaily.order_count.label('daily_orders'),
+                OrderItemDaily.item_count.label('daily_items'),
+                OrderItemDaily.price_sum.label('daily_price_sum'),
+                OrderItemDaily.min_price.label('daily_min_price'),
+                OrderItemDaily.max_price.label('daily_max_price')
+            )
+            .where(
+                OrderItemDaily.product_id == product_id,
+                OrderItemDaily.sale_date.between(*rollup_days)
+            )
+            .order_by(OrderItemDaily.sale_date)
+        ).all()
+    else:
+        daily_sales = db.execute(
+            select(
                 func.date(Order.created_at).label('sale_date'),
                 func.sum(OrderItem.quantity).label('daily_sold'),
-                func.sum(OrderItem.quantity * OrderItem.unit_price).label('daily_revenue')
+                func.sum(OrderItem.quantity * OrderItem.unit_price).label('daily_revenue'),
+                func.count(OrderItem.order_id.distinct()).label('daily_orders'),
+                func.count(OrderItem.id).label('daily_items'),
+                func.sum(OrderItem.unit_price).label('daily_price_sum'),
+                func.min(OrderItem.unit_price).label('daily_min_price'),
+                func.max(OrderItem.unit_price).label('daily_max_price')
             )
             .join(Order, OrderItem.order_id == Order.id)
-            .filter(
+            .where(
                 and_(
                     OrderItem.product_id == product_id,
                     order_filter
@@ -344,77 +434,85 @@ def get_product_analytics_details(
             )
             .group_by(func.date(Order.created_at))
             .order_by(func.date(Order.created_at))
-            .all()
+        ).all()
+
+    # Window totals from the daily rows (an order falls on exactly one day,
+    # so the per-day distinct order counts add up to the window's)
+    items_count = sum(ds.daily_items for ds in daily_sales)
+    total_sold = sum(ds.daily_sold for ds in daily_sales)
+    total_revenue = sum(ds.daily_revenue for ds in daily_sales)
+    order_count = sum(ds.daily_orders for ds in daily_sales)
+    avg_sale_price = sum(ds.daily_price_sum for ds in daily_sales) / items_count if items_count else 0.0
+    min_sale_price = min((ds.daily_min_price for ds in daily_sales), default=0.0)
+    max_sale_price = max((ds.daily_max_price for ds in daily_sales), default=0.0)
+
+    # Get recent orders containing this product (only the columns the response reads)
+    recent_orders = db.execute(
+        select(
+            Order.id,
+            Order.order_number,
+            Order.customer_name,
+            Order.created_at,
+            OrderItem.quantity,
+            OrderItem.unit_price
         )
-
-        # Get recent orders containing this product
-        recent_orders = (
-            db.query(Order, OrderItem.quantity, OrderItem.unit_price)
-            .join(OrderItem, Order.id == OrderItem.order_id)
-            .filter(
-                and_(
-                    OrderItem.product_id == product_id,
-                    order_filter
-                )
+        .join(OrderItem, Order.id == OrderItem.order_id)
+        .where(
+            and_(
+                OrderItem.product_id == product_id,
+                order_filter
             )
-            .order_by(desc(Order.created_at))
-            .limit(10)
-            .all()
         )
-
-        return {
-            "product": {
-                "id": product.id,
-                "name": product.name,
-                "code": product.code,
-                "price": float(product.price) if product.price else 0.0,
-                "stock": product.stock or 0,
-                "category_id": product.category_id
-            },
-            "analytics": {
-                "total_sold": int(sales_data.total_sold) if sales_data.total_sold else 0,
-                "total_revenue": float(sales_data.total_revenue) if sales_data.total_revenue else 0.0,
-                "order_count": int(sales_data.order_count) if sales_data.order_count else 0,
-                "avg_sale_price": float(sales_data.avg_sale_price) if sales_data.avg_sale_price else 0.0,
-                "min_sale_price": float(sales_data.min_sale_price) if sales_data.min_sale_price else 0.0,
-                "max_sale_price": float(sales_data.max_sale_price) if sales_data.max_sale_price else 0.0
-            },
-            "daily_sales": [
-                {
-                    "date": str(ds.sale_date),
-                    "sold": int(ds.daily_sold),
-                    "revenue": float(ds.daily_revenue)
-                }
-                for ds in daily_sales
-            ],
-            "recent_orders": [
-                {
-                    "order_id": order.id,
-                    "order_number": order.order_number,
-                    "customer_name": order.customer_name,
-                    "quantity": int(quantity),
-                    "unit_price": float(unit_price),
-                    "total_price": float(quantity * unit_price),
-                    "created_at": order.created_at.isoformat()
-                }
-                for order, quantity, unit_price in recent_orders
-            ],
-            "date_range": {
-                "start_date": start_dt.isoformat(),
-                "end_date": end_dt.isoformat()
+        .order_by(desc(Order.created_at))
+        .limit(10)
+    ).all()
+
+    return {
+        "product": {
+            "id": product.id,
+            "name": product.name,
+            "code": product.code,
+            "price": float(product.price) if product.price else 0.0,
+            "stock": product.stock or 0,
+            "category_id": product.category_id
+        },
+        "analytics": {
+            "total_sold": int(total_sold),
+            "total_revenue": float(total_revenue),
+            "order_count": int(order_count),
+            "avg_sale_price": float(avg_sale_price),
+            "min_sale_price": float(min_sale_price),
+            "max_sale_price": float(max_sale_price)
+        },
+        "daily_sales": [
+            {
+                "date": str(ds.sale_date),
+                "sold": int(ds.daily_sold),
+                "revenue": float(ds.daily_revenue)
             }
+            for ds in daily_sales
+        ],
+        "recent_orders": [
+            {
+                "order_id": order.id,
+                "order_number": order.order_number,
+                "customer_name": order.customer_name,
+                "quantity": int(order.quantity),
+                "unit_price": float(order.unit_price),
+                "total_price": float(order.quantity * order.unit_price),
+                "created_at": order.created_at.isoformat()
+            }
+            for order in recent_orders
+        ],
+        "date_range": {
+            "start_date": start_dt.isoformat(),
+            "end_date": end_dt.isoformat()
         }
+    }
 
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error getting product analytics details: {e}")
-        raise HTTPException(status_code=500, detail="Failed to get product analytics details")
 
-
-def _time_ago(dt: datetime) -> str:
-    """Helper to calculate time ago string"""
-    now = datetime.now()
+def _time_ago(dt: datetime, now: datetime) -> str:
+    """Helper to calculate time ago string relative to now"""
     diff = now - dt
     
     if diff.days > 0:
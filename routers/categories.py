@@ -8,6 +8,8 @@ from database import get_db
 from schemas.category import CategoryCreate, CategoryOut, CategoryUpdate
 from services.category_service import create_category, list_categories, get_category_by_id, update_category, update_category_with_prefix
 from models import Category, Product
+from utils.ttl_cache import cache
+from backend.config import PRODUCT_CACHE_TTL
 
 router = APIRouter(tags=["categories"])
 
@@ -58,13 +60,28 @@ def get_categories_summary(db: Session = Depends(get_db)):
     Returns:
         List[dict]: Categories with product counts
     """
-    # Query categories with product counts
-    categories_with_counts = db.query(
-        Category.id,
-        Category.name,
-        Category.prefix,
-        func.count(Product.id).label('product_count')
-        ).outerjoin(Product).group_by(Category.id, Category.name, Category.prefix).all()
+    # Kept under "products:" so product and category writes drop it with the product caches
+    return cache.get_or_set("products:categories:summary", PRODUCT_CACHE_TTL, lambda: _compute_categories_summary(db))
+
+
+def _compute_categories_summary(db: Session) -> List[dict]:
+    # Products are counted per category_id first (an index-only scan of the FK index),
+    # then the small per-category result is joined to categories
+    product_counts = (
+        db.query(Product.category_id, func.count().label('product_count'))
+        .group_by(Product.category_id)
+        .subquery()
+    )
+    categories_with_counts = (
+        db.query(
+            Category.id,
+            Category.name,
+            Category.prefix,
+            func.coalesce(product_counts.c.product_count, 0).label('product_count')
+        )
+        .outerjoin(product_counts, product_counts.c.category_id == Category.id)
+        .all()
+    )
     
     return [
         {
@@ -156,12 +173,14 @@ def delete_category_endpoint(
                 detail=f"Category has {product_count} products. Use ?force=true to delete anyway."
             )
         
-        # If force is True, delete all products in this category first
+        # With force, the category's products go first in one bulk DELETE without loading them
+        # into the session (Category.products is passive_deletes, so the ORM won't touch them)
         if force and product_count > 0:
-            db.query(Product).filter(Product.category_id == category_id).delete()
+            db.query(Product).filter(Product.category_id == category_id).delete(synchronize_session=False)
         
         db.delete(category)
         db.commit()
+        cache.invalidate("products:")
         
         return {"message": f"Category {category_id} deleted successfully"}
         
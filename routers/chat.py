@@ -6,7 +6,8 @@ from sqlalchemy.orm import Session
 from token_tracker import track_openai_usage
 from database import get_db
 from models import ChatMessage
-from config_root import CHAT_BUDGET_SECONDS, LLM_TIMEOUT, AGENT_MAX_ITERS, CHAT_MODEL
+from config_root import CHAT_BUDGET_SECONDS, LLM_TIMEOUT, AGENT_MAX_ITERS, CHAT_MODEL, CONVERSATION_STATE_TTL, CONVERSATION_STATE_MAX_ENTRIES
+from utils.ttl_cache import TTLCache
 import json
 import asyncio
 import time
@@ -15,8 +16,10 @@ class ChatPayload(BaseModel):
     conversation_id: str
     message: str
 
-# Simple in-memory state storage (in production, use Redis or DB)
-_conversation_states = {}
+# Conversation state lives in a per-process TTL cache: idle conversations expire
+# after CONVERSATION_STATE_TTL seconds instead of accumulating for the process lifetime.
+# It is separate from the shared read cache so neither can evict the other's entries
+_conversation_states = TTLCache(maxsize=CONVERSATION_STATE_MAX_ENTRIES)
 
 def load_conversation_state(db: Session, conversation_id: str) -> dict:
     """Load conversation state from storage"""
@@ -24,7 +27,7 @@ def load_conversation_state(db: Session, conversation_id: str) -> dict:
 
 def save_conversation_state(db: Session, conversation_id: str, state: dict):
     """Save conversation state to storage"""
-    _conversation_states[conversation_id] = state
+    _conversation_states.set(conversation_id, state, CONVERSATION_STATE_TTL)
 
 router = APIRouter(prefix="/api/chat", tags=["chat"])
 
@@ -43,14 +46,12 @@ def chat_via_graph(payload: ChatPayload, db: Session = Depends(get_db)):
     start_time = time.time()
     
     try:
-        # Log user message
+        # User message; logged together with the reply in one commit below
         user_msg = ChatMessage(
             conversation_id=payload.conversation_id,
             role="user",
             text=payload.message
         )
-        db.add(user_msg)
-        db.commit()
         
         # Use natural language sales agent with timeout protection
         state = load_conversation_state(db, payload.conversation_id)
@@ -73,18 +74,20 @@ def chat_via_graph(payload: ChatPayload, db: Session = Depends(get_db)):
                 order_id = result.get("order_id")
                 status = result.get("status")
             except Exception as e:
-                # Graceful fallback on any agent error
+                # Graceful fallback on any agent error; drop its half-done work so the
+                # message log below still commits
+                db.rollback()
                 reply = "سلام! خوش آمدید. متاسفانه خطایی رخ داده است. لطفاً دوباره تلاش کنید."
                 order_id = None
                 status = None
         
-        # Log assistant message
+        # Log user and assistant messages in a single transaction
         assistant_msg = ChatMessage(
             conversation_id=payload.conversation_id,
             role="assistant",
             text=reply
         )
-        db.add(assistant_msg)
+        db.add_all([user_msg, assistant_msg])
         db.commit()
         
         # Track token usage (if available in result)
@@ -1,7 +1,8 @@
 from fastapi import APIRouter, Depends, Query, HTTPException
 from sqlalchemy.orm import Session
-from sqlalchemy import func, desc, and_, or_
+from sqlalchemy import func, desc, and_, or_, select, union
 from typing import Optional, List, Dict, Any
+from itertools import chain
 import logging
 
 from database import get_db
@@ -61,15 +62,43 @@ def list_users(
         
         telegram_users = telegram_query.all()
         
+        # Get CRM customers
+        crm_query = db.query(Customer)
+        if query:
+            crm_filter = or_(
+                Customer.first_name.ilike(f"%{query}%"),
+                Customer.last_name.ilike(f"%{query}%"),
+                Customer.phone.ilike(f"%{query}%")
+            )
+            crm_query = crm_query.filter(crm_filter)
+        
+        crm_customers = crm_query.all()
+        
+        # Orders count and total spend per phone in one grouped query. Unfiltered, every
+        # person is listed, so all orders are grouped; a search restricts the orders to the
+        # listed phones through a subquery rather than one bound parameter per phone
+        phones = {person.phone for person in chain(telegram_users, crm_customers) if person.phone}
+        order_totals = {}
+        if phones:
+            totals_query = db.query(
+                Order.customer_phone,
+                func.count(Order.id),
+                func.coalesce(func.sum(Order.final_amount), 0.0, type_=Order.final_amount.type)
+            )
+            if query:
+                listed_phones = union(
+                    select(TelegramUser.phone).where(telegram_filter),
+                    select(Customer.phone).where(crm_filter)
+                )
+                totals_query = totals_query.filter(Order.customer_phone.in_(listed_phones))
+            order_totals = {
+                phone: (count, total)
+                for phone, count, total in totals_query.group_by(Order.customer_phone)
+            }
+        
         for user in telegram_users:
-            # Get orders count and total spend (matching by phone if available)
-            orders_count = 0
-            total_spend = 0.0
-            
-            if user.phone:
-                user_orders = db.query(Order).filter(Order.customer_phone == user.phone).all()
-                orders_count = len(user_orders)
-                total_spend = sum(order.final_amount for order in user_orders)
+            # Orders count and total spend (matching by phone if available)
+            orders_count, total_spend = order_totals.get(user.phone, (0, 0.0))
 
             # Combine first and last name
             full_name = " ".join(filter(None, [user.first_name, user.last_name]))
@@ -87,27 +116,9 @@ def list_users(
             }
             user_list.append(user_data)
         
-        # Get CRM customers
-        crm_query = db.query(Customer)
-        if query:
-            crm_filter = or_(
-                Customer.first_name.ilike(f"%{query}%"),
-                Customer.last_name.ilike(f"%{query}%"),
-                Customer.phone.ilike(f"%{query}%")
-            )
-            crm_query = crm_query.filter(crm_filter)
-        
-        crm_customers = crm_query.all()
-        
         for customer in crm_customers:
-            # Get orders count and total spend
-            orders_count = 0
-            total_spend = 0.0
-            
-            if customer.phone:
-                user_orders = db.query(Order).filter(Order.customer_phone == customer.phone).all()
-                orders_count = len(user_orders)
-                total_spend = sum(order.final_amount for order in user_orders)
+            # Orders count and total spend
+            orders_count, total_spend = order_totals.get(customer.phone, (0, 0.0))
 
             # Combine first and last name
             full_name = " ".join(filter(None, [customer.first_name, customer.last_name]))
@@ -225,7 +236,7 @@ def get_user_details(user_id: str, db: Session = Depends(get_db)):
                 {
                     "id": order.id,
                     "order_number": order.order_number,
-                    "status": order.status.value,
+                    "status": order.status,
                     "total_amount": order.final_amount,
                     "created_at": order.created_at.isoformat()
                 }
@@ -358,9 +369,10 @@ def get_conversation_messages(
         # Get total count for pagination
         total_count = base_query.count()
 
-        # Apply pagination and ordering (chronological)
+        # Apply pagination and ordering (chronological; id breaks ties between a
+        # user message and its reply, which are committed together)
         offset = (page - 1) * page_size
-        messages = base_query.order_by(ChatMessage.created_at).offset(offset).limit(page_size).all()
+        messages = base_query.order_by(ChatMessage.created_at, ChatMessage.id).offset(offset).limit(page_size).all()
 
         # Format messages
         message_list = [
@@ -13,10 +13,10 @@ from models import Category, Product
 from services.category_service import get_category_by_id
 from services.import_service import (
     read_table, normalize_columns, validate_rows, 
-    get_validation_summary, create_product_payload
+    get_validation_summary, create_product_payload, bulk_insert_products
 )
-from services.product_service import create_product
 from schemas.product import ProductCreate
+from utils.ttl_cache import cache
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/imports", tags=["imports"])
@@ -88,7 +88,7 @@ async def preview_product_import(
             detail="pandas/openpyxl not installed. Please install: pip install pandas openpyxl"
         )
     except Exception as e:
-        logger.error(f"Error in preview import: {e}")
+        logger.error("Error in preview import: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error processing file: {str(e)}"
@@ -105,7 +105,7 @@ async def import_products(
     Import products from CSV/Excel file.
     
     All products will be imported under the specified category.
-    Products are created using product_service.create_product to ensure proper code generation.
+    Products are bulk inserted with consecutive codes for the category in a single transaction.
     """
     # Validate category_id is provided
     if not category_id:
@@ -152,26 +152,29 @@ async def import_products(
                        f"Please fix all validation errors before importing."
             )
         
-        # Import valid products
-        inserted = 0
+        # Build payloads; rows the schema rejects are reported and skipped
+        payloads = []
         errors = []
         
         for result in validation_results:
             try:
-                # Create product payload
                 product_data = create_product_payload(result["data"], category_id)
-                
-                # Create product using product service (ensures code generation)
-                product_create = ProductCreate(**product_data)
-                create_product(db, product_create)
-                
-                inserted += 1
-                
+                payloads.append(ProductCreate(**product_data))
             except Exception as e:
                 error_msg = f"Row {result['row_index']}: {str(e)}"
                 errors.append(error_msg)
                 logger.error(error_msg)
         
+        # Insert everything in one batch and one transaction
+        try:
+            codes = bulk_insert_products(db, category_id, payloads)
+            db.commit()
+            cache.invalidate("products:")
+        except Exception:
+            db.rollback()
+            raise
+        inserted = len(codes)
+        
         return {
             "inserted": inserted,
             "skipped": 0,
@@ -185,7 +188,7 @@ async def import_products(
             detail="pandas/openpyxl not installed. Please install: pip install pandas openpyxl"
         )
     except Exception as e:
-        logger.error(f"Error in product import: {e}")
+        logger.error("Error in product import: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error processing file: {str(e)}"
@@ -6,6 +6,7 @@ import logging
 
 from database import get_db
 from models import TelegramConfig
+from services.telegram_service import get_current_config, deactivate_other_configs
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -27,7 +28,7 @@ class TelegramConfigResponse(BaseModel):
 def get_telegram_config(db: Session = Depends(get_db)):
     """Get current Telegram configuration (without exposing sensitive data)"""
     try:
-        config = db.query(TelegramConfig).first()
+        config = get_current_config(db)
         
         if not config:
             return TelegramConfigResponse(
@@ -53,18 +54,23 @@ def update_telegram_config(
 ):
     """Update Telegram configuration"""
     try:
-        config = db.query(TelegramConfig).first()
+        # A submitted token selects that bot (a new row if it isn't stored yet) and makes
+        # it the active one; without a token the current bot's settings are edited
+        config = get_current_config(db, config_data.bot_token)
         
         if not config:
+            deactivate_other_configs(db, None)
             config = TelegramConfig(
                 bot_token=config_data.bot_token or "",
                 webhook_url=config_data.webhook_url or "",
-                webhook_secret=config_data.secret or ""
+                webhook_secret=config_data.secret or "",
+                is_active=True
             )
             db.add(config)
         else:
-            if config_data.bot_token is not None:
-                config.bot_token = config_data.bot_token
+            if config_data.bot_token and not config.is_active:
+                deactivate_other_configs(db, config.id)
+                config.is_active = True
             if config_data.webhook_url is not None:
                 config.webhook_url = config_data.webhook_url
             if config_data.secret is not None:
@@ -83,7 +89,7 @@ def update_telegram_config(
 def test_telegram_connection(db: Session = Depends(get_db)):
     """Test Telegram bot connection using stored token"""
     try:
-        config = db.query(TelegramConfig).first()
+        config = get_current_config(db)
         
         if not config or not config.bot_token:
             raise HTTPException(status_code=400, detail="No bot token configured")
@@ -121,7 +127,7 @@ def test_telegram_connection(db: Session = Depends(get_db)):
 def set_telegram_webhook(db: Session = Depends(get_db)):
     """Set Telegram webhook using stored configuration"""
     try:
-        config = db.query(TelegramConfig).first()
+        config = get_current_config(db)
         
         if not config or not config.bot_token:
             raise HTTPException(status_code=400, detail="No bot token configured")
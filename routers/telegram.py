@@ -5,7 +5,8 @@ from fastapi import APIRouter, Depends, HTTPException, Request, Query
 from sqlalchemy.orm import Session
 
 from database import get_db
-from services.telegram_service import TelegramService
+from models import TelegramConfig, TelegramUser
+from services.telegram_service import TelegramService, get_current_config, deactivate_other_configs
 from services.faq_service import FAQService
 from services.crm_service import list_customers_with_stats, get_customer_detail, get_customer_by_phone, get_crm_overview
 from schemas.telegram import (
@@ -116,8 +117,12 @@ async def create_telegram_config(
 ):
     """Create or update Telegram bot configuration"""
     try:
-        # Check if config already exists
-        existing_config = db.query(TelegramConfig).first()
+        # The row of this bot, if it is already stored
+        existing_config = get_current_config(db, config.bot_token)
+        
+        # Only one bot may be active; deactivate the others in the same transaction
+        if config.is_active:
+            deactivate_other_configs(db, existing_config.id if existing_config else None)
         
         if existing_config:
             # Update existing config
@@ -132,7 +137,6 @@ async def create_telegram_config(
             return existing_config
         else:
             # Create new config
-            from models import TelegramConfig
             new_config = TelegramConfig(
                 bot_token=config.bot_token,
                 webhook_url=config.webhook_url,
@@ -173,7 +173,7 @@ class ProductOut(BaseModel):
     tags: Optional[str]
     labels: List[str] = []  # Product labels
     attributes: Dict[str, List[str]] = {}  # Product attributes
-    sizes: List[str] = []  # Will be populated from database string
+    sizes: List[str] = []  # Read as a list from the text[] / JSON array column
     available_sizes: List[str] = []  # Structured sizes from JSON
     available_colors: List[str] = []  # Structured colors from JSON
     is_active: bool
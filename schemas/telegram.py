@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional, List
+from typing import Optional, List, Dict, Any
 from datetime import datetime, date
 import json
 
@@ -80,7 +80,7 @@ class TelegramMessageOut(BaseModel):
     user_id: int
     direction: str  # "in" or "out"
     text: str
-    payload_json: Optional[str]
+    payload_json: Optional[Any]
     created_at: datetime
     
     class Config:
@@ -127,7 +127,7 @@ class SalesReportOut(BaseModel):
     period: str
     start_date: date
     end_date: date
-    totals_json: str
+    totals_json: Dict[str, Any]
     generated_at: datetime
     
     class Config:
@@ -81,15 +81,12 @@ def seed_products():
         # Prepare products for insertion
         products_to_add = []
         for product_data in TEST_PRODUCTS:
-            # Convert sizes list to comma-separated string
-            sizes_str = ",".join(product_data["sizes"])
-            
             # Create Product object
             product = Product(
                 name=product_data["name"],
                 description=product_data["description"],
                 price=product_data["price"],
-                sizes=sizes_str,
+                sizes=product_data["sizes"],
                 stock=product_data["stock"],
                 image_url=None  # No image URL for test products
             )
@@ -105,7 +102,7 @@ def seed_products():
         print("\n📦 Added Products:")
         print("=" * 60)
         for i, product in enumerate(products_to_add, 1):
-            sizes_list = product.sizes.split(",") if product.sizes else []
+            sizes_list = product.sizes or []
             print(f"{i}. {product.name}")
             print(f"   Price: ${product.price:.2f}")
             print(f"   Sizes: {', '.join(sizes_list)}")
@@ -134,7 +131,7 @@ def verify_seeding():
             sample_products = db.query(Product).limit(3).all()
             
             for product in sample_products:
-                sizes_list = product.sizes.split(",") if product.sizes else []
+                sizes_list = product.sizes or []
                 print(f"• {product.name}")
                 print(f"  Price: ${product.price:.2f}")
                 print(f"  Sizes: {', '.join(sizes_list)}")
@@ -3,12 +3,12 @@ from .category_service import create_category, list_categories, get_category_by_
 from .product_service import create_product, update_product, get_product, list_products, to_product_out
 from .import_service import (
     detect_file_type, read_table, normalize_columns, validate_rows,
-    get_validation_summary, create_product_payload
+    get_validation_summary, create_product_payload, bulk_insert_products
 )
 
 __all__ = [
     'create_category', 'list_categories', 'get_category_by_id', 'get_category_by_name', 'update_category',
     'create_product', 'update_product', 'get_product', 'list_products', 'to_product_out',
     'detect_file_type', 'read_table', 'normalize_columns', 'validate_rows',
-    'get_validation_summary', 'create_product_payload'
+    'get_validation_summary', 'create_product_payload', 'bulk_insert_products'
 ]
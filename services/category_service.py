@@ -6,6 +6,7 @@ from typing import List
 from models import Category
 from schemas.category import CategoryCreate, CategoryOut, CategoryUpdate
 from utils.category_prefix import assign_next_category_prefix
+from utils.ttl_cache import cache
 
 
 def create_category(db: Session, name: str) -> CategoryOut:
@@ -38,6 +39,8 @@ def create_category(db: Session, name: str) -> CategoryOut:
         category = Category(name=name, prefix=prefix)
         db.add(category)
         db.commit()
+        # Product responses and the category summary carry category names
+        cache.invalidate("products:")
         db.refresh(category)
         
         return CategoryOut.from_orm(category)
@@ -145,6 +148,8 @@ def update_category(db: Session, category_id: int, name: str) -> CategoryOut:
         # Update category name
         category.name = name
         db.commit()
+        # Product responses and the category summary carry category names
+        cache.invalidate("products:")
         db.refresh(category)
         
         return CategoryOut.from_orm(category)
@@ -205,6 +210,8 @@ def update_category_with_prefix(db: Session, category_id: int, category_update:
             category.prefix = category_update.prefix
         
         db.commit()
+        # Product responses and the category summary carry category names
+        cache.invalidate("products:")
         db.refresh(category)
         
         return CategoryOut.from_orm(category)
@@ -1,4 +1,4 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 from sqlalchemy import func, desc, or_
 from typing import List, Dict, Any, Optional
 from models import Customer, Order, OrderItem, Product
@@ -239,6 +239,26 @@ def get_crm_overview(db: Session) -> Dict[str, Any]:
         "top_customer": top_customer
     }
 
+def _order_items_payload(order: Order) -> List[Dict[str, Any]]:
+    """Build item dicts from an order whose items and products were eager-loaded."""
+    items = []
+    for item in order.items:
+        product = item.product
+        if product is None:
+            continue
+        items.append({
+            "id": item.id,
+            "product_id": product.id,
+            "product_name": product.name,
+            "product_code": product.code,
+            "quantity": item.quantity,
+            "unit_price": float(item.unit_price),
+            "total_price": float(item.quantity * item.unit_price),
+            "variant_size": item.variant_size,
+            "variant_color": item.variant_color
+        })
+    return items
+
 def get_customer_purchase_history(
     db: Session, 
     customer_id: int, 
@@ -268,38 +288,25 @@ def get_customer_purchase_history(
     total_orders = orders_query.count()
     
     # Get paginated orders
-    orders = orders_query.order_by(desc(Order.created_at)).offset(offset).limit(limit).all()
+    orders = (
+        orders_query
+        .options(selectinload(Order.items).selectinload(OrderItem.product))
+        .order_by(desc(Order.created_at))
+        .offset(offset)
+        .limit(limit)
+        .all()
+    )
     
     # Get detailed order information with items
     detailed_orders = []
     for order in orders:
-        # Get order items with product details
-        order_items = (
-            db.query(OrderItem, Product)
-            .join(Product, OrderItem.product_id == Product.id)
-            .filter(OrderItem.order_id == order.id)
-            .all()
-        )
-        
-        items = []
-        for item, product in order_items:
-            items.append({
-                "id": item.id,
-                "product_id": product.id,
-                "product_name": product.name,
-                "product_code": product.code,
-                "quantity": item.quantity,
-                "unit_price": float(item.unit_price),
-                "total_price": float(item.quantity * item.unit_price),
-                "variant_size": item.variant_size,
-                "variant_color": item.variant_color
-            })
+        items = _order_items_payload(order)
         
         detailed_orders.append({
             "id": order.id,
             "order_number": order.order_number,
             "order_code": order.order_code,
-            "status": order.status.value if order.status else "unknown",
+            "status": order.status or "unknown",
             "total_amount": float(order.final_amount),
             "created_at": order.created_at.isoformat(),
             "customer_name": order.customer_name,
@@ -348,38 +355,25 @@ def search_customer_orders(
     total_orders = orders_query.count()
     
     # Get paginated orders
-    orders = orders_query.order_by(desc(Order.created_at)).offset(offset).limit(limit).all()
+    orders = (
+        orders_query
+        .options(selectinload(Order.items).selectinload(OrderItem.product))
+        .order_by(desc(Order.created_at))
+        .offset(offset)
+        .limit(limit)
+        .all()
+    )
     
     # Get detailed order information
     detailed_orders = []
     for order in orders:
-        # Get order items with product details
-        order_items = (
-            db.query(OrderItem, Product)
-            .join(Product, OrderItem.product_id == Product.id)
-            .filter(OrderItem.order_id == order.id)
-            .all()
-        )
-        
-        items = []
-        for item, product in order_items:
-            items.append({
-                "id": item.id,
-                "product_id": product.id,
-                "product_name": product.name,
-                "product_code": product.code,
-                "quantity": item.quantity,
-                "unit_price": float(item.unit_price),
-                "total_price": float(item.quantity * item.unit_price),
-                "variant_size": item.variant_size,
-                "variant_color": item.variant_color
-            })
+        items = _order_items_payload(order)
         
         detailed_orders.append({
             "id": order.id,
             "order_number": order.order_number,
             "order_code": order.order_code,
-            "status": order.status.value if order.status else "unknown",
+            "status": order.status or "unknown",
             "total_amount": float(order.final_amount),
             "created_at": order.created_at.isoformat(),
             "customer_name": order.customer_name,
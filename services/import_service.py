@@ -5,10 +5,17 @@ Provides validation, parsing, and data normalization functions.
 
 import pandas as pd
 import io
+import csv
 from typing import List, Dict, Any, Optional, Tuple
 from fastapi import UploadFile, HTTPException, status
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
 import logging
 
+from models import Product
+from schemas.product import ProductCreate
+from utils.product_code import generate_code_for_category, parse_product_code
+
 logger = logging.getLogger(__name__)
 
 # File size limit: 5 MB
@@ -129,7 +136,7 @@ def read_table(file: UploadFile) -> pd.DataFrame:
                 detail="Data processing not available. Please install: pip install pandas"
             )
         else:
-            logger.error(f"Error reading file: {e}")
+            logger.error("Error reading file: %s", e)
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Error reading file: {str(e)}"
@@ -285,3 +292,66 @@ def create_product_payload(row_data: Dict[str, Any], category_id: int) -> Dict[s
         "tags": row_data["tags"],
         "is_active": row_data["is_active"]
     }
+
+
+# Columns written by bulk imports; created_at/updated_at come from the server defaults
+BULK_PRODUCT_COLUMNS = [
+    "name", "description", "price", "stock", "low_stock_threshold", "code",
+    "category_id", "image_url", "thumbnail_url", "tags", "is_active"
+]
+
+
+def bulk_insert_products(db: Session, category_id: int, payloads: List[ProductCreate]) -> List[str]:
+    """
+    Insert many products in one statement and return their generated codes.
+
+    Codes are allocated as one consecutive block for the category. On PostgreSQL
+    the rows are streamed with COPY FROM STDIN on the session's own connection;
+    other databases get a single executemany. The caller commits.
+    """
+    if not payloads:
+        return []
+
+    first = parse_product_code(generate_code_for_category(db, category_id))
+    if not first:
+        raise ValueError(f"Could not allocate product codes for category {category_id}")
+
+    rows = []
+    for offset, payload in enumerate(payloads):
+        rows.append({
+            "name": payload.name,
+            "description": payload.description,
+            "price": payload.price,
+            "stock": payload.stock,
+            "low_stock_threshold": payload.low_stock_threshold or 5,
+            "code": f"{first['prefix']}{first['number'] + offset:04d}",
+            "category_id": category_id,
+            "image_url": payload.image_url,
+            "thumbnail_url": payload.thumbnail_url,
+            "tags": payload.tags,
+            "is_active": payload.is_active,
+        })
+
+    if db.get_bind().dialect.name == "postgresql":
+        _copy_products(db, rows)
+    else:
+        db.execute(insert(Product), rows)
+
+    logger.info("Bulk inserted %s products into category %s", len(rows), category_id)
+    return [row["code"] for row in rows]
+
+
+def _copy_products(db: Session, rows: List[Dict[str, Any]]) -> None:
+    """Stream rows into products via COPY; unquoted empty fields load as NULL."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow([row[col] for col in BULK_PRODUCT_COLUMNS])
+    buffer.seek(0)
+
+    sql = f"COPY products ({', '.join(BULK_PRODUCT_COLUMNS)}) FROM STDIN WITH (FORMAT csv)"
+    cursor = db.connection().connection.cursor()
+    try:
+        cursor.copy_expert(sql, buffer)
+    finally:
+        cursor.close()
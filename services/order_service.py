@@ -1,15 +1,26 @@
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session, joinedload, selectinload, undefer, undefer_group
+from sqlalchemy import select, insert, lambda_stmt, inspect
 from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException, status
 from typing import List, Optional, Literal
 from datetime import datetime
 import uuid
-from decimal import Decimal
 
 from models import Order, OrderItem, Product, ProductVariant, OrderStatus, PaymentStatus, Customer
 from schemas.order import OrderDraftIn, OrderDraftByCodeIn, OrderDraftBySkuIn, OrderConfirmIn, OrderUpdateStatusIn, OrderOut, OrderItemOut
 from services.product_service import get_product, get_product_by_code
 from utils.business_codes import resolve_customer_reference, resolve_order_reference, ensure_order_code, ensure_customer_code
+from utils.ttl_cache import cache
+
+
+def _load_order_with_items(db: Session, order_id: int) -> Optional[Order]:
+    """Load an order with its items via a lambda statement so the compiled SQL is reused."""
+    stmt = lambda_stmt(lambda: select(Order).options(
+        joinedload(Order.items).undefer_group("snapshot"),
+        undefer_group("snapshot"),
+    ))
+    stmt += lambda s: s.where(Order.id == order_id)
+    return db.execute(stmt).unique().scalar_one_or_none()
 
 
 def generate_order_number() -> str:
@@ -44,9 +55,9 @@ def create_order(db: Session, *, code: str, qty: int, attributes: dict = None, c
     
     # Use variant price if available, otherwise use product price
     if variant and variant.price_override is not None:
-        unit_price = Decimal(variant.price_override)
+        unit_price = variant.price_override
     else:
-        unit_price = Decimal(product.price or 0)
+        unit_price = product.price or 0.0
     
     total = unit_price * q
 
@@ -85,7 +96,7 @@ def create_order(db: Session, *, code: str, qty: int, attributes: dict = None, c
         # Variant information
         sku_code=variant.sku_code if variant else None,
         variant_attributes_snapshot=variant.attributes if variant else attributes,
-        unit_price_snapshot=float(unit_price),
+        unit_price_snapshot=unit_price,
         # Legacy variant fields
         variant_size=variant.attributes.get("size", "") if variant and variant.attributes else attributes.get("size", "") if attributes else "",
         variant_color=variant.attributes.get("color", "") if variant and variant.attributes else attributes.get("color", "") if attributes else "",
@@ -96,6 +107,7 @@ def create_order(db: Session, *, code: str, qty: int, attributes: dict = None, c
     
     db.add(order_item)
     db.commit()
+    cache.invalidate("orders:")
     db.refresh(order)
     
     return order
@@ -145,6 +157,8 @@ def cancel_order(db: Session, order_id: int, reason: str = "") -> dict:
     order.admin_notes = f"Cancelled: {reason}" if reason else "Cancelled by user"
     
     db.commit()
+    # Stock was restored, so cached product listings are stale along with the order stats
+    cache.invalidate("products:", "orders:")
     db.refresh(order)
     
     return {"order_id": order_id, "status": "cancelled", "reason": reason}
@@ -280,7 +294,8 @@ def validate_status_transition(current_status: OrderStatus, new_status: OrderSta
         OrderStatus.CANCELLED: []  # Cancelled orders cannot change status
     }
     
-    return new_status in valid_transitions.get(current_status, [])
+    # Loaded rows hold plain strings; Enum hashes by member name, so normalize before lookup
+    return new_status in valid_transitions.get(OrderStatus(current_status), [])
 
 
 def create_draft(db: Session, payload: OrderDraftIn) -> OrderOut:
@@ -374,7 +389,9 @@ def create_draft(db: Session, payload: OrderDraftIn) -> OrderOut:
         status=OrderStatus.DRAFT,
         payment_status=PaymentStatus.PENDING,
         customer_notes=payload.note,
-        customer_snapshot=customer_snapshot
+        customer_snapshot=customer_snapshot,
+        # Items are bulk-inserted below, which bypasses the flush-time totals sync
+        items_count=sum(item_data['quantity'] for item_data in items_data)
     )
     
     db.add(order)
@@ -384,15 +401,11 @@ def create_draft(db: Session, payload: OrderDraftIn) -> OrderOut:
     # Ensure order has a code
     ensure_order_code(db, order)
     
-    # Create order items
-    for item_data in items_data:
-        order_item = OrderItem(
-            order_id=order.id,
-            **item_data
-        )
-        db.add(order_item)
+    # Create order items with a single multi-row INSERT
+    db.execute(insert(OrderItem), [{'order_id': order.id, **item_data} for item_data in items_data])
     
     db.commit()
+    cache.invalidate("orders:")
     db.refresh(order)
     
     return to_order_out(order)
@@ -508,7 +521,9 @@ def create_draft_by_codes(db: Session, payload: OrderDraftByCodeIn) -> OrderOut:
         status=OrderStatus.DRAFT,
         payment_status=PaymentStatus.PENDING,
         customer_notes=payload.note,
-        customer_snapshot=customer_snapshot
+        customer_snapshot=customer_snapshot,
+        # Items are bulk-inserted below, which bypasses the flush-time totals sync
+        items_count=sum(item_data['quantity'] for item_data in items_data)
     )
     
     db.add(order)
@@ -518,15 +533,11 @@ def create_draft_by_codes(db: Session, payload: OrderDraftByCodeIn) -> OrderOut:
     # Ensure order has a code
     ensure_order_code(db, order)
     
-    # Create order items
-    for item_data in items_data:
-        order_item = OrderItem(
-            order_id=order.id,
-            **item_data
-        )
-        db.add(order_item)
+    # Create order items with a single multi-row INSERT
+    db.execute(insert(OrderItem), [{'order_id': order.id, **item_data} for item_data in items_data])
     
     db.commit()
+    cache.invalidate("orders:")
     db.refresh(order)
     
     return to_order_out(order)
@@ -632,7 +643,9 @@ def create_draft_by_skus(db: Session, payload: OrderDraftBySkuIn) -> OrderOut:
         status=OrderStatus.DRAFT,
         payment_status=PaymentStatus.PENDING,
         customer_notes=payload.note,
-        customer_snapshot=customer_snapshot
+        customer_snapshot=customer_snapshot,
+        # Items are bulk-inserted below, which bypasses the flush-time totals sync
+        items_count=sum(item_data['quantity'] for item_data in items_data)
     )
     
     db.add(order)
@@ -642,16 +655,11 @@ def create_draft_by_skus(db: Session, payload: OrderDraftBySkuIn) -> OrderOut:
     # Ensure order has a code
     ensure_order_code(db, order)
     
-    # Create order items (stock will be consumed when order status changes to "sold")
-    for item_data in items_data:
-        # Create order item
-        order_item = OrderItem(
-            order_id=order.id,
-            **item_data
-        )
-        db.add(order_item)
+    # Create order items with a single multi-row INSERT
+    db.execute(insert(OrderItem), [{'order_id': order.id, **item_data} for item_data in items_data])
     
     db.commit()
+    cache.invalidate("orders:")
     db.refresh(order)
     
     return to_order_out(order)
@@ -689,6 +697,7 @@ def confirm_order(db: Session, order_id: int) -> OrderOut:
     order.confirmed_at = datetime.utcnow()
     
     db.commit()
+    cache.invalidate("orders:")
     db.refresh(order)
     
     return to_order_out(order)
@@ -773,6 +782,8 @@ def update_status(db: Session, order_id: int, new_status: str) -> OrderOut:
         order.shipped_at = datetime.utcnow()
     
     db.commit()
+    # Selling or cancelling a sold order moves stock; drop cached product listings and order stats
+    cache.invalidate("products:", "orders:")
     db.refresh(order)
     
     return to_order_out(order)
@@ -792,9 +803,7 @@ def get_order(db: Session, order_id: int) -> OrderOut:
     Raises:
         HTTPException: If order not found
     """
-    order = db.query(Order).options(
-        joinedload(Order.items)
-    ).filter(Order.id == order_id).first()
+    order = _load_order_with_items(db, order_id)
     
     if not order:
         raise HTTPException(
@@ -820,7 +829,8 @@ def get_order_by_code(db: Session, order_code: str) -> OrderOut:
         HTTPException: If order not found
     """
     order = db.query(Order).options(
-        joinedload(Order.items)
+        joinedload(Order.items).undefer_group("snapshot"),
+        undefer_group("snapshot")
     ).filter(Order.order_code == order_code).first()
     
     if not order:
@@ -855,9 +865,7 @@ def get_order_by_reference(db: Session, ref: str) -> OrderOut:
         )
     
     # Reload with items
-    order = db.query(Order).options(
-        joinedload(Order.items)
-    ).filter(Order.id == order.id).first()
+    order = _load_order_with_items(db, order.id)
     
     return to_order_out(order)
 
@@ -877,7 +885,9 @@ def list_orders(db: Session, status: Optional[OrderStatus] = None,
         List[OrderOut]: List of orders
         int: Total count
     """
-    query = db.query(Order).options(joinedload(Order.items))
+    # selectinload keeps LIMIT/OFFSET on the orders table and loads all items in one IN query.
+    # Of the deferred "snapshot" columns only customer_snapshot is shown in the order list.
+    query = db.query(Order).options(selectinload(Order.items), undefer(Order.customer_snapshot))
     
     if status:
         query = query.filter(Order.status == status)
@@ -889,13 +899,22 @@ def list_orders(db: Session, status: Optional[OrderStatus] = None,
     orders = query.order_by(Order.created_at.desc()).offset(offset).limit(limit).all()
     
     # Convert to OrderOut
-    order_outs = [to_order_out(order) for order in orders]
+    order_outs = [to_order_out(order, load_deferred=False) for order in orders]
     
     return order_outs, total_count
 
 
-def to_order_out(order: Order) -> OrderOut:
-    """Convert Order model to OrderOut schema."""
+def to_order_out(order: Order, load_deferred: bool = True) -> OrderOut:
+    """Convert Order model to OrderOut schema.
+    
+    With load_deferred=False, deferred columns that were not loaded by the query
+    are returned as None instead of being fetched one row at a time.
+    """
+    def deferred_attr(obj, name):
+        if not load_deferred and name in inspect(obj).unloaded:
+            return None
+        return getattr(obj, name, None)
+    
     # Convert order items
     items = []
     for item in order.items:
@@ -909,7 +928,7 @@ def to_order_out(order: Order) -> OrderOut:
             product_image_url=getattr(item, 'product_image_url', None),
             # New variant fields
             sku_code=getattr(item, 'sku_code', None),
-            variant_attributes_snapshot=getattr(item, 'variant_attributes_snapshot', None),
+            variant_attributes_snapshot=deferred_attr(item, 'variant_attributes_snapshot'),
             unit_price_snapshot=getattr(item, 'unit_price_snapshot', None),
             # Legacy variant fields
             variant_size=getattr(item, 'variant_size', None),
@@ -952,9 +971,9 @@ def to_order_out(order: Order) -> OrderOut:
         confirmed_at=getattr(order, 'confirmed_at', None),
         shipped_at=getattr(order, 'shipped_at', None),
         delivered_at=getattr(order, 'delivered_at', None),
-        admin_notes=getattr(order, 'admin_notes', None),
-        customer_notes=getattr(order, 'customer_notes', None),
-        customer_snapshot=getattr(order, 'customer_snapshot', None),
+        admin_notes=deferred_attr(order, 'admin_notes'),
+        customer_notes=deferred_attr(order, 'customer_notes'),
+        customer_snapshot=deferred_attr(order, 'customer_snapshot'),
         items_count=sum(item.quantity for item in items),
         items=items
     ) 
\ No newline at end of file
@@ -1,9 +1,8 @@
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import or_, func
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy import or_, func, select, lambda_stmt
 from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException, status
 from typing import List, Optional
-import json
 import logging
 
 from models import Product, Category, ProductVariant
@@ -11,11 +10,14 @@ from schemas.product import ProductCreate, ProductUpdate, ProductOut, ProductSea
 from utils.product_code import generate_code_for_category
 from utils.normalization import clean_labels, clean_attributes, extract_product_code, extract_attributes_from_query
 from services.category_service import get_category_by_id
+from utils.ttl_cache import cache
 
 
 def get_product_by_code(db: Session, code: str) -> Optional[Product]:
     """Get product by code."""
-    return db.query(Product).filter(Product.code == code).first()
+    # Hot path for chat/order lookups; lambda_stmt reuses the compiled SELECT
+    stmt = lambda_stmt(lambda: select(Product).where(Product.code == code))
+    return db.execute(stmt).scalars().first()
 
 def get_by_code(db: Session, code: str) -> Optional[Product]:
     """Alias for get_product_by_code for compatibility."""
@@ -59,21 +61,9 @@ def get_product_details(db: Session, product_id: int) -> Optional[ProductDetails
     if product.image_url:
         images.append(product.image_url)
     
-    # Parse structured attributes
-    available_sizes = []
-    available_colors = []
-    
-    if product.available_sizes_json:
-        try:
-            available_sizes = json.loads(product.available_sizes_json)
-        except (json.JSONDecodeError, TypeError):
-            available_sizes = []
-    
-    if product.available_colors_json:
-        try:
-            available_colors = json.loads(product.available_colors_json)
-        except (json.JSONDecodeError, TypeError):
-            available_colors = []
+    # Structured attributes come back already decoded from the JSON columns
+    available_sizes = product.available_sizes_json or []
+    available_colors = product.available_colors_json or []
     
     return ProductDetails(
         id=product.id,
@@ -99,7 +89,11 @@ def get_product_details(db: Session, product_id: int) -> Optional[ProductDetails
 def search_products_by_name(db: Session, query: str, limit: int = 20) -> List[ProductSearchResult]:
     """Search products by name, code, or description."""
     search_term = f"%{query}%"
-    products = db.query(Product).options(joinedload(Product.category)).filter(
+    # Only the result columns, with the category name joined in as a plain string
+    rows = db.query(
+        Product.id, Product.code, Product.name, Product.price, Product.stock,
+        Product.thumbnail_url, Category.name.label("category_name")
+    ).outerjoin(Category, Product.category_id == Category.id).filter(
         or_(
             Product.name.ilike(search_term),
             Product.code.ilike(search_term),
@@ -109,21 +103,21 @@ def search_products_by_name(db: Session, query: str, limit: int = 20) -> List[Pr
     
     return [
         ProductSearchResult(
-            id=product.id,
-            code=product.code,
-            name=product.name,
-            price=product.price,
-            total_stock=product.stock,
-            category_name=product.category.name if product.category else "",
-            thumbnail_url=product.thumbnail_url
+            id=row.id,
+            code=row.code,
+            name=row.name,
+            price=row.price,
+            total_stock=row.stock,
+            category_name=row.category_name or "",
+            thumbnail_url=row.thumbnail_url
         )
-        for product in products
+        for row in rows
     ]
 
 def search_products(db: Session, q: Optional[str] = None, code: Optional[str] = None, 
                    category_id: Optional[int] = None, limit: int = 5) -> List[Product]:
     """Robust search function that handles different search modes."""
-    query = db.query(Product).options(joinedload(Product.category))
+    query = db.query(Product)
     
     # Code-first search
     if code:
@@ -180,19 +174,10 @@ def create_product(db: Session, payload: ProductCreate) -> ProductOut:
             code = generate_code_for_category(db, payload.category_id)
             
             # Prepare structured attributes
-            available_sizes_json = None
-            available_colors_json = None
-            labels_json = None
-            attributes_json = None
-            
-            if payload.available_sizes:
-                available_sizes_json = json.dumps(payload.available_sizes)
-            if payload.available_colors:
-                available_colors_json = json.dumps(payload.available_colors)
-            if payload.labels:
-                labels_json = json.dumps(clean_labels(payload.labels))
-            if payload.attributes:
-                attributes_json = json.dumps(clean_attributes(payload.attributes))
+            available_sizes_json = payload.available_sizes or None
+            available_colors_json = payload.available_colors or None
+            labels_json = clean_labels(payload.labels) if payload.labels else None
+            attributes_json = clean_attributes(payload.attributes) if payload.attributes else None
             
             # Create product
             product = Product(
@@ -205,7 +190,7 @@ def create_product(db: Session, payload: ProductCreate) -> ProductOut:
                 category_id=payload.category_id,
                 image_url=payload.image_url,
                 thumbnail_url=payload.thumbnail_url,
-                sizes=','.join(payload.sizes) if payload.sizes else None,
+                sizes=payload.sizes or None,
                 available_sizes_json=available_sizes_json,
                 available_colors_json=available_colors_json,
                 labels_json=labels_json,
@@ -217,6 +202,7 @@ def create_product(db: Session, payload: ProductCreate) -> ProductOut:
             db.add(product)
             db.commit()
             db.refresh(product)
+            cache.invalidate("products:")
             
             return to_product_out(product)
             
@@ -285,26 +271,22 @@ def update_product(db: Session, product_id: int, payload: ProductUpdate) -> Prod
     # Update fields
     update_data = payload.dict(exclude_unset=True)
     
-    # Handle sizes field conversion (list to string)
-    if 'sizes' in update_data and update_data['sizes'] is not None:
-        update_data['sizes'] = ','.join(update_data['sizes'])
-    
     # Handle structured attributes
     if 'available_sizes' in update_data and update_data['available_sizes'] is not None:
-        update_data['available_sizes_json'] = json.dumps(update_data['available_sizes'])
+        update_data['available_sizes_json'] = update_data['available_sizes']
         del update_data['available_sizes']
     
     if 'available_colors' in update_data and update_data['available_colors'] is not None:
-        update_data['available_colors_json'] = json.dumps(update_data['available_colors'])
+        update_data['available_colors_json'] = update_data['available_colors']
         del update_data['available_colors']
     
     # Handle new fields
     if 'labels' in update_data and update_data['labels'] is not None:
-        update_data['labels_json'] = json.dumps(clean_labels(update_data['labels']))
+        update_data['labels_json'] = clean_labels(update_data['labels'])
         del update_data['labels']
     
     if 'attributes' in update_data and update_data['attributes'] is not None:
-        update_data['attributes_json'] = json.dumps(clean_attributes(update_data['attributes']))
+        update_data['attributes_json'] = clean_attributes(update_data['attributes'])
         del update_data['attributes']
     
     for field, value in update_data.items():
@@ -313,6 +295,7 @@ def update_product(db: Session, product_id: int, payload: ProductUpdate) -> Prod
     try:
         db.commit()
         db.refresh(product)
+        cache.invalidate("products:")
         return to_product_out(product)
     except IntegrityError as e:
         db.rollback()
@@ -384,17 +367,22 @@ def list_products(
     Returns:
         List[ProductOut]: List of products
     """
+    # Variants come in one WHERE product_id IN (...) query per page; joining the collection
+    # would repeat each product row once per variant and force a LIMIT subquery wrapper
     query = db.query(Product).options(
-        joinedload(Product.category),
-        joinedload(Product.variants)
+        selectinload(Product.category),
+        selectinload(Product.variants)
     )
     
     # Apply filters
     if category_id is not None:
         query = query.filter(Product.category_id == category_id)
     
-    if is_active is not None:
-        query = query.filter(Product.is_active == is_active)
+    if is_active:
+        # Literal predicate so the planner can use the partial ix_products_active_category
+        query = query.filter(Product.is_active == True)
+    elif is_active is not None:
+        query = query.filter(Product.is_active == False)
     
     if in_stock_only:
         # Check both product stock and variant stock
@@ -462,6 +450,10 @@ def list_products(
 
 def to_product_out(product: Product) -> ProductOut:
     """Convert Product model to ProductOut schema."""
+    # Values come straight from the ORM with the column types already decoded,
+    # so the schemas are built with model_construct and skip per-field validation
+    # (this runs once per row in list responses)
+    
     # Calculate total stock
     total_stock = product.stock
     if product.variants:
@@ -470,7 +462,7 @@ def to_product_out(product: Product) -> ProductOut:
     # Prepare variants
     variants = []
     for variant in product.variants:
-        variants.append(VariantOut(
+        variants.append(VariantOut.model_construct(
             id=variant.id,
             product_id=variant.product_id,
             size=variant.size,
@@ -482,42 +474,16 @@ def to_product_out(product: Product) -> ProductOut:
             updated_at=variant.updated_at
         ))
     
-    # Process sizes field (legacy)
-    sizes = []
-    if product.sizes:
-        sizes = [s.strip() for s in product.sizes.split(',') if s.strip()]
-    
-    # Process structured attributes
-    available_sizes = []
-    available_colors = []
-    labels = []
-    attributes = {}
+    # Legacy sizes field comes back as a list from the array column
+    sizes = product.sizes or []
     
-    if product.available_sizes_json:
-        try:
-            available_sizes = json.loads(product.available_sizes_json)
-        except (json.JSONDecodeError, TypeError):
-            available_sizes = []
-    
-    if product.available_colors_json:
-        try:
-            available_colors = json.loads(product.available_colors_json)
-        except (json.JSONDecodeError, TypeError):
-            available_colors = []
-    
-    if product.labels_json:
-        try:
-            labels = json.loads(product.labels_json)
-        except (json.JSONDecodeError, TypeError):
-            labels = []
-    
-    if product.attributes_json:
-        try:
-            attributes = json.loads(product.attributes_json)
-        except (json.JSONDecodeError, TypeError):
-            attributes = {}
+    # Structured attributes come back already decoded from the JSON columns
+    available_sizes = product.available_sizes_json or []
+    available_colors = product.available_colors_json or []
+    labels = product.labels_json or []
+    attributes = product.attributes_json or {}
     
-    return ProductOut(
+    return ProductOut.model_construct(
         id=product.id,
         code=product.code,
         name=product.name,
@@ -1,8 +1,7 @@
 import logging
-import json
 from typing import List, Optional, Dict, Any
 from datetime import datetime, date, timedelta
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, undefer
 from sqlalchemy import and_, func, desc
 
 from models import SalesReport
@@ -88,7 +87,7 @@ class ReportsService:
         
         return start_date, end_date
     
-    def _generate_report_data(self, start_date: date, end_date: date) -> str:
+    def _generate_report_data(self, start_date: date, end_date: date) -> Dict[str, Any]:
         """Generate the actual report data"""
         try:
             # Convert dates to datetime for database query
@@ -192,16 +191,16 @@ class ReportsService:
                 }
             }
             
-            return json.dumps(report_data, ensure_ascii=False, indent=2)
+            return report_data
             
         except Exception as e:
             logger.error(f"Error generating report data: {e}")
-            return json.dumps({'error': str(e)})
+            return {'error': str(e)}
     
     def get_latest_report(self, period: str) -> Optional[SalesReport]:
         """Get the latest report for the specified period"""
         try:
-            report = self.db.query(SalesReport).filter(
+            report = self.db.query(SalesReport).options(undefer(SalesReport.totals_json)).filter(
                 SalesReport.period == period
             ).order_by(desc(SalesReport.generated_at)).first()
             
@@ -230,16 +229,11 @@ class ReportsService:
     def get_report_summary(self, report_id: int) -> Optional[Dict[str, Any]]:
         """Get a formatted summary of a report"""
         try:
-            report = self.db.query(SalesReport).filter(SalesReport.id == report_id).first()
+            report = self.db.query(SalesReport).options(undefer(SalesReport.totals_json)).filter(SalesReport.id == report_id).first()
             if not report:
                 return None
             
-            # Parse the JSON data
-            try:
-                data = json.loads(report.totals_json)
-            except json.JSONDecodeError:
-                logger.error(f"Invalid JSON in report {report_id}")
-                return None
+            data = report.totals_json or {}
             
             # Format the summary
             summary = {
@@ -265,16 +259,11 @@ class ReportsService:
     def generate_csv(self, report_id: int) -> Optional[str]:
         """Generate CSV content for a report"""
         try:
-            report = self.db.query(SalesReport).filter(SalesReport.id == report_id).first()
+            report = self.db.query(SalesReport).options(undefer(SalesReport.totals_json)).filter(SalesReport.id == report_id).first()
             if not report:
                 return None
             
-            # Parse the JSON data
-            try:
-                data = json.loads(report.totals_json)
-            except json.JSONDecodeError:
-                logger.error(f"Invalid JSON in report {report_id}")
-                return None
+            data = report.totals_json or {}
             
             # Generate CSV content
             csv_lines = []
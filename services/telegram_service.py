@@ -1,5 +1,4 @@
 import logging
-import json
 import httpx
 from datetime import datetime, timedelta
 from typing import Optional, List, Tuple
@@ -14,6 +13,30 @@ from services.product_service import search_products_by_name, get_product_by_cod
 logger = logging.getLogger(__name__)
 
 
+def get_current_config(db: Session, bot_token: Optional[str] = None) -> Optional[TelegramConfig]:
+    """Config row a settings write targets.
+    
+    With a bot_token, the row of that bot (None if it isn't stored yet); otherwise
+    the active bot, falling back to the newest row.
+    """
+    if bot_token:
+        return db.query(TelegramConfig).filter(TelegramConfig.bot_token == bot_token).first()
+    active = db.query(TelegramConfig).filter(TelegramConfig.is_active == True).first()
+    return active or db.query(TelegramConfig).order_by(TelegramConfig.id.desc()).first()
+
+
+def deactivate_other_configs(db: Session, keep_id: Optional[int]) -> None:
+    """Deactivate every active bot except keep_id, before a row is made active.
+    
+    Only one row may be active (ix_telegram_configs_active); run this before adding or
+    changing the row to activate so the UPDATE isn't preceded by a conflicting flush.
+    """
+    others = db.query(TelegramConfig).filter(TelegramConfig.is_active == True)
+    if keep_id is not None:
+        others = others.filter(TelegramConfig.id != keep_id)
+    others.update({TelegramConfig.is_active: False}, synchronize_session=False)
+
+
 class TelegramService:
     def __init__(self, db: Session):
         self.db = db
@@ -74,7 +97,7 @@ class TelegramService:
             user_id=user.id,
             direction=direction,
             text=text,
-            payload_json=json.dumps(payload) if payload else None
+            payload_json=payload
         )
         self.db.add(message)
         self.db.commit()
@@ -256,20 +279,14 @@ class TelegramService:
             colors = []
             
             if hasattr(product, 'available_sizes_json') and product.available_sizes_json:
-                try:
-                    sizes = json.loads(product.available_sizes_json)
-                except:
-                    pass
+                sizes = product.available_sizes_json
             
             if hasattr(product, 'available_colors_json') and product.available_colors_json:
-                try:
-                    colors = json.loads(product.available_colors_json)
-                except:
-                    pass
+                colors = product.available_colors_json
             
             # Fallback to legacy sizes field
             if not sizes and hasattr(product, 'sizes') and product.sizes:
-                sizes = product.sizes.split(',') if isinstance(product.sizes, str) else product.sizes
+                sizes = product.sizes
             
             text = f"📦 {product.name} (کد {product.code})\n\n"
             text += f"💰 قیمت: {product.price:,} تومان\n"
@@ -6,18 +6,9 @@ Handles product variants, SKU resolution, and inventory management
 from typing import List, Dict, Any, Optional, Tuple
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, or_
+from sqlalchemy.exc import IntegrityError
 from models import Product, ProductVariant
-import json
-import hashlib
-
-def generate_attributes_hash(attributes: Dict[str, Any]) -> str:
-    """Generate a deterministic hash for attributes"""
-    if not attributes:
-        return hashlib.sha1(b'{}').hexdigest()
-    
-    # Sort keys to ensure consistent hashing
-    sorted_attrs = json.dumps(attributes, sort_keys=True)
-    return hashlib.sha1(sorted_attrs.encode()).hexdigest()
+from utils.normalization import attributes_hash as generate_attributes_hash
 
 def list_variants(db: Session, product_code: str) -> List[Dict[str, Any]]:
     """List all variants for a product"""
@@ -204,39 +195,23 @@ def create_variant(db: Session, product_code: str, sku_code: str, attributes: Di
     if not product:
         return None
     
-    # Check if SKU already exists
-    existing_sku = db.query(ProductVariant).filter(
-        ProductVariant.sku_code == sku_code.upper()
-    ).first()
-    
-    if existing_sku:
-        return None
-    
-    # Check if variant with same attributes already exists
-    attributes_hash = generate_attributes_hash(attributes)
-    existing_variant = db.query(ProductVariant).filter(
-        and_(
-            ProductVariant.product_id == product.id,
-            ProductVariant.attributes_hash == attributes_hash
-        )
-    ).first()
-    
-    if existing_variant:
-        return None
-    
-    # Create the variant
+    # Unique SKU and (product_id, attributes_hash) indexes reject duplicates in the INSERT itself;
+    # attributes_hash is filled in by the model's before_insert hook
     variant = ProductVariant(
         sku_code=sku_code.upper(),
         product_id=product.id,
         attributes=attributes,
         price_override=price_override,
         stock_qty=stock_qty,
-        is_active=True,
-        attributes_hash=attributes_hash
+        is_active=True
     )
     
     db.add(variant)
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        return None
     db.refresh(variant)
     
     return {
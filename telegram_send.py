@@ -1,6 +1,6 @@
 import requests
 from sqlalchemy.orm import Session
-from models import BotConfig
+from models import TelegramConfig
 from backend.config import TELEGRAM_BOT_TOKEN as TELEGRAM_TOKEN
 
 def send_telegram_message(chat_id: int, text: str, db: Session = None) -> None:
@@ -11,7 +11,7 @@ def send_telegram_message(chat_id: int, text: str, db: Session = None) -> None:
     
     # Try to get bot token from database first
     if db:
-        bot_config = db.query(BotConfig).filter(BotConfig.is_active == True).first()
+        bot_config = db.query(TelegramConfig).filter(TelegramConfig.is_active == True).first()
         if bot_config:
             bot_token = bot_config.bot_token
     
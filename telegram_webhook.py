@@ -2,13 +2,12 @@ from fastapi import FastAPI, Request, Depends, HTTPException
 from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 from typing import Optional
-import json
 import re
 from datetime import datetime
 
 # Import our modules
 from database import get_db
-from models import User, Message, BotConfig, TelegramUser, TelegramMessage, Product, Order, OrderItem, FAQ
+from models import User, TelegramUser, TelegramMessage, Product, Order, OrderItem, FAQ
 from gpt_service import ask_gpt
 from receipt_handler import handle_receipt
 from fallback_logger import log_fallback
@@ -69,7 +68,7 @@ async def telegram_webhook(request: Request, db: Session = Depends(get_db)):
             user_id=telegram_user.id,
             direction="in",
             text=text or "",
-            payload_json=json.dumps(message_data)
+            payload_json=message_data
         )
         db.add(incoming_message)
         db.commit()
@@ -100,7 +99,7 @@ async def telegram_webhook(request: Request, db: Session = Depends(get_db)):
             user_id=telegram_user.id,
             direction="out",
             text=response,
-            payload_json=json.dumps({"response": response})
+            payload_json={"response": response}
         )
         db.add(outgoing_message)
         db.commit()
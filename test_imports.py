@@ -11,8 +11,8 @@ def test_imports():
         
         # Import all models explicitly
         from models import (
-            User, Message, ChatMessage, Order, OrderItem, 
-            Receipt, FallbackQuestion, BotConfig, Category, Product
+            User, ChatMessage, Order, OrderItem, 
+            Receipt, FallbackQuestion, TelegramConfig, Category, Product
         )
         print("✅ All models imported successfully")
         
@@ -20,8 +20,8 @@ def test_imports():
         print(f"📋 Base metadata tables: {list(Base.metadata.tables.keys())}")
         
         # Check if specific tables are registered
-        expected_tables = ['users', 'messages', 'chat_messages', 'orders', 'order_items', 
-                          'receipts', 'fallback_questions', 'bot_configs', 'categories', 'products']
+        expected_tables = ['users', 'chat_messages', 'orders', 'order_items', 
+                          'receipts', 'fallback_questions', 'telegram_configs', 'categories', 'products']
         
         for table in expected_tables:
             if table in Base.metadata.tables:
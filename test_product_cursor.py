@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Test keyset cursor pagination of the product list directly.
+"""
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException, Response
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from models import Base, Product, Category
+from product_handler import get_products, encode_cursor, decode_cursor
+
+
+def _seed_db():
+    """In-memory database with products that share prices, names and stock gaps."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    category = Category(name="Test", prefix="T")
+    db.add(category)
+    db.flush()
+    for i in range(11):
+        db.add(Product(
+            name=f"Product {i % 4}",
+            code=f"TST-{i:03d}",
+            price=100 + 10 * (i % 3),
+            stock=None if i % 3 == 0 else i,
+            category_id=category.id
+        ))
+    db.commit()
+    return db
+
+
+def _list(db, **params):
+    """Call get_products with FastAPI's defaults for every parameter not given."""
+    args = dict(
+        q=None, category_id=None, is_active=None, in_stock_only=None, min_price=None,
+        max_price=None, sort="created_at", order="desc", limit=None, offset=None,
+        page=None, page_size=None, cursor=None
+    )
+    args.update(params)
+    response = Response()
+    products = get_products(response=response, db=db, **args)
+    return products, response.headers.get("X-Next-Cursor")
+
+
+def test_cursor_round_trip():
+    """A cursor decodes back to the (sort value, id) it was built from."""
+    created_at = datetime(2024, 5, 1, 12, 30, 15, 123456)
+    cursor = encode_cursor(created_at, 42)
+    assert decode_cursor(cursor, Product.__table__.c.created_at) == (created_at, 42)
+
+    cursor = encode_cursor("Product 3", 7)
+    assert decode_cursor(cursor, Product.__table__.c.name) == ("Product 3", 7)
+
+    with pytest.raises(HTTPException) as exc:
+        decode_cursor("not-a-cursor", Product.__table__.c.name)
+    assert exc.value.status_code == 400
+
+
+@pytest.mark.parametrize("sort,order", [
+    ("created_at", "desc"), ("price", "asc"), ("price", "desc"), ("name", "asc"), ("code", "desc")
+])
+def test_cursor_pages_have_no_gaps_or_duplicates(sort, order):
+    """Following X-Next-Cursor visits every product exactly once, in offset order."""
+    db = _seed_db()
+    try:
+        expected, _ = _list(db, sort=sort, order=order, limit=100)
+
+        seen = []
+        products, cursor = _list(db, sort=sort, order=order, limit=3)
+        seen.extend(p.id for p in products)
+        while cursor:
+            products, cursor = _list(db, sort=sort, order=order, limit=3, cursor=cursor)
+            seen.extend(p.id for p in products)
+
+        assert seen == [p.id for p in expected]
+        assert len(seen) == len(set(seen)) == 11
+    finally:
+        db.close()
+
+
+def test_nullable_sort_rejects_cursor_and_pages_with_offset():
+    """stock is nullable: no cursor is offered, a sent one is a 400, offsets still work."""
+    db = _seed_db()
+    try:
+        first, cursor = _list(db, sort="stock", order="asc", limit=5)
+        assert cursor is None
+
+        with pytest.raises(HTTPException) as exc:
+            _list(db, sort="stock", order="asc", limit=5, cursor=encode_cursor(1, 1))
+        assert exc.value.status_code == 400
+
+        second, _ = _list(db, sort="stock", order="asc", limit=5, offset=5)
+        third, _ = _list(db, sort="stock", order="asc", limit=5, offset=10)
+        ids = [p.id for p in first + second + third]
+        assert len(ids) == len(set(ids)) == 11
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    test_cursor_round_trip()
+    for sort, order in [("created_at", "desc"), ("price", "asc"), ("name", "asc")]:
+        test_cursor_pages_have_no_gaps_or_duplicates(sort, order)
+    test_nullable_sort_rejects_cursor_and_pages_with_offset()
+    print("🎉 All cursor pagination tests passed!")
@@ -3,7 +3,9 @@ Normalization helpers for product attributes.
 Provides canonical mappings for colors, sizes, and other attributes.
 """
 
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Any
+import hashlib
+import json
 import re
 
 # Canonical color mappings (Persian + English + abbreviations)
@@ -238,6 +240,23 @@ def clean_attributes(attributes: Dict[str, List[str]]) -> Dict[str, List[str]]:
     
     return cleaned
 
+def attributes_hash(attributes: Dict[str, Any]) -> str:
+    """
+    Deterministic hash of a variant attributes dict (key order independent).
+    
+    Args:
+        attributes: Variant attributes such as {"color": "black", "size": "43"}
+        
+    Returns:
+        SHA-1 hex digest of the canonical JSON form
+    """
+    if not attributes:
+        return hashlib.sha1(b'{}').hexdigest()
+    
+    # Sort keys to ensure consistent hashing
+    sorted_attrs = json.dumps(attributes, sort_keys=True)
+    return hashlib.sha1(sorted_attrs.encode()).hexdigest()
+
 def tokenize_search_query(query: str) -> List[str]:
     """
     Tokenize search query into meaningful tokens.
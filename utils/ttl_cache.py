@@ -0,0 +1,95 @@
+"""
+In-process TTL cache for read-mostly endpoints.
+Entries live per worker process; writers invalidate them by key prefix.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Tuple
+
+from backend.config import CACHE_MAX_ENTRIES
+
+_MISSING = object()
+_SWEEP_EVERY = 1000
+
+
+class TTLCache:
+    """Thread-safe key/value store whose entries expire after a per-entry TTL.
+
+    At most maxsize entries are kept; past that the least recently used one is evicted.
+    """
+
+    def __init__(self, maxsize: int = 10_000):
+        self._data: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._maxsize = maxsize
+        self._sets = 0
+        # Bumped per prefix by invalidate() (and under "" by clear()), so get_or_set can
+        # tell that a key was invalidated while its value was being computed
+        self._generations: Dict[str, int] = {}
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        with self._lock:
+            self._set_locked(key, value, ttl)
+
+    def _set_locked(self, key: str, value: Any, ttl: float) -> None:
+        now = time.monotonic()
+        self._data[key] = (now + ttl, value)
+        self._data.move_to_end(key)
+        # Keys carry free text (search terms, conversation ids), so bound the entry count
+        while len(self._data) > self._maxsize:
+            self._data.popitem(last=False)
+        # Keys that are never read again (e.g. one-off conversations) would otherwise
+        # stay forever, so every _SWEEP_EVERY writes drop whatever has expired
+        self._sets += 1
+        if self._sets % _SWEEP_EVERY == 0:
+            for k in [k for k, (expires_at, _) in self._data.items() if expires_at <= now]:
+                del self._data[k]
+
+    def _generation(self, key: str) -> int:
+        return sum(count for prefix, count in self._generations.items() if key.startswith(prefix))
+
+    def get_or_set(self, key: str, ttl: float, factory: Callable[[], Any]) -> Any:
+        """Return the cached value for key, computing and storing it on a miss.
+
+        The factory runs outside the lock; if the key is invalidated meanwhile, the
+        computed value is returned but not stored, since it may predate the write.
+        """
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            with self._lock:
+                generation = self._generation(key)
+            value = factory()
+            with self._lock:
+                if self._generation(key) == generation:
+                    self._set_locked(key, value, ttl)
+        return value
+
+    def invalidate(self, *prefixes: str) -> None:
+        """Drop every entry whose key starts with one of the given prefixes."""
+        with self._lock:
+            for prefix in prefixes:
+                self._generations[prefix] = self._generations.get(prefix, 0) + 1
+            for key in [k for k in self._data if k.startswith(prefixes)]:
+                del self._data[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generations[""] = self._generations.get("", 0) + 1
+            self._data.clear()
+
+
+cache = TTLCache(maxsize=CACHE_MAX_ENTRIES)
@@ -6,7 +6,7 @@ from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 from database import get_db
-from models import BotConfig
+from models import TelegramConfig
 import logging
 
 logger = logging.getLogger(__name__)
@@ -153,16 +153,23 @@ async def setup_webhook(request: BotTokenRequest, db: Session = Depends(get_db))
             raise HTTPException(status_code=400, detail=f"Webhook setup failed: {webhook_error}")
         
         # Save bot configuration to database
-        bot_config = BotConfig(
+        bot_config = TelegramConfig(
             bot_token=request.bot_token,
             bot_username=bot_info.get("username", ""),
             bot_name=bot_info.get("first_name", ""),
             webhook_url=request.webhook_url,
+            webhook_secret="",
             is_active=True
         )
         
+        # Only one bot may be active at a time
+        db.query(TelegramConfig).filter(
+            TelegramConfig.is_active == True,
+            TelegramConfig.bot_token != request.bot_token
+        ).update({TelegramConfig.is_active: False}, synchronize_session=False)
+        
         # Check if config already exists
-        existing_config = db.query(BotConfig).filter(BotConfig.bot_token == request.bot_token).first()
+        existing_config = db.query(TelegramConfig).filter(TelegramConfig.bot_token == request.bot_token).first()
         if existing_config:
             existing_config.bot_username = bot_info.get("username", "")
             existing_config.bot_name = bot_info.get("first_name", "")
@@ -194,7 +201,7 @@ async def get_webhook_status(db: Session = Depends(get_db)):
     Get current webhook status for all configured bots.
     """
     try:
-        configs = db.query(BotConfig).filter(BotConfig.is_active == True).all()
+        configs = db.query(TelegramConfig).filter(TelegramConfig.is_active == True).all()
         
         if not configs:
             return WebhookResponse(
@@ -244,7 +251,7 @@ async def delete_webhook_endpoint(bot_token: str, db: Session = Depends(get_db))
             raise HTTPException(status_code=400, detail=f"Webhook deletion failed: {error}")
         
         # Update database
-        config = db.query(BotConfig).filter(BotConfig.bot_token == bot_token).first()
+        config = db.query(TelegramConfig).filter(TelegramConfig.bot_token == bot_token).first()
         if config:
             config.is_active = False
             db.commit()